@@ -1,6 +1,10 @@
+import numpy as np
+
 import openmdao.api as om
+from openaerostruct.aerodynamics.alpha_sweep_states import VLMAlphaSweepStates
 from openaerostruct.aerodynamics.compressible_states import CompressibleVLMStates
 from openaerostruct.aerodynamics.geometry import VLMGeometry
+from openaerostruct.aerodynamics.hmatrix_states import HMatrixVLMStates
 from openaerostruct.aerodynamics.states import VLMStates
 from openaerostruct.aerodynamics.functionals import VLMFunctionals
 from openaerostruct.functionals.total_aero_performance import TotalAeroPerformance
@@ -21,37 +25,96 @@ class AeroPoint(om.Group):
         self.options.declare('compressible', types=bool, default=False,
                              desc='Turns on compressibility correction for moderate Mach number '
                              'flows. Defaults to False.')
+        self.options.declare('aic_block_size', default=None, types=int, allow_none=True,
+                             desc='Number of evaluation points to process at once when '
+                             'assembling the AIC matrices. If None, all points are processed together.')
+        self.options.declare('fuse_vectors', default=False, types=bool,
+                             desc='If True, compute the vectors from the vortex meshes to the '
+                             'evaluation points inside the AIC assembly instead of storing them.')
+        self.options.declare('unique_filaments', default=False, types=bool,
+                             desc='If True, evaluate each unique vortex filament once when '
+                             'assembling the AIC matrices.')
+        self.options.declare('aic_solver', default='direct', values=['direct', 'gmres'],
+                             desc='Solver for the AIC linear system, either a dense LU solve or '
+                             'GMRES with a per-surface block-Jacobi preconditioner.')
+        self.options.declare('normalwash_mtx', default=False, types=bool,
+                             desc='If True, project the AIC terms onto the panel normals as '
+                             'they are computed instead of storing the full velocity influences.')
+        self.options.declare('matrix_free_forces', default=False, types=bool,
+                             desc='If True, compute the velocities at the force points by direct '
+                             'summation instead of assembling the force-point AIC matrix. '
+                             'This requires a matrix-free linear solver.')
+        self.options.declare('hmatrix_tol', default=None, types=float, allow_none=True,
+                             desc='If given, store the influence matrices as H-matrices '
+                             'compressed to this relative tolerance, for very large meshes.')
+        self.options.declare('num_alpha', default=None, types=int, allow_none=True,
+                             desc='If given, alpha is an array of this many angles of attack that '
+                             'are all analyzed in a single pass, and CL, CD, and CM are returned '
+                             'for each of them.')
+        self.options.declare('body_fixed_wake', default=False, types=bool,
+                             desc='If True, align the trailing vortex legs with the body x-axis '
+                             'instead of the freestream, so that the AIC matrix and its '
+                             'factorization only depend on the geometry.')
 
     def setup(self):
         surfaces = self.options['surfaces']
         rotational = self.options['rotational']
+        aic_block_size = self.options['aic_block_size']
+        fuse_vectors = self.options['fuse_vectors']
+        unique_filaments = self.options['unique_filaments']
+        aic_solver = self.options['aic_solver']
+        normalwash_mtx = self.options['normalwash_mtx']
+        matrix_free_forces = self.options['matrix_free_forces']
+        num_alpha = self.options['num_alpha']
+        body_fixed_wake = self.options['body_fixed_wake']
+
+        # For an alpha sweep, there is one set of performance groups for each
+        # angle of attack.
+        if num_alpha is None:
+            perf_prefixes = ['']
+        else:
+            perf_prefixes = ['alpha_{}.'.format(ind) for ind in range(num_alpha)]
 
         # Loop through each surface and connect relevant parameters
         for surface in surfaces:
             name = surface['name']
+            nx = surface['mesh'].shape[0]
+            ny = surface['mesh'].shape[1]
 
             self.connect(name + '.normals', 'aero_states.' + name + '_normals')
 
-            # Connect the results from 'aero_states' to the performance groups
-            self.connect('aero_states.' + name + '_sec_forces',
-                name + '_perf' + '.sec_forces')
-
-            # Connect S_ref for performance calcs
-            self.connect(name + '.S_ref', name + '_perf.S_ref')
-            self.connect(name + '.widths', name + '_perf.widths')
-            self.connect(name + '.chords', name + '_perf.chords')
-            self.connect(name + '.lengths', name + '_perf.lengths')
-            self.connect(name + '.cos_sweep', name + '_perf.cos_sweep')
-
-            # Connect S_ref for performance calcs
-            self.connect(name + '.S_ref', 'total_perf.' + name + '_S_ref')
-            self.connect(name + '.widths', 'total_perf.' + name + '_widths')
-            self.connect(name + '.chords', 'total_perf.' + name + '_chords')
-            self.connect(name + '.b_pts', 'total_perf.' + name + '_b_pts')
-            self.connect(name + '_perf' + '.CL', 'total_perf.' + name + '_CL')
-            self.connect(name + '_perf' + '.CD', 'total_perf.' + name + '_CD')
-            self.connect('aero_states.' + name + '_sec_forces',
-                'total_perf.' + name + '_sec_forces')
+            for ind, prefix in enumerate(perf_prefixes):
+                # Pick out the sec_forces of this angle of attack
+                if num_alpha is None:
+                    sec_forces_kwargs = {}
+                else:
+                    num = (nx - 1) * (ny - 1) * 3
+                    sec_forces_kwargs = {
+                        'src_indices': np.arange(ind * num, (ind + 1) * num).reshape(
+                            (nx - 1, ny - 1, 3)),
+                        'flat_src_indices': True,
+                    }
+
+                # Connect the results from 'aero_states' to the performance groups
+                self.connect('aero_states.' + name + '_sec_forces',
+                    prefix + name + '_perf' + '.sec_forces', **sec_forces_kwargs)
+
+                # Connect S_ref for performance calcs
+                self.connect(name + '.S_ref', prefix + name + '_perf.S_ref')
+                self.connect(name + '.widths', prefix + name + '_perf.widths')
+                self.connect(name + '.chords', prefix + name + '_perf.chords')
+                self.connect(name + '.lengths', prefix + name + '_perf.lengths')
+                self.connect(name + '.cos_sweep', prefix + name + '_perf.cos_sweep')
+
+                # Connect S_ref for performance calcs
+                self.connect(name + '.S_ref', prefix + 'total_perf.' + name + '_S_ref')
+                self.connect(name + '.widths', prefix + 'total_perf.' + name + '_widths')
+                self.connect(name + '.chords', prefix + 'total_perf.' + name + '_chords')
+                self.connect(name + '.b_pts', prefix + 'total_perf.' + name + '_b_pts')
+                self.connect(prefix + name + '_perf' + '.CL', prefix + 'total_perf.' + name + '_CL')
+                self.connect(prefix + name + '_perf' + '.CD', prefix + 'total_perf.' + name + '_CD')
+                self.connect('aero_states.' + name + '_sec_forces',
+                    prefix + 'total_perf.' + name + '_sec_forces', **sec_forces_kwargs)
 
             self.add_subsystem(name, VLMGeometry(surface=surface))
 
@@ -60,11 +123,36 @@ class AeroPoint(om.Group):
         # While other components only depends on a single surface,
         # this component requires information from all surfaces because
         # each surface interacts with the others.
-        if self.options['compressible'] == True:
-            aero_states = CompressibleVLMStates(surfaces=surfaces, rotational=rotational)
+        if num_alpha is not None:
+            if self.options['compressible'] or rotational or self.options['hmatrix_tol'] is not None:
+                raise ValueError('The alpha sweep does not support the compressibility '
+                                 'correction, rotational velocities, or H-matrices.')
+            aero_states = VLMAlphaSweepStates(surfaces=surfaces, num_alpha=num_alpha,
+                aic_block_size=aic_block_size, unique_filaments=unique_filaments,
+                body_fixed_wake=body_fixed_wake)
+            prom_in = ['v', 'alpha', 'beta', 'rho']
+        elif self.options['hmatrix_tol'] is not None:
+            if self.options['compressible'] or body_fixed_wake:
+                raise ValueError('The H-matrix aerodynamic states do not support the '
+                                 'compressibility correction or a body-fixed wake.')
+            aero_states = HMatrixVLMStates(surfaces=surfaces, rotational=rotational,
+                hmatrix_tol=self.options['hmatrix_tol'])
+            prom_in = ['v', 'alpha', 'beta', 'rho']
+        elif self.options['compressible'] == True:
+            if body_fixed_wake:
+                raise ValueError('The compressible aerodynamic states do not support a '
+                                 'body-fixed wake.')
+            aero_states = CompressibleVLMStates(surfaces=surfaces, rotational=rotational,
+                aic_block_size=aic_block_size, fuse_vectors=fuse_vectors,
+                unique_filaments=unique_filaments, aic_solver=aic_solver,
+                normalwash_mtx=normalwash_mtx, matrix_free_forces=matrix_free_forces)
             prom_in = ['v', 'alpha', 'beta', 'rho', 'Mach_number']
         else:
-            aero_states = VLMStates(surfaces=surfaces, rotational=rotational)
+            aero_states = VLMStates(surfaces=surfaces, rotational=rotational,
+                aic_block_size=aic_block_size, fuse_vectors=fuse_vectors,
+                unique_filaments=unique_filaments, aic_solver=aic_solver,
+                normalwash_mtx=normalwash_mtx, matrix_free_forces=matrix_free_forces,
+                body_fixed_wake=body_fixed_wake)
             prom_in = ['v', 'alpha', 'beta', 'rho']
 
         aero_states.linear_solver = om.LinearRunOnce()
@@ -82,6 +170,33 @@ class AeroPoint(om.Group):
         # This is necessary because the VLMStates component requires information
         # from each surface, but this information is stored within each
         # surface's group.
+        if num_alpha is not None:
+            # Collect the CL, CD, and CM of every angle of attack
+            sweep_outputs = om.MuxComp(vec_size=num_alpha)
+            sweep_outputs.add_var('CL', shape=(1,), axis=0)
+            sweep_outputs.add_var('CD', shape=(1,), axis=0)
+            sweep_outputs.add_var('CM', shape=(3,), axis=0)
+
+            prom_in = ['v', 'alpha', 'beta', 'Mach_number', 're', 'rho', 'cg']
+            if self.options['user_specified_Sref']:
+                prom_in.append('S_ref_total')
+
+            for ind in range(num_alpha):
+                point_name = 'alpha_{}'.format(ind)
+                self.add_subsystem(point_name,
+                    AlphaSweepPerformance(surfaces=surfaces, num_alpha=num_alpha, index=ind,
+                    user_specified_Sref=self.options['user_specified_Sref']),
+                    promotes_inputs=prom_in)
+
+                for var in ['CL', 'CD', 'CM']:
+                    self.connect(point_name + '.' + var, 'sweep_outputs.{}_{}'.format(var, ind))
+
+            self.add_subsystem('sweep_outputs',
+                sweep_outputs,
+                promotes_outputs=['CL', 'CD', 'CM'])
+
+            return
+
         for surface in surfaces:
             self.add_subsystem(surface['name'] +'_perf',
                 VLMFunctionals(surface=surface),
@@ -94,3 +209,38 @@ class AeroPoint(om.Group):
             user_specified_Sref=self.options['user_specified_Sref']),
             promotes_inputs=['v', 'rho', 'cg', 'S_ref_total'],
             promotes_outputs=['CM', 'CL', 'CD'])
+
+
+class AlphaSweepPerformance(om.Group):
+    """
+    The performance groups of AeroPoint for one angle of attack of an alpha
+    sweep. The angle of attack is picked out of the array of angles of attack
+    by its `index`.
+    """
+
+    def initialize(self):
+        self.options.declare('surfaces', types=list)
+        self.options.declare('user_specified_Sref', types=bool, default=False)
+        self.options.declare('num_alpha', types=int)
+        self.options.declare('index', types=int)
+
+    def setup(self):
+        surfaces = self.options['surfaces']
+
+        self.add_subsystem('alpha_select',
+            om.ExecComp('point_alpha = alpha[{}]'.format(self.options['index']),
+                alpha={'units': 'deg', 'shape': self.options['num_alpha']},
+                point_alpha={'units': 'deg'}),
+            promotes_inputs=['alpha'],
+            promotes_outputs=['point_alpha'])
+
+        for surface in surfaces:
+            self.add_subsystem(surface['name'] +'_perf',
+                VLMFunctionals(surface=surface),
+                promotes_inputs=['v', ('alpha', 'point_alpha'), 'beta', 'Mach_number', 're', 'rho'])
+
+        self.add_subsystem('total_perf',
+            TotalAeroPerformance(surfaces=surfaces,
+            user_specified_Sref=self.options['user_specified_Sref']),
+            promotes_inputs=['v', 'rho', 'cg', 'S_ref_total'],
+            promotes_outputs=['CM', 'CL', 'CD'])
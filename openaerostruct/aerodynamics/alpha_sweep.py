@@ -0,0 +1,251 @@
+from __future__ import print_function
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse import csc_matrix
+
+import openmdao.api as om
+
+from openaerostruct.aerodynamics.eval_mtx import _compute_vel_mtx, _compute_vel_mtx_unique, \
+    _get_u_dir
+from openaerostruct.utils.vector_algebra import compute_cross
+
+
+class VLMAlphaSweep(om.ExplicitComponent):
+    """
+    Solve the VLM system and compute the sectional forces for a whole array
+    of angles of attack at once.
+
+    The angles of attack are grouped by the direction of their trailing
+    vortex legs. The AIC matrix is assembled and factored once per group,
+    and the circulations of every angle of attack in the group are found
+    with a single multiple right-hand side solve. The velocities at the force
+    points are then accumulated block by block of force points for the whole
+    group, so the force-point AIC matrix is never stored.
+
+    By default every angle of attack has its own wake direction, so the
+    groups only merge repeated angles of attack. With `body_fixed_wake`, the
+    trailing legs of all angles of attack follow the body x-axis and a single
+    factorization serves the whole sweep. The derivatives are computed by
+    complex step, so this component is meant for analyses such as drag
+    polars rather than for gradient-based optimization.
+
+    Parameters
+    ----------
+    alpha[num_alpha] : numpy array
+        The angles of attack for the aircraft (all lifting surfaces) in degrees.
+    beta : float
+        The sideslip angle for the aircraft (all lifting surfaces) in degrees.
+    v : float
+        The freestream velocity magnitude.
+    rho : float
+        Air density at the flight condition.
+    vortex_mesh[nx, ny, 3] : numpy array
+        The vortex mesh for each lifting surface, mirrored across the symmetry
+        plane if the surface is symmetric.
+    coll_pts[system_size, 3] : numpy array
+        The collocation points for all lifting surfaces.
+    force_pts[system_size, 3] : numpy array
+        The force points for all lifting surfaces.
+    bound_vecs[system_size, 3] : numpy array
+        The vectors representing the bound vortices for each panel.
+    normals[nx-1, ny-1, 3] : numpy array
+        The normal vector for each panel. One exists for each lifting surface.
+
+    Returns
+    -------
+    circulations[num_alpha, system_size] : numpy array
+        The vortex ring circulations for each angle of attack.
+    sec_forces[num_alpha, nx-1, ny-1, 3] : numpy array
+        The panel forces of one lifting surface for each angle of attack.
+        There is one of these per surface.
+    """
+
+    def initialize(self):
+        self.options.declare('surfaces', types=list)
+        self.options.declare('num_alpha', types=int)
+        self.options.declare('block_size', default=None, types=int, allow_none=True,
+                             desc='Number of evaluation points to process at once. '
+                             'If None, all evaluation points are processed together.')
+        self.options.declare('unique_filaments', default=False, types=bool,
+                             desc='If True, evaluate each unique vortex filament once and '
+                             'assemble the rings from them.')
+        self.options.declare('body_fixed_wake', default=False, types=bool,
+                             desc='If True, align the trailing vortex legs with the body x-axis '
+                             'so that all angles of attack share one AIC matrix.')
+
+    def setup(self):
+        surfaces = self.options['surfaces']
+        num_alpha = self.options['num_alpha']
+
+        system_size = 0
+        self.surface_slices = []
+
+        # Set up the matrix that converts the ring circulations to the
+        # horseshoe circulations, as in HorseshoeCirculations.
+        data = []
+        rows = []
+        cols = []
+
+        for surface in surfaces:
+            mesh = surface['mesh']
+            nx = mesh.shape[0]
+            ny = mesh.shape[1]
+            name = surface['name']
+            num = (nx - 1) * (ny - 1)
+
+            if surface['symmetry']:
+                actual_ny_size = 2 * ny - 1
+            else:
+                actual_ny_size = ny
+
+            self.add_input(name + '_vortex_mesh', shape=(nx, actual_ny_size, 3), units='m')
+            self.add_input(name + '_normals', shape=(nx - 1, ny - 1, 3))
+            self.add_output(name + '_sec_forces', shape=(num_alpha, nx - 1, ny - 1, 3),
+                units='N')
+
+            arange = system_size + np.arange(num).reshape((nx - 1, ny - 1))
+            data.extend([np.ones(num), -np.ones((nx - 2) * (ny - 1))])
+            rows.extend([arange.flatten(), arange[1:, :].flatten()])
+            cols.extend([arange.flatten(), arange[:-1, :].flatten()])
+
+            self.surface_slices.append(slice(system_size, system_size + num))
+            system_size += num
+
+        self.system_size = system_size
+        self.horseshoe_mtx = csc_matrix(
+            (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(system_size, system_size))
+
+        self.add_input('alpha', val=np.ones(num_alpha), units='deg')
+        self.add_input('beta', val=0., units='deg')
+        self.add_input('v', val=1., units='m/s')
+        self.add_input('rho', val=1., units='kg/m**3')
+        self.add_input('coll_pts', shape=(system_size, 3), units='m')
+        self.add_input('force_pts', shape=(system_size, 3), units='m')
+        self.add_input('bound_vecs', shape=(system_size, 3), units='m')
+
+        self.add_output('circulations', shape=(num_alpha, system_size), units='m**2/s')
+
+        self.num_factorizations = 0
+
+        # The sweep is meant for analysis, so the partials are simply computed
+        # by complex step.
+        self.declare_partials('circulations', ['alpha', 'beta', 'v', 'coll_pts', '*_vortex_mesh',
+            '*_normals'], method='cs')
+        self.declare_partials('*_sec_forces', '*', method='cs')
+
+    def compute(self, inputs, outputs):
+        surfaces = self.options['surfaces']
+        num_alpha = self.options['num_alpha']
+        system_size = self.system_size
+
+        alpha = inputs['alpha'] * np.pi / 180.
+        beta = inputs['beta'][0] * np.pi / 180.
+        v_inf = inputs['v'][0] * np.array([
+            np.cos(alpha) * np.cos(beta),
+            -np.sin(beta) * np.ones(num_alpha),
+            np.sin(alpha) * np.cos(beta),
+        ]).T
+
+        normals = np.concatenate([
+            inputs[surface['name'] + '_normals'].reshape((-1, 3)) for surface in surfaces])
+
+        circulations = np.zeros((num_alpha, system_size), dtype=v_inf.dtype)
+        velocities = np.zeros((num_alpha, system_size, 3), dtype=v_inf.dtype)
+        velocities += v_inf[:, np.newaxis, :]
+
+        for u_dir, inds in self._get_wake_groups(inputs):
+            lu = lu_factor(self._assemble_mtx(inputs, u_dir, normals))
+            self.num_factorizations += 1
+
+            rhs = -normals.dot(v_inf[inds].T)
+            circs = lu_solve(lu, rhs)
+            circulations[inds] = circs.T
+
+            velocities[inds] += self._induced_velocities(inputs, u_dir, circs)
+
+        outputs['circulations'] = circulations
+
+        horseshoe_circulations = self.horseshoe_mtx.dot(circulations.T).T
+
+        panel_forces = inputs['rho'][0] * horseshoe_circulations[:, :, np.newaxis] \
+            * compute_cross(velocities, inputs['bound_vecs'][np.newaxis, :, :])
+
+        for surface, surf_slice in zip(surfaces, self.surface_slices):
+            name = surface['name']
+            outputs[name + '_sec_forces'] = panel_forces[:, surf_slice].reshape(
+                outputs[name + '_sec_forces'].shape)
+
+    def _get_wake_groups(self, inputs):
+        """
+        Group the angles of attack by the direction of the trailing vortex
+        legs and return a list of (u_dir, indices) pairs.
+        """
+        alpha = inputs['alpha']
+
+        if self.options['body_fixed_wake']:
+            return [(np.array([1., 0., 0.]), np.arange(len(alpha)))]
+
+        unique_alpha, inverse = np.unique(alpha, return_inverse=True)
+
+        return [(_get_u_dir(a), np.nonzero(inverse == ind)[0])
+                for ind, a in enumerate(unique_alpha)]
+
+    def _get_vel_mtx_blocks(self, inputs, eval_name, u_dir):
+        """
+        Yield the AIC terms of all surfaces for successive blocks of
+        evaluation points, as (ind_1, ind_2, vel_mtx) where vel_mtx has shape
+        [ind_2 - ind_1, system_size, 3].
+        """
+        surfaces = self.options['surfaces']
+        system_size = self.system_size
+        block_size = self.options['block_size'] or system_size
+
+        if self.options['unique_filaments']:
+            compute_vel_mtx = _compute_vel_mtx_unique
+        else:
+            compute_vel_mtx = _compute_vel_mtx
+
+        for ind_1 in range(0, system_size, block_size):
+            ind_2 = min(ind_1 + block_size, system_size)
+            eval_pts = inputs[eval_name][ind_1:ind_2]
+
+            vel_mtx = np.empty((ind_2 - ind_1, system_size, 3),
+                dtype=np.result_type(eval_pts, u_dir))
+
+            for surface, surf_slice in zip(surfaces, self.surface_slices):
+                name = surface['name']
+                ny = surface['mesh'].shape[1]
+
+                vectors = eval_pts[:, np.newaxis, np.newaxis, :] - inputs[name + '_vortex_mesh']
+                vel_mtx[:, surf_slice] = compute_vel_mtx(
+                    vectors, u_dir, ny, surface['symmetry']).reshape((ind_2 - ind_1, -1, 3))
+
+            yield ind_1, ind_2, vel_mtx
+
+    def _assemble_mtx(self, inputs, u_dir, normals):
+        """
+        Assemble the AIC matrix at the collocation points, projecting each
+        block onto the normals as soon as it is computed.
+        """
+        mtx = np.empty((self.system_size, self.system_size),
+            dtype=np.result_type(normals, u_dir, inputs['coll_pts']))
+
+        for ind_1, ind_2, vel_mtx in self._get_vel_mtx_blocks(inputs, 'coll_pts', u_dir):
+            mtx[ind_1:ind_2] = np.einsum('ijk,ik->ij', vel_mtx, normals[ind_1:ind_2])
+
+        return mtx
+
+    def _induced_velocities(self, inputs, u_dir, circs):
+        """
+        Compute the velocities induced at the force points by the ring
+        circulations circs[system_size, num_group] of one group of angles of
+        attack.
+        """
+        velocities = np.empty((circs.shape[1], self.system_size, 3),
+            dtype=np.result_type(circs, inputs['force_pts']))
+
+        for ind_1, ind_2, vel_mtx in self._get_vel_mtx_blocks(inputs, 'force_pts', u_dir):
+            velocities[:, ind_1:ind_2] = np.einsum('ijk,jn->nik', vel_mtx, circs)
+
+        return velocities
@@ -0,0 +1,52 @@
+import openmdao.api as om
+from openaerostruct.aerodynamics.alpha_sweep import VLMAlphaSweep
+from openaerostruct.aerodynamics.collocation_points import CollocationPoints
+from openaerostruct.aerodynamics.vortex_mesh import VortexMesh
+
+
+class VLMAlphaSweepStates(om.Group):
+    """
+    Group that computes the circulations and sectional forces like VLMStates,
+    but for a whole array of angles of attack in a single evaluation.
+
+    The geometry is only processed once, and the AIC matrix is only factored
+    once per distinct wake direction. The circulations and sec_forces outputs
+    gain a leading axis of length `num_alpha`.
+    """
+
+    def initialize(self):
+        self.options.declare('surfaces', types=list)
+        self.options.declare('num_alpha', types=int)
+        self.options.declare('aic_block_size', default=None, types=int, allow_none=True,
+                             desc='Number of evaluation points to process at once when '
+                             'assembling the AIC matrices. If None, all points are processed together.')
+        self.options.declare('unique_filaments', default=False, types=bool,
+                             desc='If True, evaluate each unique vortex filament once when '
+                             'assembling the AIC matrices.')
+        self.options.declare('body_fixed_wake', default=False, types=bool,
+                             desc='If True, align the trailing vortex legs with the body x-axis '
+                             'so that all angles of attack share one AIC matrix.')
+
+    def setup(self):
+        surfaces = self.options['surfaces']
+
+        # Get collocation points
+        self.add_subsystem('collocation_points',
+             CollocationPoints(surfaces=surfaces),
+             promotes_inputs=['*'],
+             promotes_outputs=['coll_pts', 'force_pts', 'bound_vecs'])
+
+        # Compute the vortex mesh based off the deformed aerodynamic mesh
+        self.add_subsystem('vortex_mesh',
+            VortexMesh(surfaces=surfaces),
+            promotes_inputs=['*'],
+            promotes_outputs=['*'])
+
+        # Solve for the circulations and forces of all angles of attack
+        self.add_subsystem('alpha_sweep',
+             VLMAlphaSweep(surfaces=surfaces, num_alpha=self.options['num_alpha'],
+                block_size=self.options['aic_block_size'],
+                unique_filaments=self.options['unique_filaments'],
+                body_fixed_wake=self.options['body_fixed_wake']),
+             promotes_inputs=['*'],
+             promotes_outputs=['*'])
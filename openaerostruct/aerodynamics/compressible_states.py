@@ -8,9 +8,11 @@ from openaerostruct.aerodynamics.collocation_points import CollocationPoints
 from openaerostruct.aerodynamics.eval_mtx import EvalVelMtx
 from openaerostruct.aerodynamics.convert_velocity import ConvertVelocity
 from openaerostruct.aerodynamics.mtx_rhs import VLMMtxRHSComp
+from openaerostruct.aerodynamics.normalwash_mtx_rhs import VLMNormalwashMtxRHSComp
 from openaerostruct.aerodynamics.solve_matrix import SolveMatrix
 from openaerostruct.aerodynamics.horseshoe_circulations import HorseshoeCirculations
 from openaerostruct.aerodynamics.eval_velocities import EvalVelocities
+from openaerostruct.aerodynamics.matrix_free_eval_velocities import MatrixFreeEvalVelocities
 from openaerostruct.aerodynamics.mesh_point_forces import MeshPointForces
 from openaerostruct.aerodynamics.panel_forces import PanelForces
 from openaerostruct.aerodynamics.panel_forces_surf import PanelForcesSurf
@@ -40,10 +42,35 @@ class CompressibleVLMStates(om.Group):
         self.options.declare('surfaces', types=list)
         self.options.declare('rotational', False, types=bool,
                              desc="Set to True to turn on support for computing angular velocities")
+        self.options.declare('aic_block_size', default=None, types=int, allow_none=True,
+                             desc='Number of evaluation points to process at once when '
+                             'assembling the AIC matrices. If None, all points are processed together.')
+        self.options.declare('fuse_vectors', default=False, types=bool,
+                             desc='If True, compute the vectors from the vortex meshes to the '
+                             'evaluation points inside the AIC assembly instead of storing them.')
+        self.options.declare('unique_filaments', default=False, types=bool,
+                             desc='If True, evaluate each unique vortex filament once when '
+                             'assembling the AIC matrices.')
+        self.options.declare('aic_solver', default='direct', values=['direct', 'gmres'],
+                             desc='Solver for the AIC linear system, either a dense LU solve or '
+                             'GMRES with a per-surface block-Jacobi preconditioner.')
+        self.options.declare('normalwash_mtx', default=False, types=bool,
+                             desc='If True, project the AIC terms onto the panel normals as '
+                             'they are computed instead of storing the full velocity influences.')
+        self.options.declare('matrix_free_forces', default=False, types=bool,
+                             desc='If True, compute the velocities at the force points by direct '
+                             'summation instead of assembling the force-point AIC matrix. '
+                             'This requires a matrix-free linear solver.')
 
     def setup(self):
         surfaces = self.options['surfaces']
         rotational = self.options['rotational']
+        aic_block_size = self.options['aic_block_size']
+        fuse_vectors = self.options['fuse_vectors']
+        unique_filaments = self.options['unique_filaments']
+        aic_solver = self.options['aic_solver']
+        normalwash_mtx = self.options['normalwash_mtx']
+        matrix_free_forces = self.options['matrix_free_forces']
 
         num_collocation_points = 0
         for surface in surfaces:
@@ -111,11 +138,15 @@ class CompressibleVLMStates(om.Group):
             promotes_outputs=['*'])
 
         # Get vectors from mesh points to collocation points
-        self.add_subsystem('get_vectors',
-             GetVectors(surfaces=surfaces, num_eval_points=num_collocation_points,
-                eval_name='coll_pts'),
-             promotes_inputs=['*'],
-             promotes_outputs=['*'])
+        if fuse_vectors:
+            prom_in = ['*_vortex_mesh', 'coll_pts']
+        else:
+            self.add_subsystem('get_vectors',
+                 GetVectors(surfaces=surfaces, num_eval_points=num_collocation_points,
+                    eval_name='coll_pts'),
+                 promotes_inputs=['*'],
+                 promotes_outputs=['*'])
+            prom_in = ['*_vectors']
 
         # In the PG domain, alpha and beta are zero.
         indep_var_comp = om.IndepVarComp()
@@ -123,14 +154,20 @@ class CompressibleVLMStates(om.Group):
         indep_var_comp.add_output('beta_pg', val=0., units='deg')
         self.add_subsystem('pg_frame', indep_var_comp)
 
-        # Construct matrix based on rings, not horseshoes
-        self.add_subsystem('mtx_assy',
-             EvalVelMtx(surfaces=surfaces, num_eval_points=num_collocation_points,
-                eval_name='coll_pts'),
-             promotes_inputs=['*_vectors'],
-             promotes_outputs=['*'])
-
-        self.connect('pg_frame.alpha_pg', 'mtx_assy.alpha')
+        # Construct matrix based on rings, not horseshoes. With normalwash_mtx,
+        # this is done together with the projection onto the normals below.
+        if normalwash_mtx:
+            mtx_prom_in = prom_in
+        else:
+            self.add_subsystem('mtx_assy',
+                 EvalVelMtx(surfaces=surfaces, num_eval_points=num_collocation_points,
+                    eval_name='coll_pts', block_size=aic_block_size,
+                    fuse_vectors=fuse_vectors, unique_filaments=unique_filaments),
+                 promotes_inputs=prom_in,
+                 promotes_outputs=['*'])
+
+            self.connect('pg_frame.alpha_pg', 'mtx_assy.alpha')
+            mtx_prom_in = ['*coll_pts_vel_mtx']
 
         # Convert freestream velocity to array of velocities
         # Note, don't want to promote Alpha or Beta here because we are in the transformed system.
@@ -146,14 +183,23 @@ class CompressibleVLMStates(om.Group):
         self.connect('pg_frame.beta_pg', 'convert_velocity.beta')
 
         # Construct RHS and full matrix of system
+        if normalwash_mtx:
+            mtx_rhs = VLMNormalwashMtxRHSComp(surfaces=surfaces, block_size=aic_block_size,
+                fuse_vectors=fuse_vectors, unique_filaments=unique_filaments)
+        else:
+            mtx_rhs = VLMMtxRHSComp(surfaces=surfaces)
+
         self.add_subsystem('mtx_rhs',
-             VLMMtxRHSComp(surfaces=surfaces),
-             promotes_inputs=['freestream_velocities', '*coll_pts_vel_mtx'],
+             mtx_rhs,
+             promotes_inputs=['freestream_velocities'] + mtx_prom_in,
              promotes_outputs=['*'])
 
+        if normalwash_mtx:
+            self.connect('pg_frame.alpha_pg', 'mtx_rhs.alpha')
+
         # Solve Mtx RHS to get ring circs
         self.add_subsystem('solve_matrix',
-             SolveMatrix(surfaces=surfaces),
+             SolveMatrix(surfaces=surfaces, solver=aic_solver),
              promotes_inputs=['*'],
              promotes_outputs=['*'])
 
@@ -163,29 +209,47 @@ class CompressibleVLMStates(om.Group):
              promotes_inputs=['*'],
              promotes_outputs=['*'])
 
-        # Eval force vectors
-        self.add_subsystem('get_vectors_force',
-             GetVectors(surfaces=surfaces, num_eval_points=num_force_points,
-                eval_name='force_pts'),
-             promotes_inputs=['*'],
-             promotes_outputs=['*'])
-
-        # Set up force mtx
-        # Note, don't want to promote Alpha here because we are in the transformed system.
-        self.add_subsystem('mtx_assy_forces',
-             EvalVelMtx(surfaces=surfaces, num_eval_points=num_force_points,
-                eval_name='force_pts'),
-             promotes_inputs=['*_force_pts_vectors'],
-             promotes_outputs=['*'])
-
-        self.connect('pg_frame.alpha_pg', 'mtx_assy_forces.alpha')
-
-        # Multiply by horseshoe circs to get velocities
-        self.add_subsystem('eval_velocities',
-             EvalVelocities(surfaces=surfaces, num_eval_points=num_force_points,
-                eval_name='force_pts'),
-             promotes_inputs=['*'],
-             promotes_outputs=['*'])
+        if matrix_free_forces:
+            # Sum the velocities induced by the circulations directly
+            # Note, don't want to promote Alpha here because we are in the transformed system.
+            self.add_subsystem('eval_velocities',
+                 MatrixFreeEvalVelocities(surfaces=surfaces, num_eval_points=num_force_points,
+                    eval_name='force_pts'),
+                 promotes_inputs=['*_vortex_mesh', 'force_pts', 'freestream_velocities',
+                    'circulations'],
+                 promotes_outputs=['*'])
+
+            self.connect('pg_frame.alpha_pg', 'eval_velocities.alpha')
+
+        else:
+            # Eval force vectors
+            if fuse_vectors:
+                prom_in = ['*_vortex_mesh', 'force_pts']
+            else:
+                self.add_subsystem('get_vectors_force',
+                     GetVectors(surfaces=surfaces, num_eval_points=num_force_points,
+                        eval_name='force_pts'),
+                     promotes_inputs=['*'],
+                     promotes_outputs=['*'])
+                prom_in = ['*_force_pts_vectors']
+
+            # Set up force mtx
+            # Note, don't want to promote Alpha here because we are in the transformed system.
+            self.add_subsystem('mtx_assy_forces',
+                 EvalVelMtx(surfaces=surfaces, num_eval_points=num_force_points,
+                    eval_name='force_pts', block_size=aic_block_size,
+                    fuse_vectors=fuse_vectors, unique_filaments=unique_filaments),
+                 promotes_inputs=prom_in,
+                 promotes_outputs=['*'])
+
+            self.connect('pg_frame.alpha_pg', 'mtx_assy_forces.alpha')
+
+            # Multiply by horseshoe circs to get velocities
+            self.add_subsystem('eval_velocities',
+                 EvalVelocities(surfaces=surfaces, num_eval_points=num_force_points,
+                    eval_name='force_pts'),
+                 promotes_inputs=['*'],
+                 promotes_outputs=['*'])
 
         # Get sectional panel forces
         self.add_subsystem('panel_forces',
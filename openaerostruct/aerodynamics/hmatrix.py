@@ -0,0 +1,244 @@
+"""
+Hierarchical-matrix (H-matrix) tools for the VLM influence matrices.
+
+The dense AIC matrices grow as the square of the number of panels. Blocks of
+the matrix that couple well-separated clusters of evaluation points and
+vortex rings are numerically low rank, so they can be stored as the product
+of two thin matrices computed with adaptive cross approximation (ACA), which
+only needs a few rows and columns of each block. Only the near-field blocks
+are stored densely, so memory and matrix-vector products scale close to
+N log N.
+
+The entries of the blocks are evaluated from the influence of the vortex
+rings, computed by VortexRings, without forming the dense matrices.
+"""
+from __future__ import print_function
+import numpy as np
+
+
+def _build_cluster_tree(lower, upper, leaf_size):
+    """
+    Recursively bisect a set of boxes along the longest dimension of their
+    centers until each cluster has at most leaf_size members.
+
+    The boxes may be unbounded. The diameter of each cluster is measured on
+    the bounded part of its boxes, while the distances between clusters use
+    the full boxes.
+    """
+    lower_finite = np.where(np.isfinite(lower), lower, upper)
+    upper_finite = np.where(np.isfinite(upper), upper, lower)
+    centers = 0.5 * (lower_finite + upper_finite)
+
+    def build(idx):
+        node = {
+            'idx': idx,
+            'lower': lower[idx].min(axis=0),
+            'upper': upper[idx].max(axis=0),
+            'diam': np.linalg.norm(upper_finite[idx].max(axis=0) - lower_finite[idx].min(axis=0)),
+            'children': None,
+        }
+
+        if idx.size > leaf_size:
+            pts = centers[idx]
+            axis = np.argmax(pts.max(axis=0) - pts.min(axis=0))
+
+            # Split at the middle of the bounding box, which keeps separate
+            # surfaces apart, unless that leaves one side empty.
+            mid = 0.5 * (pts[:, axis].max() + pts[:, axis].min())
+            mask = pts[:, axis] <= mid
+            if np.all(mask) or not np.any(mask):
+                mask = np.zeros(idx.size, dtype=bool)
+                mask[np.argsort(pts[:, axis], kind='mergesort')[:idx.size // 2]] = True
+
+            node['children'] = [build(idx[mask]), build(idx[~mask])]
+
+        return node
+
+    return build(np.arange(lower.shape[0]))
+
+
+def _get_leaves(node):
+    if node['children'] is None:
+        return [node['idx']]
+    return _get_leaves(node['children'][0]) + _get_leaves(node['children'][1])
+
+
+def _aca(get_row, get_col, num_rows, num_cols, tol, max_rank):
+    """
+    Adaptive cross approximation with partial pivoting.
+
+    Returns the factors U[num_rows, rank] and V[rank, num_cols], or None if
+    the requested tolerance is not reached with at most max_rank terms.
+    """
+    us = []
+    vs = []
+    norm2 = 0.
+    used = np.zeros(num_rows, dtype=bool)
+
+    ind = 0
+    for _ in range(num_rows):
+        if len(us) >= max_rank:
+            return None
+
+        used[ind] = True
+        row = get_row(ind)
+        for u, v in zip(us, vs):
+            row -= u[ind] * v
+
+        pivot = np.argmax(np.abs(row))
+        if row[pivot] == 0.:
+            # This row is already exactly represented; try the next one.
+            free = np.nonzero(~used)[0]
+            if free.size == 0:
+                break
+            ind = free[0]
+            continue
+
+        v = row / row[pivot]
+        u = get_col(pivot)
+        for uu, vv in zip(us, vs):
+            u -= vv[pivot] * uu
+
+        # Update the estimate of the Frobenius norm of the approximation.
+        for uu, vv in zip(us, vs):
+            norm2 += 2. * np.dot(uu, u) * np.dot(vv, v)
+        norm_uv = np.linalg.norm(u) * np.linalg.norm(v)
+        norm2 += norm_uv ** 2
+
+        us.append(u)
+        vs.append(v)
+
+        if norm_uv <= tol * np.sqrt(abs(norm2)):
+            break
+
+        score = np.abs(u)
+        score[used] = -1.
+        ind = np.argmax(score)
+        if score[ind] < 0.:
+            break
+
+    if len(us) == 0:
+        return np.zeros((num_rows, 0)), np.zeros((0, num_cols))
+
+    return np.array(us).T, np.array(vs)
+
+
+class HMatrix(object):
+    """
+    Hierarchical-matrix approximation of a dense matrix whose rows belong to
+    points and whose columns belong to boxes in space.
+
+    Pairs of clusters that satisfy the admissibility condition
+    max(diam) <= eta * dist are approximated with ACA to the relative
+    tolerance tol. All other pairs are subdivided down to the leaves, which
+    are stored densely.
+
+    Parameters
+    ----------
+    row_points[num_points, 3] : numpy array
+        The points associated with the rows.
+    col_lower[num_cols, 3] : numpy array
+        Lower corners of the boxes associated with the columns.
+    col_upper[num_cols, 3] : numpy array
+        Upper corners of the boxes associated with the columns.
+    entries : callable
+        entries(points, cols) returns the entries for the given point and
+        column indices as an array of shape [num_points, num_components, num_cols].
+    num_components : int
+        Number of matrix rows per point. Row i * num_components + k is
+        component k of point i.
+    tol : float
+        Relative tolerance of the low-rank approximations.
+    leaf_size : int
+        Maximum number of points or columns in the leaves of the cluster trees.
+    eta : float
+        Admissibility parameter.
+    """
+
+    def __init__(self, row_points, col_lower, col_upper, entries, num_components=1,
+                 tol=1e-6, leaf_size=32, eta=1.):
+        self.entries = entries
+        self.num_components = num_components
+        self.tol = tol
+        self.shape = (row_points.shape[0] * num_components, col_lower.shape[0])
+
+        row_tree = _build_cluster_tree(row_points, row_points, leaf_size)
+        col_tree = _build_cluster_tree(col_lower, col_upper, leaf_size)
+        self.row_leaves = _get_leaves(row_tree)
+
+        self.dense_blocks = []
+        self.low_rank_blocks = []
+        self._build(row_tree, col_tree, eta)
+
+    def _expand_rows(self, points):
+        ncomp = self.num_components
+        return (points[:, None] * ncomp + np.arange(ncomp)).flatten()
+
+    def _build(self, row_node, col_node, eta):
+        points = row_node['idx']
+        cols = col_node['idx']
+        rows = self._expand_rows(points)
+
+        gap = np.maximum(0., np.maximum(col_node['lower'] - row_node['upper'],
+            row_node['lower'] - col_node['upper']))
+        dist = np.linalg.norm(gap)
+
+        if max(row_node['diam'], col_node['diam']) <= eta * dist:
+            ncomp = self.num_components
+
+            def get_row(ind):
+                return self.entries(points[ind // ncomp:ind // ncomp + 1], cols)[0, ind % ncomp]
+
+            def get_col(ind):
+                return self.entries(points, cols[ind:ind + 1])[:, :, 0].flatten()
+
+            max_rank = rows.size * cols.size // (rows.size + cols.size)
+            factors = _aca(get_row, get_col, rows.size, cols.size, self.tol, max_rank)
+            if factors is not None:
+                self.low_rank_blocks.append((rows, cols) + factors)
+                return
+
+        if row_node['children'] is None and col_node['children'] is None:
+            block = self.entries(points, cols).reshape((rows.size, cols.size))
+            self.dense_blocks.append((rows, cols, block))
+            return
+
+        row_children = row_node['children'] or [row_node]
+        col_children = col_node['children'] or [col_node]
+        for row_child in row_children:
+            for col_child in col_children:
+                self._build(row_child, col_child, eta)
+
+    @property
+    def nbytes(self):
+        """
+        Number of bytes used to store the dense and low-rank blocks.
+        """
+        nbytes = 0
+        for block in self.dense_blocks:
+            nbytes += block[2].nbytes
+        for block in self.low_rank_blocks:
+            nbytes += block[2].nbytes + block[3].nbytes
+        return nbytes
+
+    def matvec(self, vec):
+        """
+        Multiply the H-matrix by a vector.
+        """
+        out = np.zeros(self.shape[0], dtype=vec.dtype)
+        for rows, cols, block in self.dense_blocks:
+            out[rows] += block.dot(vec[cols])
+        for rows, cols, U, V in self.low_rank_blocks:
+            out[rows] += U.dot(V.dot(vec[cols]))
+        return out
+
+    def rmatvec(self, vec):
+        """
+        Multiply the transpose of the H-matrix by a vector.
+        """
+        out = np.zeros(self.shape[1], dtype=vec.dtype)
+        for rows, cols, block in self.dense_blocks:
+            out[cols] += block.T.dot(vec[rows])
+        for rows, cols, U, V in self.low_rank_blocks:
+            out[cols] += V.T.dot(U.T.dot(vec[rows]))
+        return out
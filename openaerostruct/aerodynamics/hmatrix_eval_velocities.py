@@ -0,0 +1,92 @@
+from __future__ import print_function
+import numpy as np
+
+from openaerostruct.aerodynamics.eval_mtx import _get_u_dir
+from openaerostruct.aerodynamics.hmatrix import HMatrix
+from openaerostruct.aerodynamics.matrix_free_eval_velocities import MatrixFreeEvalVelocities
+
+
+class HMatrixEvalVelocities(MatrixFreeEvalVelocities):
+    """
+    Compute the total velocities at the evaluation points without forming the
+    dense velocity influence matrices.
+
+    The influence of the vortex rings on the three velocity components at
+    each evaluation point is stored as an H-matrix, compressed by adaptive
+    cross approximation to the relative tolerance `hmatrix_tol`. The products
+    with the circulations use the H-matrix, while the derivatives with respect
+    to the geometry and alpha are computed matrix-free by direct summation, as
+    in MatrixFreeEvalVelocities.
+
+    Parameters
+    ----------
+    vortex_mesh[nx, ny, 3] : numpy array
+        The actual aerodynamic mesh used in VLM calculations. One exists for
+        each lifting surface.
+    eval_name[num_eval_points, 3] : numpy array
+        The evaluation points, either collocation or force points.
+    freestream_velocities[system_size, 3] : numpy array
+        The rotated freestream velocities at each evaluation point.
+    circulations[system_size] : numpy array
+        The vortex ring circulations obtained from solving the AIC linear
+        system.
+    alpha : float
+        The angle of attack for the aircraft (all lifting surfaces) in degrees.
+
+    Returns
+    -------
+    velocities[num_eval_points, 3] : numpy array
+        The actual velocities experienced at the evaluation points for each
+        lifting surface in the system. This is the summation of the freestream
+        velocities and the induced velocities caused by the circulations.
+    """
+
+    def initialize(self):
+        super(HMatrixEvalVelocities, self).initialize()
+        self.options.declare('hmatrix_tol', default=1e-6, types=float,
+                             desc='Relative tolerance of the low-rank blocks.')
+        self.options.declare('leaf_size', default=64, types=int,
+                             desc='Maximum number of points in the leaves of the cluster trees.')
+        self.options.declare('eta', default=2., types=float,
+                             desc='Admissibility parameter; larger values compress more blocks.')
+
+    def setup(self):
+        super(HMatrixEvalVelocities, self).setup()
+
+        self.hmtx = None
+        self.hmtx_inputs = None
+
+    def _update(self, inputs):
+        rings = self.rings
+
+        nodes = rings.get_nodes(inputs, self.options['surfaces'])
+        points = inputs[self.options['eval_name']].copy()
+        alpha = self._get_alpha(inputs)
+
+        # The H-matrix only depends on the geometry and alpha, so it is
+        # rebuilt only when those change.
+        key = (nodes, points, np.array([alpha]))
+        if self.hmtx_inputs is not None and \
+                all(np.array_equal(a, b) for a, b in zip(key, self.hmtx_inputs)):
+            return
+        self.hmtx_inputs = key
+
+        u = _get_u_dir(alpha)
+        lower, upper = rings.get_boxes(nodes, u)
+
+        def entries(pts, cols):
+            return rings.velocities(points[pts], nodes, u, cols).transpose((0, 2, 1))
+
+        self.hmtx = HMatrix(points, lower, upper, entries, num_components=3,
+            tol=self.options['hmatrix_tol'], leaf_size=self.options['leaf_size'],
+            eta=self.options['eta'])
+
+    def _induced_velocities(self, inputs, circulations):
+        self._update(inputs)
+        return self.hmtx.matvec(circulations[self.rings.ring_col]).reshape(
+            (self.options['num_eval_points'], 3))
+
+    def _induced_velocities_transpose(self, inputs, d_vel):
+        self._update(inputs)
+        return np.bincount(self.rings.ring_col, self.hmtx.rmatvec(d_vel.flatten()),
+            minlength=self.system_size)
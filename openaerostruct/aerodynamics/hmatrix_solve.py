@@ -0,0 +1,293 @@
+from __future__ import print_function
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import LinearOperator
+
+import openmdao.api as om
+
+from openaerostruct.aerodynamics.eval_mtx import _get_u_dir
+from openaerostruct.aerodynamics.hmatrix import HMatrix
+from openaerostruct.aerodynamics.solve_matrix import gmres_solve
+from openaerostruct.aerodynamics.vortex_rings import VortexRings
+
+
+class HMatrixSolve(om.ImplicitComponent):
+    """
+    Solve the AIC linear system for the vortex ring circulations without
+    forming the dense AIC matrix.
+
+    The normal-wash influence of the vortex rings on the collocation points
+    is stored as an H-matrix, with the well-separated blocks compressed by
+    adaptive cross approximation to the relative tolerance `hmatrix_tol`.
+    The system is solved with GMRES, preconditioned by the LU factorizations
+    of the dense diagonal leaf blocks, and warm-started from the previous
+    solution.
+
+    The derivatives with respect to the geometry and alpha are computed
+    matrix-free by direct summation over blocks of collocation points. They
+    are exact for the underlying (uncompressed) influence matrix, so they
+    agree with the compressed residual to within `hmatrix_tol`.
+
+    Parameters
+    ----------
+    vortex_mesh[nx, ny, 3] : numpy array
+        The actual aerodynamic mesh used in VLM calculations. One exists for
+        each lifting surface.
+    coll_pts[system_size, 3] : numpy array
+        The collocation points for all lifting surfaces.
+    normals[nx-1, ny-1, 3] : numpy array
+        The normal vector for each panel. One exists for each lifting surface.
+    freestream_velocities[system_size, 3] : numpy array
+        The rotated freestream velocities at each collocation point.
+    alpha : float
+        The angle of attack for the aircraft (all lifting surfaces) in degrees.
+
+    Returns
+    -------
+    circulations[system_size] : numpy array
+        The vortex ring circulations obtained by solving the AIC linear system.
+    """
+
+    def initialize(self):
+        self.options.declare('surfaces', types=list)
+        self.options.declare('hmatrix_tol', default=1e-6, types=float,
+                             desc='Relative tolerance of the low-rank blocks.')
+        self.options.declare('leaf_size', default=64, types=int,
+                             desc='Maximum number of panels in the leaves of the cluster trees.')
+        self.options.declare('eta', default=2., types=float,
+                             desc='Admissibility parameter; larger values compress more blocks.')
+        self.options.declare('gmres_tol', default=1e-10, types=float,
+                             desc='Relative tolerance for the GMRES solves.')
+        self.options.declare('gmres_restart', default=500, types=int,
+                             desc='Number of GMRES iterations before restarting.')
+        self.options.declare('gmres_maxiter', default=1500, types=int,
+                             desc='Maximum total number of GMRES iterations.')
+
+    def setup(self):
+        surfaces = self.options['surfaces']
+
+        self.rings = VortexRings(surfaces)
+        system_size = self.system_size = self.rings.system_size
+
+        for surface in surfaces:
+            nx = surface['mesh'].shape[0]
+            ny = surface['mesh'].shape[1]
+            name = surface['name']
+
+            if surface['symmetry']:
+                self.add_input(name + '_vortex_mesh', shape=(nx, 2 * ny - 1, 3), units='m')
+            else:
+                self.add_input(name + '_vortex_mesh', shape=(nx, ny, 3), units='m')
+            self.add_input(name + '_normals', shape=(nx - 1, ny - 1, 3))
+
+        self.add_input('coll_pts', shape=(system_size, 3), units='m')
+        self.add_input('freestream_velocities', shape=(system_size, 3), units='m/s')
+        self.add_input('alpha', val=1., units='deg')
+        self.add_output('circulations', shape=system_size, units='m**2/s')
+
+        self.hmtx = None
+        self.hmtx_inputs = None
+        self.velocities = None
+        self.num_gmres_iterations = 0
+        self.linear_guess = {'fwd': None, 'rev': None}
+
+    def _get_normals(self, inputs):
+        return np.concatenate([inputs[surface['name'] + '_normals'].reshape((-1, 3))
+            for surface in self.options['surfaces']])
+
+    def _update(self, inputs):
+        surfaces = self.options['surfaces']
+        rings = self.rings
+
+        nodes = rings.get_nodes(inputs, surfaces)
+        coll_pts = inputs['coll_pts'].copy()
+        normals = self._get_normals(inputs)
+        alpha = inputs['alpha'][0]
+
+        # The H-matrix only depends on the geometry and alpha, so it is
+        # rebuilt only when those change.
+        key = (nodes, coll_pts, normals, np.array([alpha]))
+        if self.hmtx_inputs is not None and \
+                all(np.array_equal(a, b) for a, b in zip(key, self.hmtx_inputs)):
+            return
+        self.hmtx_inputs = key
+
+        u = _get_u_dir(alpha)
+        lower, upper = rings.get_boxes(nodes, u)
+
+        def entries(points, cols):
+            vel = rings.velocities(coll_pts[points], nodes, u, cols)
+            return np.einsum('ijk,ik->ij', vel, normals[points])[:, None, :]
+
+        self.hmtx = HMatrix(coll_pts, lower, upper, entries,
+            tol=self.options['hmatrix_tol'], leaf_size=self.options['leaf_size'],
+            eta=self.options['eta'])
+
+        # Block-Jacobi preconditioner from the diagonal leaf blocks
+        self.precon = []
+        for panels in self.hmtx.row_leaves:
+            vel = rings.panel_velocities(coll_pts[panels], nodes, u, panels)
+            block = np.einsum('ijk,ik->ij', vel, normals[panels])
+            self.precon.append((panels, lu_factor(block)))
+
+    def _matvec(self, vec):
+        return self.hmtx.matvec(vec[self.rings.ring_col])
+
+    def _rmatvec(self, vec):
+        return np.bincount(self.rings.ring_col, self.hmtx.rmatvec(vec),
+            minlength=self.system_size)
+
+    def _solve(self, rhs, guess, trans=0):
+        size = self.system_size
+
+        def precon(vec):
+            out = np.empty_like(vec)
+            for panels, lu in self.precon:
+                out[panels] = lu_solve(lu, vec[panels], trans=trans)
+            return out
+
+        if trans == 0:
+            A = LinearOperator((size, size), matvec=self._matvec, dtype=rhs.dtype)
+        else:
+            A = LinearOperator((size, size), matvec=self._rmatvec, dtype=rhs.dtype)
+        M = LinearOperator((size, size), matvec=precon, dtype=rhs.dtype)
+
+        def count(res):
+            self.num_gmres_iterations += 1
+
+        return gmres_solve(A, rhs, guess, M, self.options['gmres_tol'],
+            self.options['gmres_restart'], self.options['gmres_maxiter'], callback=count,
+            name=self.pathname)
+
+    def apply_nonlinear(self, inputs, outputs, residuals):
+        self._update(inputs)
+        self.velocities = None
+        normals = self._get_normals(inputs)
+
+        residuals['circulations'] = self._matvec(outputs['circulations']) \
+            + np.einsum('ij,ij->i', inputs['freestream_velocities'], normals)
+
+    def solve_nonlinear(self, inputs, outputs):
+        self._update(inputs)
+        self.velocities = None
+        normals = self._get_normals(inputs)
+
+        rhs = -np.einsum('ij,ij->i', inputs['freestream_velocities'], normals)
+        outputs['circulations'] = self._solve(rhs, outputs['circulations'])
+
+    def linearize(self, inputs, outputs, partials):
+        self._update(inputs)
+        self._get_velocities(inputs, outputs)
+
+    def _get_velocities(self, inputs, outputs):
+        """
+        Return the velocities at the collocation points, which are needed for
+        the derivatives with respect to the normals. They are computed once
+        per linearization point.
+        """
+        if self.velocities is None:
+            self.velocities = inputs['freestream_velocities'] + self.rings.induced_velocities(
+                inputs['coll_pts'], self.rings.get_nodes(inputs, self.options['surfaces']),
+                inputs['alpha'][0], outputs['circulations'])
+
+        return self.velocities
+
+    def apply_linear(self, inputs, outputs, d_inputs, d_outputs, d_residuals, mode):
+        surfaces = self.options['surfaces']
+        rings = self.rings
+
+        nodes = rings.get_nodes(inputs, surfaces)
+        normals = self._get_normals(inputs)
+        alpha = inputs['alpha'][0]
+        circulations = outputs['circulations']
+
+        mesh_names = [surface['name'] + '_vortex_mesh' for surface in surfaces]
+        normals_names = [surface['name'] + '_normals' for surface in surfaces]
+
+        if any(name in d_inputs for name in normals_names):
+            velocities = self._get_velocities(inputs, outputs)
+
+        if mode == 'fwd':
+            d_res = np.zeros(self.system_size)
+
+            if 'circulations' in d_outputs:
+                d_res += self._matvec(d_outputs['circulations'])
+
+            d_points = None
+            if 'coll_pts' in d_inputs:
+                d_points = d_inputs['coll_pts']
+
+            d_nodes = None
+            if any(name in d_inputs for name in mesh_names):
+                d_nodes = np.zeros((rings.num_nodes, 3))
+                for name, node_slice in zip(mesh_names, rings.node_slices):
+                    if name in d_inputs:
+                        d_nodes[node_slice] = d_inputs[name].reshape((-1, 3))
+
+            d_alpha = None
+            if 'alpha' in d_inputs:
+                d_alpha = d_inputs['alpha'][0]
+
+            if d_points is not None or d_nodes is not None or d_alpha is not None:
+                d_vel = rings.jacvec(inputs['coll_pts'], nodes, alpha, circulations,
+                    d_points, d_nodes, d_alpha)
+                d_res += np.einsum('ij,ij->i', d_vel, normals)
+
+            if 'freestream_velocities' in d_inputs:
+                d_res += np.einsum('ij,ij->i', d_inputs['freestream_velocities'], normals)
+
+            ind_1 = 0
+            for surface, name in zip(surfaces, normals_names):
+                nx = surface['mesh'].shape[0]
+                ny = surface['mesh'].shape[1]
+                ind_2 = ind_1 + (nx - 1) * (ny - 1)
+                if name in d_inputs:
+                    d_res[ind_1:ind_2] += np.einsum('ij,ij->i',
+                        d_inputs[name].reshape((-1, 3)), velocities[ind_1:ind_2])
+                ind_1 = ind_2
+
+            d_residuals['circulations'] += d_res
+
+        else:
+            d_res = d_residuals['circulations']
+
+            if 'circulations' in d_outputs:
+                d_outputs['circulations'] += self._rmatvec(d_res)
+
+            if 'freestream_velocities' in d_inputs:
+                d_inputs['freestream_velocities'] += d_res[:, None] * normals
+
+            ind_1 = 0
+            for surface, name in zip(surfaces, normals_names):
+                nx = surface['mesh'].shape[0]
+                ny = surface['mesh'].shape[1]
+                ind_2 = ind_1 + (nx - 1) * (ny - 1)
+                if name in d_inputs:
+                    d_inputs[name] += (d_res[ind_1:ind_2, None]
+                        * velocities[ind_1:ind_2]).reshape((nx - 1, ny - 1, 3))
+                ind_1 = ind_2
+
+            if 'coll_pts' in d_inputs or 'alpha' in d_inputs or \
+                    any(name in d_inputs for name in mesh_names):
+                d_points, d_nodes, d_alpha = rings.vecjac(inputs['coll_pts'], nodes, alpha,
+                    circulations, d_res[:, None] * normals)
+
+                if 'coll_pts' in d_inputs:
+                    d_inputs['coll_pts'] += d_points
+                if 'alpha' in d_inputs:
+                    d_inputs['alpha'] += d_alpha
+                for name, node_slice in zip(mesh_names, rings.node_slices):
+                    if name in d_inputs:
+                        d_inputs[name] += d_nodes[node_slice].reshape(d_inputs[name].shape)
+
+    def solve_linear(self, d_outputs, d_residuals, mode):
+        guess = self.linear_guess[mode]
+
+        if mode == 'fwd':
+            sol = self._solve(d_residuals['circulations'], guess, trans=0)
+            d_outputs['circulations'] = sol
+        else:
+            sol = self._solve(d_outputs['circulations'], guess, trans=1)
+            d_residuals['circulations'] = sol
+
+        self.linear_guess[mode] = sol
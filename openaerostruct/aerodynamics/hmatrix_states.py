@@ -0,0 +1,115 @@
+import openmdao.api as om
+from openaerostruct.aerodynamics.collocation_points import CollocationPoints
+from openaerostruct.aerodynamics.convert_velocity import ConvertVelocity
+from openaerostruct.aerodynamics.hmatrix_solve import HMatrixSolve
+from openaerostruct.aerodynamics.hmatrix_eval_velocities import HMatrixEvalVelocities
+from openaerostruct.aerodynamics.horseshoe_circulations import HorseshoeCirculations
+from openaerostruct.aerodynamics.rotational_velocity import RotationalVelocity
+from openaerostruct.aerodynamics.mesh_point_forces import MeshPointForces
+from openaerostruct.aerodynamics.panel_forces import PanelForces
+from openaerostruct.aerodynamics.panel_forces_surf import PanelForcesSurf
+from openaerostruct.aerodynamics.vortex_mesh import VortexMesh
+
+
+class HMatrixVLMStates(om.Group):
+    """
+    Group that computes the aerodynamic states like VLMStates, but stores the
+    influence matrices as H-matrices instead of dense arrays.
+
+    Memory and the cost of the iterative solve scale close to N log N in the
+    number of panels N, which allows meshes too large for the dense AIC
+    matrices. The compression error is controlled by `hmatrix_tol`. The
+    derivatives with respect to the geometry are evaluated matrix-free, in
+    O(N) memory but O(N^2) time.
+    """
+
+    def initialize(self):
+        self.options.declare('surfaces', types=list)
+        self.options.declare('rotational', False, types=bool,
+                             desc="Set to True to turn on support for computing angular velocities")
+        self.options.declare('hmatrix_tol', default=1e-6, types=float,
+                             desc='Relative tolerance of the low-rank blocks of the H-matrices.')
+        self.options.declare('leaf_size', default=64, types=int,
+                             desc='Maximum number of panels in the leaves of the cluster trees.')
+        self.options.declare('eta', default=2., types=float,
+                             desc='Admissibility parameter; larger values compress more blocks.')
+
+    def setup(self):
+        surfaces = self.options['surfaces']
+        rotational = self.options['rotational']
+        hmatrix_options = {
+            'hmatrix_tol': self.options['hmatrix_tol'],
+            'leaf_size': self.options['leaf_size'],
+            'eta': self.options['eta'],
+        }
+
+        num_collocation_points = 0
+        for surface in surfaces:
+            mesh=surface['mesh']
+            nx = self.nx = mesh.shape[0]
+            ny = self.ny = mesh.shape[1]
+            num_collocation_points += (ny - 1) * (nx - 1)
+
+        num_force_points = num_collocation_points
+
+        # Get collocation points
+        self.add_subsystem('collocation_points',
+             CollocationPoints(surfaces=surfaces),
+             promotes_inputs=['*'],
+             promotes_outputs=['coll_pts', 'force_pts', 'bound_vecs'])
+
+        # Compute the vortex mesh based off the deformed aerodynamic mesh
+        self.add_subsystem('vortex_mesh',
+            VortexMesh(surfaces=surfaces),
+            promotes_inputs=['*'],
+            promotes_outputs=['*'])
+
+        # Convert freestream velocity to array of velocities
+        if rotational:
+            self.add_subsystem('rotational_velocity',
+                 RotationalVelocity(surfaces=surfaces),
+                 promotes_inputs=['*'],
+                 promotes_outputs=['*'])
+
+        self.add_subsystem('convert_velocity',
+             ConvertVelocity(surfaces=surfaces, rotational=rotational),
+             promotes_inputs=['*'],
+             promotes_outputs=['*'])
+
+        # Solve for the ring circs using the compressed AIC
+        self.add_subsystem('solve_matrix',
+             HMatrixSolve(surfaces=surfaces, **hmatrix_options),
+             promotes_inputs=['*'],
+             promotes_outputs=['*'])
+
+        # Convert ring circs to horseshoe circs
+        self.add_subsystem('horseshoe_circulations',
+             HorseshoeCirculations(surfaces=surfaces),
+             promotes_inputs=['*'],
+             promotes_outputs=['*'])
+
+        # Get the velocities at the force points using the compressed
+        # velocity influence matrix
+        self.add_subsystem('eval_velocities',
+             HMatrixEvalVelocities(surfaces=surfaces, num_eval_points=num_force_points,
+                eval_name='force_pts', **hmatrix_options),
+             promotes_inputs=['*'],
+             promotes_outputs=['*'])
+
+        # Get sectional panel forces
+        self.add_subsystem('panel_forces',
+             PanelForces(surfaces=surfaces),
+             promotes_inputs=['*'],
+             promotes_outputs=['*'])
+
+        # Get panel forces for each lifting surface individually
+        self.add_subsystem('panel_forces_surf',
+             PanelForcesSurf(surfaces=surfaces),
+             promotes_inputs=['*'],
+             promotes_outputs=['*'])
+
+        # Get nodal forces for each lifting surface individually
+        self.add_subsystem('mesh_point_forces_surf',
+             MeshPointForces(surfaces=surfaces),
+             promotes_inputs=['*'],
+             promotes_outputs=['*'])
@@ -0,0 +1,174 @@
+from __future__ import print_function
+import numpy as np
+
+import openmdao.api as om
+
+from openaerostruct.aerodynamics.vortex_rings import VortexRings
+
+
+class MatrixFreeEvalVelocities(om.ExplicitComponent):
+    """
+    Compute the total velocities at the evaluation points by direct summation
+    over the vortex rings, without forming the velocity influence matrix.
+
+    This replaces the combination of GetVectors, EvalVelMtx and EvalVelocities
+    for one set of evaluation points. The [num_eval_points, system_size, 3]
+    influence matrix and its partials are never stored; the induced velocities
+    are summed block by block, and the derivatives are provided as
+    matrix-vector products through compute_jacvec_product. Because of that,
+    this component cannot be used under a solver that needs an assembled
+    Jacobian.
+
+    Parameters
+    ----------
+    vortex_mesh[nx, ny, 3] : numpy array
+        The actual aerodynamic mesh used in VLM calculations. One exists for
+        each lifting surface.
+    eval_name[num_eval_points, 3] : numpy array
+        The evaluation points, either collocation or force points.
+    freestream_velocities[system_size, 3] : numpy array
+        The rotated freestream velocities at each evaluation point.
+    circulations[system_size] : numpy array
+        The vortex ring circulations obtained from solving the AIC linear
+        system.
+    alpha : float
+        The angle of attack for the aircraft (all lifting surfaces) in degrees.
+        Only used if `body_fixed_wake` is False.
+
+    Returns
+    -------
+    velocities[num_eval_points, 3] : numpy array
+        The actual velocities experienced at the evaluation points for each
+        lifting surface in the system. This is the summation of the freestream
+        velocities and the induced velocities caused by the circulations.
+    """
+
+    def initialize(self):
+        self.options.declare('surfaces', types=list)
+        self.options.declare('eval_name', types=str)
+        self.options.declare('num_eval_points', types=int)
+        self.options.declare('body_fixed_wake', default=False, types=bool,
+                             desc='If True, align the trailing vortex legs with the body x-axis '
+                             'instead of the freestream.')
+
+    def setup(self):
+        surfaces = self.options['surfaces']
+        eval_name = self.options['eval_name']
+        num_eval_points = self.options['num_eval_points']
+
+        self.rings = VortexRings(surfaces)
+        system_size = self.system_size = self.rings.system_size
+
+        for surface in surfaces:
+            nx = surface['mesh'].shape[0]
+            ny = surface['mesh'].shape[1]
+            name = surface['name']
+
+            if surface['symmetry']:
+                self.add_input(name + '_vortex_mesh', shape=(nx, 2 * ny - 1, 3), units='m')
+            else:
+                self.add_input(name + '_vortex_mesh', shape=(nx, ny, 3), units='m')
+
+        self.add_input(eval_name, shape=(num_eval_points, 3), units='m')
+        self.add_input('freestream_velocities', shape=(system_size, 3), units='m/s')
+        self.add_input('circulations', shape=system_size, units='m**2/s')
+        if not self.options['body_fixed_wake']:
+            self.add_input('alpha', val=1., units='deg')
+        self.add_output('{}_velocities'.format(eval_name), shape=(num_eval_points, 3), units='m/s')
+
+    def _get_alpha(self, inputs):
+        """
+        Return the angle of attack that sets the direction of the trailing
+        vortex legs; a body-fixed wake follows the x-axis.
+        """
+        if self.options['body_fixed_wake']:
+            return 0.
+        return inputs['alpha'][0]
+
+    def _induced_velocities(self, inputs, circulations):
+        """
+        Compute the velocities induced at the evaluation points by the given
+        circulations.
+        """
+        rings = self.rings
+        return rings.induced_velocities(inputs[self.options['eval_name']],
+            rings.get_nodes(inputs, self.options['surfaces']), self._get_alpha(inputs), circulations)
+
+    def _induced_velocities_transpose(self, inputs, d_vel):
+        """
+        Multiply the transpose of the map from the circulations to the induced
+        velocities by d_vel.
+        """
+        rings = self.rings
+        return rings.induced_velocities_transpose(inputs[self.options['eval_name']],
+            rings.get_nodes(inputs, self.options['surfaces']), self._get_alpha(inputs), d_vel)
+
+    def compute(self, inputs, outputs):
+        eval_name = self.options['eval_name']
+
+        outputs[eval_name + '_velocities'] = inputs['freestream_velocities'] + \
+            self._induced_velocities(inputs, inputs['circulations'])
+
+    def compute_jacvec_product(self, inputs, d_inputs, d_outputs, mode):
+        surfaces = self.options['surfaces']
+        eval_name = self.options['eval_name']
+        num_eval_points = self.options['num_eval_points']
+        velocities_name = eval_name + '_velocities'
+        rings = self.rings
+
+        nodes = rings.get_nodes(inputs, surfaces)
+        alpha = self._get_alpha(inputs)
+        mesh_names = [surface['name'] + '_vortex_mesh' for surface in surfaces]
+
+        if mode == 'fwd':
+            d_vel = np.zeros((num_eval_points, 3))
+
+            if 'freestream_velocities' in d_inputs:
+                d_vel += d_inputs['freestream_velocities']
+
+            # The velocities are linear in the circulations
+            if 'circulations' in d_inputs:
+                d_vel += self._induced_velocities(inputs, d_inputs['circulations'])
+
+            d_points = None
+            if eval_name in d_inputs:
+                d_points = d_inputs[eval_name]
+
+            d_nodes = None
+            if any(name in d_inputs for name in mesh_names):
+                d_nodes = np.zeros((rings.num_nodes, 3))
+                for name, node_slice in zip(mesh_names, rings.node_slices):
+                    if name in d_inputs:
+                        d_nodes[node_slice] = d_inputs[name].reshape((-1, 3))
+
+            d_alpha = None
+            if 'alpha' in d_inputs:
+                d_alpha = d_inputs['alpha'][0]
+
+            if d_points is not None or d_nodes is not None or d_alpha is not None:
+                d_vel += rings.jacvec(inputs[eval_name], nodes, alpha, inputs['circulations'],
+                    d_points, d_nodes, d_alpha)
+
+            d_outputs[velocities_name] += d_vel
+
+        else:
+            d_vel = d_outputs[velocities_name]
+
+            if 'freestream_velocities' in d_inputs:
+                d_inputs['freestream_velocities'] += d_vel
+
+            if 'circulations' in d_inputs:
+                d_inputs['circulations'] += self._induced_velocities_transpose(inputs, d_vel)
+
+            if eval_name in d_inputs or 'alpha' in d_inputs or \
+                    any(name in d_inputs for name in mesh_names):
+                d_points, d_nodes, d_alpha = rings.vecjac(inputs[eval_name], nodes, alpha,
+                    inputs['circulations'], d_vel)
+
+                if eval_name in d_inputs:
+                    d_inputs[eval_name] += d_points
+                if 'alpha' in d_inputs:
+                    d_inputs['alpha'] += d_alpha
+                for name, node_slice in zip(mesh_names, rings.node_slices):
+                    if name in d_inputs:
+                        d_inputs[name] += d_nodes[node_slice].reshape(d_inputs[name].shape)
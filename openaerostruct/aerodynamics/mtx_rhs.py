@@ -166,10 +166,8 @@ class VLMMtxRHSComp(om.ExplicitComponent):
             vel_mtx_name = '{}_{}_vel_mtx'.format(name, 'coll_pts')
             normals_name = '{}_normals'.format(name)
 
-            partials['mtx', vel_mtx_name] = np.einsum('ijk,ik->ijk',
-                np.ones((system_size, num, 3)),
-                self.normals_n_3,
-            ).flatten()
+            partials['mtx', vel_mtx_name] = np.broadcast_to(
+                self.normals_n_3[:, np.newaxis, :], (system_size, num, 3)).flatten()
 
             partials['mtx', normals_name] = self.mtx_n_n_3[ind_1:ind_2, :, :].flatten()
 
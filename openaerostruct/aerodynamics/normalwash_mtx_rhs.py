@@ -0,0 +1,343 @@
+from __future__ import print_function
+import numpy as np
+
+import openmdao.api as om
+
+from openaerostruct.aerodynamics.eval_mtx import _compute_vel_mtx, _compute_vel_mtx_derivs, \
+    _compute_vel_mtx_unique, _compute_vel_mtx_unique_derivs, _get_vel_mtx_sparsity, _get_u_dir
+
+
+class VLMNormalwashMtxRHSComp(om.ExplicitComponent):
+    """
+    Compute the fully assembled AIC matrix and the right-hand side of the AIC
+    linear system directly from the vortex rings and the panel normals.
+
+    This replaces the combination of EvalVelMtx at the collocation points and
+    VLMMtxRHSComp. Instead of storing the velocity influence of every ring on
+    every collocation point as a [system_size, system_size, 3] array and then
+    projecting it onto the normals, the influence is projected block by block
+    as it is computed. The partials with respect to the vectors then only
+    need 3 entries per ring corner instead of 9, and the partials of the
+    intermediate vel_mtx are never stored.
+
+    The `block_size`, `fuse_vectors`, `unique_filaments`, and
+    `body_fixed_wake` options have the same meaning as in EvalVelMtx.
+
+    Parameters
+    ----------
+    alpha : float
+        The angle of attack for the aircraft (all lifting surfaces) in degrees.
+        Only used if `body_fixed_wake` is False.
+    freestream_velocities[system_size, 3] : numpy array
+        The rotated freestream velocities at each collocation point for all
+        lifting surfaces.
+    vectors[system_size, nx, ny, 3] : numpy array
+        The vectors from the aerodynamic meshes to the collocation points.
+        For the symmetric case, the third dimension is length (2 * ny - 1).
+        There is one of these arrays for each lifting surface in the problem.
+        Only used if `fuse_vectors` is False.
+    vortex_mesh[nx, ny, 3] : numpy array
+        The vortex mesh for each lifting surface, mirrored across the symmetry
+        plane if the surface is symmetric. Only used if `fuse_vectors` is True.
+    coll_pts[system_size, 3] : numpy array
+        The collocation points for all lifting surfaces. Only used if
+        `fuse_vectors` is True.
+    normals[nx-1, ny-1, 3] : numpy array
+        The normal vector for each panel, computed as the cross of the two
+        diagonals from the mesh points.
+
+    Returns
+    -------
+    mtx[system_size, system_size] : numpy array
+        Final fully assembled AIC matrix that is used to solve for the
+        circulations.
+    rhs[system_size] : numpy array
+        Right-hand side of the AIC linear system, constructed from the
+        freestream velocities and panel normals.
+    """
+
+    def initialize(self):
+        self.options.declare('surfaces', types=list)
+        self.options.declare('block_size', default=None, types=int, allow_none=True,
+                             desc='Number of collocation points to process at once. '
+                             'If None, all collocation points are processed together.')
+        self.options.declare('fuse_vectors', default=False, types=bool,
+                             desc='If True, take the vortex meshes and collocation points as '
+                             'inputs instead of the vectors computed by GetVectors.')
+        self.options.declare('unique_filaments', default=False, types=bool,
+                             desc='If True, evaluate each unique vortex filament once and '
+                             'assemble the rings from them.')
+        self.options.declare('body_fixed_wake', default=False, types=bool,
+                             desc='If True, align the trailing vortex legs with the body x-axis '
+                             'so that the AIC matrix does not depend on alpha.')
+
+    def setup(self):
+        surfaces = self.options['surfaces']
+        fuse_vectors = self.options['fuse_vectors']
+
+        system_size = 0
+
+        # Loop through the surfaces to compute the total number of panels;
+        # the system_size
+        for surface in surfaces:
+            mesh = surface['mesh']
+            nx = mesh.shape[0]
+            ny = mesh.shape[1]
+            system_size += (nx - 1) * (ny - 1)
+
+        self.system_size = system_size
+
+        if not self.options['body_fixed_wake']:
+            self.add_input('alpha', val=1., units='deg')
+        self.add_input('freestream_velocities', shape=(system_size, 3), units='m/s')
+        self.add_output('mtx', shape=(system_size, system_size), units='1/m')
+        self.add_output('rhs', shape=system_size, units='m/s')
+
+        if fuse_vectors:
+            self.add_input('coll_pts', val=np.zeros((system_size, 3)), units='m')
+
+        # Set up indicies arrays for sparse Jacobians
+        vel_indices = np.arange(system_size * 3).reshape((system_size, 3))
+        mtx_indices = np.arange(system_size * system_size).reshape((system_size, system_size))
+        rhs_indices = np.arange(system_size)
+
+        self.declare_partials('rhs', 'freestream_velocities',
+            rows=np.einsum('i,j->ij', rhs_indices, np.ones(3, int)).flatten(),
+            cols=vel_indices.flatten()
+        )
+
+        # The partials wrt the collocation points sum over all ring corners,
+        # so we declare a dense row of 3 entries per mtx entry.
+        if fuse_vectors:
+            self.declare_partials('mtx', 'coll_pts',
+                rows=np.repeat(np.arange(system_size * system_size), 3),
+                cols=np.einsum('ik,j->ijk', vel_indices, np.ones(system_size, int)).flatten(),
+            )
+
+        # Number of partials entries per collocation point for each of the
+        # four ring corners, and the maps from those entries for a single
+        # collocation point to the partials wrt that point.
+        self.corner_sizes = {}
+        self.eval_maps = {}
+
+        ind_1 = 0
+        ind_2 = 0
+
+        # Loop through each surface to add inputs and set up derivatives.
+        # We keep track of the surface's indices within the total system's
+        # indices to access the matrix in the correct locations for the derivs.
+        for surface in surfaces:
+            mesh=surface['mesh']
+            nx = mesh.shape[0]
+            ny = mesh.shape[1]
+            name = surface['name']
+            num = (nx - 1) * (ny - 1)
+
+            ind_2 += num
+
+            normals_name = '{}_normals'.format(name)
+            self.add_input(normals_name, shape=(nx - 1, ny - 1, 3))
+
+            if surface['symmetry']:
+                actual_ny_size = 2 * ny - 1
+            else:
+                actual_ny_size = ny
+
+            # Start from the sparsity pattern of the vel_mtx partials and keep
+            # only the entries for the first velocity component, since the
+            # projection onto the normals sums over the velocity components.
+            rows, cols, sizes = _get_vel_mtx_sparsity(system_size, nx, ny, surface['symmetry'])
+            mask = rows % 3 == 0
+            rows = rows[mask] // 3
+            cols = cols[mask]
+            rows = mtx_indices[rows // num, ind_1 + rows % num]
+
+            self.corner_sizes[name] = [size // 3 for size in sizes]
+
+            if fuse_vectors:
+                mesh_name = name + '_vortex_mesh'
+                num_mesh = nx * actual_ny_size * 3
+
+                self.add_input(mesh_name, shape=(nx, actual_ny_size, 3), units='m')
+
+                # Because vectors = coll_pts - vortex_mesh, the partials wrt
+                # the vortex mesh have the same layout as those wrt the
+                # vectors, just without the collocation point in the columns.
+                self.declare_partials('mtx', mesh_name, rows=rows, cols=cols % num_mesh)
+
+                offsets = np.concatenate([[0], np.cumsum(self.corner_sizes[name])[:-1]
+                    * system_size])
+                self.eval_maps[name] = [
+                    (rows[offset:offset + size] - ind_1) * 3 + cols[offset:offset + size] % 3
+                    for offset, size in zip(offsets, self.corner_sizes[name])
+                ]
+
+            else:
+                vectors_name = '{}_coll_pts_vectors'.format(name)
+                self.add_input(vectors_name,
+                    shape=(system_size, nx, actual_ny_size, 3), units='m')
+                self.declare_partials('mtx', vectors_name, rows=rows, cols=cols)
+
+            normals_indices = np.arange(num * 3).reshape((num, 3))
+
+            self.declare_partials('mtx', normals_name,
+                rows=np.einsum('ij,k->ijk', mtx_indices[ind_1:ind_2, :], np.ones(3, int)).flatten(),
+                cols=np.einsum('ik,j->ijk', normals_indices, np.ones(system_size, int)).flatten(),
+            )
+            self.declare_partials('rhs', normals_name,
+                rows=np.outer(rhs_indices[ind_1:ind_2], np.ones(3, int)).flatten(),
+                cols=normals_indices.flatten(),
+            )
+
+            ind_1 += num
+
+        # It's worth the cs cost here because alpha is just a scalar
+        if not self.options['body_fixed_wake']:
+            self.declare_partials('mtx', 'alpha', method='cs')
+
+        self.set_check_partial_options(wrt='*', method='cs')
+
+    def compute(self, inputs, outputs):
+        surfaces = self.options['surfaces']
+        system_size = self.system_size
+        block_size = self.options['block_size'] or system_size
+
+        if self.options['unique_filaments']:
+            compute_vel_mtx = _compute_vel_mtx_unique
+        else:
+            compute_vel_mtx = _compute_vel_mtx
+
+        u_dir = self._get_u_dir(inputs)
+        normals = self._get_normals(inputs)
+
+        ind_1 = 0
+        for surface in surfaces:
+            nx = surface['mesh'].shape[0]
+            ny = surface['mesh'].shape[1]
+            name = surface['name']
+            num = (nx - 1) * (ny - 1)
+
+            # Project each block of velocity influences onto the normals of
+            # its collocation points as soon as it is computed.
+            for blk_1 in range(0, system_size, block_size):
+                blk_2 = min(blk_1 + block_size, system_size)
+
+                vectors = self._get_vectors(inputs, name, blk_1, blk_2)
+                vel_mtx = compute_vel_mtx(vectors, u_dir, ny, surface['symmetry'])
+
+                outputs['mtx'][blk_1:blk_2, ind_1:ind_1 + num] = np.einsum('ijk,ik->ij',
+                    vel_mtx.reshape((blk_2 - blk_1, num, 3)), normals[blk_1:blk_2])
+
+            ind_1 += num
+
+        outputs['rhs'] = -np.einsum('ij,ij->i', inputs['freestream_velocities'], normals)
+
+    def compute_partials(self, inputs, partials):
+        surfaces = self.options['surfaces']
+        system_size = self.system_size
+        block_size = self.options['block_size'] or system_size
+        fuse_vectors = self.options['fuse_vectors']
+
+        if self.options['unique_filaments']:
+            compute_vel_mtx = _compute_vel_mtx_unique
+            compute_vel_mtx_derivs = _compute_vel_mtx_unique_derivs
+        else:
+            compute_vel_mtx = _compute_vel_mtx
+            compute_vel_mtx_derivs = _compute_vel_mtx_derivs
+
+        u_dir = self._get_u_dir(inputs)
+        normals = self._get_normals(inputs)
+
+        # The partials wrt the normals of each surface hold the velocity
+        # influences on that surface's collocation points.
+        normals_data = []
+        ind_1 = 0
+        for surface in surfaces:
+            num = (surface['mesh'].shape[0] - 1) * (surface['mesh'].shape[1] - 1)
+            normals_name = '{}_normals'.format(surface['name'])
+            data = partials['mtx', normals_name].reshape((num, system_size, 3))
+            normals_data.append((ind_1, ind_1 + num, data))
+
+            partials['rhs', normals_name] = -inputs['freestream_velocities'][ind_1:ind_1 + num].flatten()
+            ind_1 += num
+
+        if fuse_vectors:
+            eval_data = partials['mtx', 'coll_pts'].reshape((system_size, system_size, 3))
+
+        ind_1 = 0
+        for surface in surfaces:
+            nx = surface['mesh'].shape[0]
+            ny = surface['mesh'].shape[1]
+            name = surface['name']
+            num = (nx - 1) * (ny - 1)
+            ind_2 = ind_1 + num
+
+            if fuse_vectors:
+                data = partials['mtx', name + '_vortex_mesh']
+                sign = -1.
+            else:
+                data = partials['mtx', '{}_coll_pts_vectors'.format(name)]
+                sign = 1.
+
+            sizes = self.corner_sizes[name]
+            offsets = np.concatenate([[0], np.cumsum(sizes)[:-1] * system_size])
+
+            for blk_1 in range(0, system_size, block_size):
+                blk_2 = min(blk_1 + block_size, system_size)
+                num_block = blk_2 - blk_1
+
+                vectors = self._get_vectors(inputs, name, blk_1, blk_2)
+
+                vel_mtx = compute_vel_mtx(vectors, u_dir, ny, surface['symmetry']).reshape(
+                    (num_block, num, 3))
+                for row_1, row_2, ndata in normals_data:
+                    lo = max(row_1, blk_1)
+                    hi = min(row_2, blk_2)
+                    if lo < hi:
+                        ndata[lo - row_1:hi - row_1, ind_1:ind_2] = vel_mtx[lo - blk_1:hi - blk_1]
+
+                # Project the derivatives of each ring corner onto the normals.
+                derivs = [
+                    np.einsum('ijkab,ia->ijkb', deriv, normals[blk_1:blk_2])
+                    for deriv in compute_vel_mtx_derivs(vectors, u_dir, ny, surface['symmetry'])
+                ]
+
+                for offset, size, deriv in zip(offsets, sizes, derivs):
+                    data[offset + blk_1 * size:offset + blk_2 * size] = sign * deriv.flatten()
+
+                # Sum the contributions from all ring corners for the
+                # partials wrt the collocation points.
+                if fuse_vectors:
+                    eval_block = np.zeros(num_block * num * 3)
+
+                    for eval_map, deriv in zip(self.eval_maps[name], derivs):
+                        inds = np.add.outer(np.arange(num_block) * num * 3, eval_map).flatten()
+                        eval_block += np.bincount(inds, weights=deriv.flatten(),
+                            minlength=num_block * num * 3)
+
+                    eval_data[blk_1:blk_2, ind_1:ind_2] = eval_block.reshape((num_block, num, 3))
+
+            ind_1 = ind_2
+
+        partials['rhs', 'freestream_velocities'] = -normals.flatten()
+
+    def _get_u_dir(self, inputs):
+        if self.options['body_fixed_wake']:
+            return np.array([1., 0., 0.])
+
+        return _get_u_dir(inputs['alpha'][0])
+
+    def _get_normals(self, inputs):
+        return np.concatenate([inputs['{}_normals'.format(surface['name'])].reshape((-1, 3))
+            for surface in self.options['surfaces']])
+
+    def _get_vectors(self, inputs, name, ind_1, ind_2):
+        """
+        Return the vectors from the vortex mesh of one surface to a block of
+        collocation points, computing them on the fly if fuse_vectors is True.
+        """
+        if self.options['fuse_vectors']:
+            coll_pts = inputs['coll_pts'][ind_1:ind_2]
+            return coll_pts[:, np.newaxis, np.newaxis, :] - inputs[name + '_vortex_mesh']
+        else:
+            return inputs['{}_coll_pts_vectors'.format(name)][ind_1:ind_2]
@@ -1,14 +1,85 @@
 from __future__ import print_function
+from inspect import signature
+
 import numpy as np
 from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import LinearOperator, gmres
 
 import openmdao.api as om
 
 
+# SciPy 1.12 renamed the relative tolerance of gmres from tol to rtol, and
+# SciPy 1.14 removed tol.
+_gmres_rtol = 'rtol' if 'rtol' in signature(gmres).parameters else 'tol'
+
+
+def gmres_solve(A, rhs, guess, M, rtol, restart, maxiter, callback=None, name=''):
+    """
+    Solve a linear system with restarted GMRES.
+
+    Parameters
+    ----------
+    A : LinearOperator
+        The system matrix.
+    rhs : numpy array
+        The right-hand side.
+    guess : numpy array or None
+        The initial guess.
+    M : LinearOperator
+        The preconditioner, which approximates the inverse of A.
+    rtol : float
+        Relative tolerance on the residual.
+    restart : int
+        Number of iterations between restarts.
+    maxiter : int
+        Maximum total number of iterations, rounded up to a whole number of
+        restart cycles.
+    callback : function or None
+        Called with the preconditioned residual norm after each iteration.
+    name : str
+        Name of the calling system, used in the error message.
+
+    Returns
+    -------
+    sol : numpy array
+        The solution of the linear system.
+
+    Raises
+    ------
+    AnalysisError
+        If GMRES does not converge within maxiter iterations.
+    """
+    kwargs = {_gmres_rtol: rtol}
+    num_cycles = max(1, -(-maxiter // restart))
+
+    # Allowing more iterations than the restart length lets GMRES polish the
+    # solution when the preconditioned residual has converged but the true
+    # residual has not.
+    sol, info = gmres(A, rhs, x0=guess, M=M, atol=0., restart=restart, maxiter=num_cycles,
+                      callback=callback, callback_type='pr_norm', **kwargs)
+    if info != 0:
+        raise om.AnalysisError('{}: GMRES did not converge.'.format(name))
+
+    return sol
+
+
 class SolveMatrix(om.ImplicitComponent):
     """
     Solve the AIC linear system to obtain the vortex ring circulations.
 
+    The LU factorization of the AIC matrix is cached and only recomputed when
+    the matrix actually changes, so that linearize does not refactor the
+    matrix that was just factored in solve_nonlinear. The number of
+    factorizations performed and skipped are tracked in the
+    `num_factorizations` and `num_factorizations_skipped` attributes.
+
+    With `solver='gmres'`, the system is instead solved iteratively with
+    GMRES, preconditioned by the LU factorizations of each surface's
+    self-influence block (block Jacobi). Both the nonlinear solve and the
+    linear solves for derivatives are warm-started from their previous
+    solutions, which change very little between optimizer iterations. The
+    total number of GMRES iterations is tracked in `num_gmres_iterations`.
+
     Parameters
     ----------
     mtx[system_size, system_size] : numpy array
@@ -27,19 +98,41 @@ class SolveMatrix(om.ImplicitComponent):
 
     def initialize(self):
         self.options.declare('surfaces', types=list)
+        self.options.declare('cache_lu', default=True, types=bool,
+                             desc='If True, reuse the LU factorization while the AIC matrix '
+                             'is unchanged.')
+        self.options.declare('solver', default='direct', values=['direct', 'gmres'],
+                             desc='Use a dense LU solve or GMRES with a block-Jacobi '
+                             'preconditioner built from the self-influence of each surface.')
+        self.options.declare('gmres_tol', default=1e-12, types=float,
+                             desc='Relative tolerance for the GMRES solves.')
+        self.options.declare('gmres_restart', default=200, types=int,
+                             desc='Number of GMRES iterations before restarting.')
+        self.options.declare('gmres_maxiter', default=600, types=int,
+                             desc='Maximum total number of GMRES iterations.')
 
     def setup(self):
         system_size = 0
+        self.surface_slices = []
 
         for surface in self.options['surfaces']:
             mesh = surface['mesh']
             nx = mesh.shape[0]
             ny = mesh.shape[1]
 
-            system_size += (nx - 1) * (ny - 1)
+            num = (nx - 1) * (ny - 1)
+            self.surface_slices.append(slice(system_size, system_size + num))
+            system_size += num
 
         self.system_size = system_size
 
+        self.lu = None
+        self.lu_mtx = None
+        self.num_factorizations = 0
+        self.num_factorizations_skipped = 0
+        self.num_gmres_iterations = 0
+        self.linear_guess = {'fwd': None, 'rev': None}
+
         self.add_input('mtx', shape=(system_size, system_size), units='1/m')
         self.add_input('rhs', shape=system_size, units='m/s')
         self.add_output('circulations', shape=system_size, units='m**2/s')
@@ -61,20 +154,64 @@ class SolveMatrix(om.ImplicitComponent):
         residuals['circulations'] = inputs['mtx'].dot(outputs['circulations']) - inputs['rhs']
 
     def solve_nonlinear(self, inputs, outputs):
-        self.lu = lu_factor(inputs['mtx'])
+        self._factor(inputs['mtx'])
 
-        outputs['circulations'] = lu_solve(self.lu, inputs['rhs'])
+        outputs['circulations'] = self._solve(inputs['rhs'], outputs['circulations'])
 
     def linearize(self, inputs, outputs, partials):
         system_size = self.system_size
-        self.lu = lu_factor(inputs['mtx'])
+        self._factor(inputs['mtx'])
 
         partials['circulations', 'circulations'] = inputs['mtx'].flatten()
         partials['circulations', 'mtx'] = \
             np.outer(np.ones(system_size), outputs['circulations']).flatten()
 
+    def _factor(self, mtx):
+        # Comparing the matrices is O(N^2), while the factorization is O(N^3).
+        if self.options['cache_lu'] and self.lu_mtx is not None \
+                and mtx.dtype == self.lu_mtx.dtype and np.array_equal(mtx, self.lu_mtx):
+            self.num_factorizations_skipped += 1
+            return
+
+        if self.options['solver'] == 'direct':
+            self.lu = lu_factor(mtx)
+        else:
+            self.lu = [lu_factor(mtx[surf_slice, surf_slice])
+                       for surf_slice in self.surface_slices]
+        self.lu_mtx = mtx.copy()
+        self.num_factorizations += 1
+
+    def _solve(self, rhs, guess, trans=0):
+        if self.options['solver'] == 'direct':
+            return lu_solve(self.lu, rhs, trans=trans)
+
+        mtx = self.lu_mtx if trans == 0 else self.lu_mtx.T
+
+        def precon(vec):
+            out = np.empty_like(vec)
+            for surf_slice, lu in zip(self.surface_slices, self.lu):
+                out[surf_slice] = lu_solve(lu, vec[surf_slice], trans=trans)
+            return out
+
+        size = self.system_size
+        M = LinearOperator((size, size), matvec=precon, dtype=mtx.dtype)
+        A = LinearOperator((size, size), matvec=mtx.dot, dtype=mtx.dtype)
+
+        def count(res):
+            self.num_gmres_iterations += 1
+
+        return gmres_solve(A, rhs, guess, M, self.options['gmres_tol'],
+            self.options['gmres_restart'], self.options['gmres_maxiter'], callback=count,
+            name=self.pathname)
+
     def solve_linear(self, d_outputs, d_residuals, mode):
+        guess = self.linear_guess[mode]
+
         if mode == 'fwd':
-            d_outputs['circulations'] = lu_solve(self.lu, d_residuals['circulations'], trans=0)
+            sol = self._solve(d_residuals['circulations'], guess, trans=0)
+            d_outputs['circulations'] = sol
         else:
-            d_residuals['circulations'] = lu_solve(self.lu, d_outputs['circulations'], trans=1)
+            sol = self._solve(d_outputs['circulations'], guess, trans=1)
+            d_residuals['circulations'] = sol
+
+        self.linear_guess[mode] = sol
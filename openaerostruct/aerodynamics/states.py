@@ -4,9 +4,11 @@ from openaerostruct.aerodynamics.collocation_points import CollocationPoints
 from openaerostruct.aerodynamics.eval_mtx import EvalVelMtx
 from openaerostruct.aerodynamics.convert_velocity import ConvertVelocity
 from openaerostruct.aerodynamics.mtx_rhs import VLMMtxRHSComp
+from openaerostruct.aerodynamics.normalwash_mtx_rhs import VLMNormalwashMtxRHSComp
 from openaerostruct.aerodynamics.solve_matrix import SolveMatrix
 from openaerostruct.aerodynamics.horseshoe_circulations import HorseshoeCirculations
 from openaerostruct.aerodynamics.eval_velocities import EvalVelocities
+from openaerostruct.aerodynamics.matrix_free_eval_velocities import MatrixFreeEvalVelocities
 from openaerostruct.aerodynamics.rotational_velocity import RotationalVelocity
 from openaerostruct.aerodynamics.mesh_point_forces import MeshPointForces
 from openaerostruct.aerodynamics.panel_forces import PanelForces
@@ -23,10 +25,40 @@ class VLMStates(om.Group):
         self.options.declare('surfaces', types=list)
         self.options.declare('rotational', False, types=bool,
                              desc="Set to True to turn on support for computing angular velocities")
+        self.options.declare('aic_block_size', default=None, types=int, allow_none=True,
+                             desc='Number of evaluation points to process at once when '
+                             'assembling the AIC matrices. If None, all points are processed together.')
+        self.options.declare('fuse_vectors', default=False, types=bool,
+                             desc='If True, compute the vectors from the vortex meshes to the '
+                             'evaluation points inside the AIC assembly instead of storing them.')
+        self.options.declare('unique_filaments', default=False, types=bool,
+                             desc='If True, evaluate each unique vortex filament once when '
+                             'assembling the AIC matrices.')
+        self.options.declare('aic_solver', default='direct', values=['direct', 'gmres'],
+                             desc='Solver for the AIC linear system, either a dense LU solve or '
+                             'GMRES with a per-surface block-Jacobi preconditioner.')
+        self.options.declare('normalwash_mtx', default=False, types=bool,
+                             desc='If True, project the AIC terms onto the panel normals as '
+                             'they are computed instead of storing the full velocity influences.')
+        self.options.declare('matrix_free_forces', default=False, types=bool,
+                             desc='If True, compute the velocities at the force points by direct '
+                             'summation instead of assembling the force-point AIC matrix. '
+                             'This requires a matrix-free linear solver.')
+        self.options.declare('body_fixed_wake', default=False, types=bool,
+                             desc='If True, align the trailing vortex legs with the body x-axis '
+                             'instead of the freestream, so that the AIC matrix and its '
+                             'factorization only depend on the geometry.')
 
     def setup(self):
         surfaces = self.options['surfaces']
         rotational = self.options['rotational']
+        aic_block_size = self.options['aic_block_size']
+        fuse_vectors = self.options['fuse_vectors']
+        unique_filaments = self.options['unique_filaments']
+        aic_solver = self.options['aic_solver']
+        normalwash_mtx = self.options['normalwash_mtx']
+        matrix_free_forces = self.options['matrix_free_forces']
+        body_fixed_wake = self.options['body_fixed_wake']
 
         num_collocation_points = 0
         for surface in surfaces:
@@ -50,18 +82,23 @@ class VLMStates(om.Group):
             promotes_outputs=['*'])
 
         # Get vectors from mesh points to collocation points
-        self.add_subsystem('get_vectors',
-             GetVectors(surfaces=surfaces, num_eval_points=num_collocation_points,
-                eval_name='coll_pts'),
-             promotes_inputs=['*'],
-             promotes_outputs=['*'])
+        if not fuse_vectors:
+            self.add_subsystem('get_vectors',
+                 GetVectors(surfaces=surfaces, num_eval_points=num_collocation_points,
+                    eval_name='coll_pts'),
+                 promotes_inputs=['*'],
+                 promotes_outputs=['*'])
 
-        # Construct matrix based on rings, not horseshoes
-        self.add_subsystem('mtx_assy',
-             EvalVelMtx(surfaces=surfaces, num_eval_points=num_collocation_points,
-                eval_name='coll_pts'),
-             promotes_inputs=['*'],
-             promotes_outputs=['*'])
+        # Construct matrix based on rings, not horseshoes. With normalwash_mtx,
+        # this is done together with the projection onto the normals below.
+        if not normalwash_mtx:
+            self.add_subsystem('mtx_assy',
+                 EvalVelMtx(surfaces=surfaces, num_eval_points=num_collocation_points,
+                    eval_name='coll_pts', block_size=aic_block_size,
+                    fuse_vectors=fuse_vectors, unique_filaments=unique_filaments,
+                    body_fixed_wake=body_fixed_wake),
+                 promotes_inputs=['*'],
+                 promotes_outputs=['*'])
 
         # Convert freestream velocity to array of velocities
         if rotational:
@@ -76,14 +113,21 @@ class VLMStates(om.Group):
              promotes_outputs=['*'])
 
         # Construct RHS and full matrix of system
+        if normalwash_mtx:
+            mtx_rhs = VLMNormalwashMtxRHSComp(surfaces=surfaces, block_size=aic_block_size,
+                fuse_vectors=fuse_vectors, unique_filaments=unique_filaments,
+                body_fixed_wake=body_fixed_wake)
+        else:
+            mtx_rhs = VLMMtxRHSComp(surfaces=surfaces)
+
         self.add_subsystem('mtx_rhs',
-             VLMMtxRHSComp(surfaces=surfaces),
+             mtx_rhs,
              promotes_inputs=['*'],
              promotes_outputs=['*'])
 
         # Solve Mtx RHS to get ring circs
         self.add_subsystem('solve_matrix',
-             SolveMatrix(surfaces=surfaces),
+             SolveMatrix(surfaces=surfaces, solver=aic_solver),
              promotes_inputs=['*'],
              promotes_outputs=['*'])
 
@@ -93,26 +137,38 @@ class VLMStates(om.Group):
              promotes_inputs=['*'],
              promotes_outputs=['*'])
 
-        # Eval force vectors
-        self.add_subsystem('get_vectors_force',
-             GetVectors(surfaces=surfaces, num_eval_points=num_force_points,
-                eval_name='force_pts'),
-             promotes_inputs=['*'],
-             promotes_outputs=['*'])
+        if matrix_free_forces:
+            # Sum the velocities induced by the circulations directly
+            self.add_subsystem('eval_velocities',
+                 MatrixFreeEvalVelocities(surfaces=surfaces, num_eval_points=num_force_points,
+                    eval_name='force_pts', body_fixed_wake=body_fixed_wake),
+                 promotes_inputs=['*'],
+                 promotes_outputs=['*'])
 
-        # Set up force mtx
-        self.add_subsystem('mtx_assy_forces',
-             EvalVelMtx(surfaces=surfaces, num_eval_points=num_force_points,
-                eval_name='force_pts'),
-             promotes_inputs=['*'],
-             promotes_outputs=['*'])
+        else:
+            # Eval force vectors
+            if not fuse_vectors:
+                self.add_subsystem('get_vectors_force',
+                     GetVectors(surfaces=surfaces, num_eval_points=num_force_points,
+                        eval_name='force_pts'),
+                     promotes_inputs=['*'],
+                     promotes_outputs=['*'])
+
+            # Set up force mtx
+            self.add_subsystem('mtx_assy_forces',
+                 EvalVelMtx(surfaces=surfaces, num_eval_points=num_force_points,
+                    eval_name='force_pts', block_size=aic_block_size,
+                    fuse_vectors=fuse_vectors, unique_filaments=unique_filaments,
+                    body_fixed_wake=body_fixed_wake),
+                 promotes_inputs=['*'],
+                 promotes_outputs=['*'])
 
-        # Multiply by horseshoe circs to get velocities
-        self.add_subsystem('eval_velocities',
-             EvalVelocities(surfaces=surfaces, num_eval_points=num_force_points,
-                eval_name='force_pts'),
-             promotes_inputs=['*'],
-             promotes_outputs=['*'])
+            # Multiply by horseshoe circs to get velocities
+            self.add_subsystem('eval_velocities',
+                 EvalVelocities(surfaces=surfaces, num_eval_points=num_force_points,
+                    eval_name='force_pts'),
+                 promotes_inputs=['*'],
+                 promotes_outputs=['*'])
 
         # Get sectional panel forces
         self.add_subsystem('panel_forces',
@@ -0,0 +1,89 @@
+import unittest
+import numpy as np
+
+import openmdao.api as om
+
+from openaerostruct.aerodynamics.alpha_sweep_states import VLMAlphaSweepStates
+from openaerostruct.aerodynamics.states import VLMStates
+from openaerostruct.utils.testing import get_default_surfaces
+
+
+class Test(unittest.TestCase):
+
+    def get_prob(self, surfaces, states, alpha):
+        indep_var_comp = om.IndepVarComp()
+        indep_var_comp.add_output('alpha', val=alpha, units='deg')
+        indep_var_comp.add_output('beta', val=1.5, units='deg')
+        indep_var_comp.add_output('v', val=50., units='m/s')
+        indep_var_comp.add_output('rho', val=1.1, units='kg/m**3')
+
+        for surface in surfaces:
+            name = surface['name']
+            mesh = surface['mesh']
+            normals = np.cross(mesh[1:, 1:] - mesh[:-1, :-1], mesh[:-1, 1:] - mesh[1:, :-1])
+            normals /= np.linalg.norm(normals, axis=-1)[:, :, np.newaxis]
+
+            indep_var_comp.add_output(name + '_def_mesh', val=mesh, units='m')
+            indep_var_comp.add_output(name + '_normals', val=normals)
+
+        prob = om.Problem()
+        prob.model.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+        prob.model.add_subsystem('states', states, promotes=['*'])
+        prob.setup()
+        prob.run_model()
+
+        return prob
+
+    def test_matches_states(self):
+        surfaces = get_default_surfaces()
+        alphas = np.array([-2., 3., 5., 3.])
+
+        sweep = self.get_prob(surfaces,
+            VLMAlphaSweepStates(surfaces=surfaces, num_alpha=len(alphas), aic_block_size=5,
+                unique_filaments=True), alphas)
+
+        # Repeated angles of attack share a factorization
+        self.assertEqual(sweep.model.states.alpha_sweep.num_factorizations, 3)
+
+        for ind, alpha in enumerate(alphas):
+            prob = self.get_prob(surfaces, VLMStates(surfaces=surfaces), alpha)
+
+            np.testing.assert_allclose(sweep['circulations'][ind], prob['circulations'],
+                rtol=1e-12, atol=1e-12)
+
+            for surface in surfaces:
+                name = surface['name'] + '_sec_forces'
+                np.testing.assert_allclose(sweep[name][ind], prob[name], rtol=1e-12, atol=1e-10)
+
+    def test_body_fixed_wake(self):
+        surfaces = get_default_surfaces()
+        alphas = np.array([-2., 3., 5.])
+
+        sweep = self.get_prob(surfaces,
+            VLMAlphaSweepStates(surfaces=surfaces, num_alpha=len(alphas), body_fixed_wake=True),
+            alphas)
+
+        # All angles of attack share a single factorization
+        self.assertEqual(sweep.model.states.alpha_sweep.num_factorizations, 1)
+
+        prob = self.get_prob(surfaces, VLMStates(surfaces=surfaces, body_fixed_wake=True),
+            alphas[0])
+
+        for ind, alpha in enumerate(alphas):
+            prob['alpha'] = alpha
+            prob.run_model()
+
+            np.testing.assert_allclose(sweep['circulations'][ind], prob['circulations'],
+                rtol=1e-12, atol=1e-12)
+
+            for surface in surfaces:
+                name = surface['name'] + '_sec_forces'
+                np.testing.assert_allclose(sweep[name][ind], prob[name], rtol=1e-12, atol=1e-10)
+
+        # The AIC matrix does not change with alpha, so SolveMatrix keeps its
+        # factorization.
+        self.assertEqual(prob.model.states.solve_matrix.num_factorizations, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
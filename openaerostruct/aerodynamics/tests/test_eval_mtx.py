@@ -1,8 +1,11 @@
 import unittest
+import numpy as np
+
 import openmdao.api as om
 from openmdao.utils.assert_utils import assert_check_partials
 
 from openaerostruct.aerodynamics.eval_mtx import EvalVelMtx
+from openaerostruct.aerodynamics.get_vectors import GetVectors
 from openaerostruct.utils.testing import run_test, get_default_surfaces
 
 
@@ -32,6 +35,172 @@ class Test(unittest.TestCase):
 
         data = prob.check_partials(compact_print=True, out_stream=None, method='cs', step=1e-40)
         assert_check_partials(data, atol=1e20, rtol=1e-6)
+    def test_block_size(self):
+        surfaces = get_default_surfaces()
+
+        comp = EvalVelMtx(surfaces=surfaces, num_eval_points=5, eval_name='test_name',
+            block_size=2)
+
+        run_test(self, comp, complex_flag=True)
+
+    def test_block_size_matches(self):
+        surfaces = get_default_surfaces()
+
+        of = ['{}_test_name_vel_mtx'.format(surface['name']) for surface in surfaces]
+        wrt = ['{}_test_name_vectors'.format(surface['name']) for surface in surfaces]
+
+        probs = []
+        for block_size in [None, 2]:
+            np.random.seed(314)
+
+            indep_var_comp = om.IndepVarComp()
+            for surface in surfaces:
+                nx, ny = surface['mesh'].shape[:2]
+                if surface['symmetry']:
+                    ny = 2 * ny - 1
+                indep_var_comp.add_output('{}_test_name_vectors'.format(surface['name']),
+                    val=np.random.random_sample((5, nx, ny, 3)), units='m')
+
+            prob = om.Problem()
+            prob.model.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+            prob.model.add_subsystem('comp', EvalVelMtx(surfaces=surfaces, num_eval_points=5,
+                eval_name='test_name', block_size=block_size), promotes=['*'])
+            prob.setup()
+            prob.run_model()
+            probs.append(prob)
+
+        for name in of:
+            np.testing.assert_array_equal(probs[0][name], probs[1][name])
+
+        jacs = [prob.compute_totals(of=of, wrt=wrt) for prob in probs]
+
+        for key in jacs[0]:
+            np.testing.assert_array_equal(jacs[0][key], jacs[1][key])
+
+    def test_fuse_vectors(self):
+        surfaces = get_default_surfaces()
+
+        comp = EvalVelMtx(surfaces=surfaces, num_eval_points=5, eval_name='test_name',
+            block_size=2, fuse_vectors=True)
+
+        run_test(self, comp, complex_flag=True)
+
+    def test_fuse_vectors_matches(self):
+        surfaces = get_default_surfaces()
+
+        of = ['{}_test_name_vel_mtx'.format(surface['name']) for surface in surfaces]
+        wrt = ['test_name'] + ['{}_vortex_mesh'.format(surface['name']) for surface in surfaces]
+
+        probs = []
+        for fuse_vectors in [False, True]:
+            np.random.seed(314)
+
+            indep_var_comp = om.IndepVarComp()
+            indep_var_comp.add_output('test_name', val=np.random.random_sample((5, 3)), units='m')
+            for surface in surfaces:
+                nx, ny = surface['mesh'].shape[:2]
+                if surface['symmetry']:
+                    ny = 2 * ny - 1
+                indep_var_comp.add_output('{}_vortex_mesh'.format(surface['name']),
+                    val=np.random.random_sample((nx, ny, 3)), units='m')
+
+            prob = om.Problem()
+            prob.model.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+            if not fuse_vectors:
+                prob.model.add_subsystem('get_vectors', GetVectors(surfaces=surfaces,
+                    num_eval_points=5, eval_name='test_name'), promotes=['*'])
+            prob.model.add_subsystem('comp', EvalVelMtx(surfaces=surfaces, num_eval_points=5,
+                eval_name='test_name', fuse_vectors=fuse_vectors), promotes=['*'])
+            prob.setup()
+            prob.run_model()
+            probs.append(prob)
+
+        for name in of:
+            np.testing.assert_allclose(probs[0][name], probs[1][name], rtol=1e-12, atol=1e-14)
+
+        jacs = [prob.compute_totals(of=of, wrt=wrt) for prob in probs]
+
+        for key in jacs[0]:
+            np.testing.assert_allclose(jacs[0][key], jacs[1][key], rtol=1e-12, atol=1e-12)
+
+    def test_unique_filaments(self):
+        surfaces = get_default_surfaces()
+
+        comp = EvalVelMtx(surfaces=surfaces, num_eval_points=5, eval_name='test_name',
+            unique_filaments=True)
+
+        run_test(self, comp, complex_flag=True)
+
+    def test_unique_filaments_matches(self):
+        surfaces = get_default_surfaces()
+
+        of = ['{}_test_name_vel_mtx'.format(surface['name']) for surface in surfaces]
+        wrt = ['{}_test_name_vectors'.format(surface['name']) for surface in surfaces]
+
+        probs = []
+        for unique_filaments in [False, True]:
+            np.random.seed(314)
+
+            indep_var_comp = om.IndepVarComp()
+            for surface in surfaces:
+                nx, ny = surface['mesh'].shape[:2]
+                if surface['symmetry']:
+                    ny = 2 * ny - 1
+                indep_var_comp.add_output('{}_test_name_vectors'.format(surface['name']),
+                    val=np.random.random_sample((5, nx, ny, 3)), units='m')
+
+            prob = om.Problem()
+            prob.model.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+            prob.model.add_subsystem('comp', EvalVelMtx(surfaces=surfaces, num_eval_points=5,
+                eval_name='test_name', unique_filaments=unique_filaments), promotes=['*'])
+            prob.setup()
+            prob.run_model()
+            probs.append(prob)
+
+        for name in of:
+            np.testing.assert_allclose(probs[0][name], probs[1][name], rtol=1e-10, atol=1e-12)
+
+        jacs = [prob.compute_totals(of=of, wrt=wrt) for prob in probs]
+
+        for key in jacs[0]:
+            np.testing.assert_allclose(jacs[0][key], jacs[1][key], rtol=1e-10, atol=1e-12)
+
+    def test_body_fixed_wake(self):
+        surfaces = get_default_surfaces()
+
+        of = ['{}_test_name_vel_mtx'.format(surface['name']) for surface in surfaces]
+
+        # A body-fixed wake matches the default wake at zero angle of attack
+        # and does not change with alpha.
+        probs = []
+        for alpha, body_fixed_wake in [(0., False), (5., True)]:
+            np.random.seed(314)
+
+            indep_var_comp = om.IndepVarComp()
+            indep_var_comp.add_output('alpha', val=alpha, units='deg')
+            for surface in surfaces:
+                nx, ny = surface['mesh'].shape[:2]
+                if surface['symmetry']:
+                    ny = 2 * ny - 1
+                indep_var_comp.add_output('{}_test_name_vectors'.format(surface['name']),
+                    val=np.random.random_sample((5, nx, ny, 3)), units='m')
+
+            prob = om.Problem()
+            prob.model.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+            prob.model.add_subsystem('comp', EvalVelMtx(surfaces=surfaces, num_eval_points=5,
+                eval_name='test_name', body_fixed_wake=body_fixed_wake), promotes=['*'])
+            prob.setup()
+            prob.run_model()
+            probs.append(prob)
+
+        for name in of:
+            np.testing.assert_allclose(probs[0][name], probs[1][name], rtol=1e-12, atol=1e-12)
+
+        comp = EvalVelMtx(surfaces=surfaces, num_eval_points=5, eval_name='test_name',
+            body_fixed_wake=True)
+
+        run_test(self, comp, complex_flag=True)
+
 
 if __name__ == '__main__':
     unittest.main()
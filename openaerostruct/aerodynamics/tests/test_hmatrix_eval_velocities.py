@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+
+import openmdao.api as om
+
+from openaerostruct.aerodynamics.collocation_points import CollocationPoints
+from openaerostruct.aerodynamics.vortex_rings import VortexRings
+from openaerostruct.aerodynamics.hmatrix_eval_velocities import HMatrixEvalVelocities
+from openaerostruct.aerodynamics.vortex_mesh import VortexMesh
+from openaerostruct.geometry.utils import generate_mesh
+from openaerostruct.utils.testing import run_test, get_default_surfaces
+
+
+def get_group(surfaces, comp):
+    system_size = 0
+    for surface in surfaces:
+        nx, ny = surface['mesh'].shape[:2]
+        system_size += (nx - 1) * (ny - 1)
+
+    np.random.seed(314)
+
+    indep_var_comp = om.IndepVarComp()
+    for surface in surfaces:
+        indep_var_comp.add_output(surface['name'] + '_def_mesh', val=surface['mesh'], units='m')
+    indep_var_comp.add_output('freestream_velocities',
+        val=np.random.random_sample((system_size, 3)), units='m/s')
+    indep_var_comp.add_output('circulations',
+        val=np.random.random_sample(system_size), units='m**2/s')
+    indep_var_comp.add_output('alpha', val=5., units='deg')
+
+    group = om.Group()
+    group.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+    group.add_subsystem('vortex_mesh', VortexMesh(surfaces=surfaces), promotes=['*'])
+    group.add_subsystem('collocation_points', CollocationPoints(surfaces=surfaces),
+        promotes=['*'])
+    group.add_subsystem('comp', comp, promotes=['*'])
+
+    return group
+
+
+class Test(unittest.TestCase):
+
+    def test(self):
+        surfaces = get_default_surfaces()
+
+        comp = HMatrixEvalVelocities(surfaces=surfaces, eval_name='force_pts',
+            num_eval_points=11, hmatrix_tol=1e-12, leaf_size=2)
+        group = get_group(surfaces, comp)
+
+        run_test(self, group, atol=1e-4, rtol=1e-4)
+
+    def test_matches_direct_summation(self):
+        surfaces = get_default_surfaces()
+        surfaces[0]['mesh'] = generate_mesh({'num_y': 41, 'num_x': 3, 'wing_type': 'rect',
+            'symmetry': True})
+        surfaces[1]['mesh'] = surfaces[1]['mesh'].copy()
+        surfaces[1]['mesh'][:, :, 1] += 50.
+
+        comp = HMatrixEvalVelocities(surfaces=surfaces, eval_name='force_pts',
+            num_eval_points=48, hmatrix_tol=1e-6, leaf_size=8)
+        prob = om.Problem(get_group(surfaces, comp))
+        prob.setup()
+        prob.run_model()
+
+        self.assertTrue(len(comp.hmtx.low_rank_blocks) > 0)
+
+        rings = VortexRings(surfaces)
+        nodes = np.concatenate([prob[surface['name'] + '_vortex_mesh'].reshape((-1, 3))
+            for surface in surfaces])
+        velocities = prob['freestream_velocities'] + rings.induced_velocities(
+            prob['force_pts'], nodes, 5., prob['circulations'])
+
+        np.testing.assert_allclose(prob['force_pts_velocities'], velocities, rtol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+
+import openmdao.api as om
+
+from openaerostruct.aerodynamics.collocation_points import CollocationPoints
+from openaerostruct.aerodynamics.eval_mtx import _get_u_dir
+from openaerostruct.aerodynamics.vortex_rings import VortexRings
+from openaerostruct.aerodynamics.hmatrix_solve import HMatrixSolve
+from openaerostruct.aerodynamics.vortex_mesh import VortexMesh
+from openaerostruct.geometry.utils import generate_mesh
+from openaerostruct.utils.testing import run_test, get_default_surfaces
+
+
+def get_surfaces():
+    surfaces = get_default_surfaces()
+
+    # Use a finer wing mesh and move the tail outboard so that some of the
+    # interactions are compressed.
+    surfaces[0]['mesh'] = generate_mesh({'num_y': 41, 'num_x': 3, 'wing_type': 'rect',
+        'symmetry': True})
+    surfaces[1]['mesh'] = surfaces[1]['mesh'].copy()
+    surfaces[1]['mesh'][:, :, 1] += 50.
+
+    return surfaces
+
+
+def get_group(surfaces, comp):
+    system_size = 0
+    for surface in surfaces:
+        nx, ny = surface['mesh'].shape[:2]
+        system_size += (nx - 1) * (ny - 1)
+
+    np.random.seed(314)
+
+    indep_var_comp = om.IndepVarComp()
+    for surface in surfaces:
+        nx, ny = surface['mesh'].shape[:2]
+        name = surface['name']
+        indep_var_comp.add_output(name + '_def_mesh', val=surface['mesh'], units='m')
+
+        normals = np.zeros((nx - 1, ny - 1, 3))
+        normals[:, :, 2] = 1.
+        normals += 0.1 * np.random.random_sample(normals.shape)
+        indep_var_comp.add_output(name + '_normals', val=normals)
+
+    freestream_velocities = np.zeros((system_size, 3))
+    freestream_velocities[:, 0] = 10.
+    freestream_velocities[:, 2] = 1.
+    indep_var_comp.add_output('freestream_velocities', val=freestream_velocities, units='m/s')
+    indep_var_comp.add_output('alpha', val=5., units='deg')
+
+    group = om.Group()
+    group.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+    group.add_subsystem('vortex_mesh', VortexMesh(surfaces=surfaces), promotes=['*'])
+    group.add_subsystem('collocation_points', CollocationPoints(surfaces=surfaces),
+        promotes=['*'])
+    group.add_subsystem('comp', comp, promotes=['*'])
+
+    return group
+
+
+class Test(unittest.TestCase):
+
+    def test(self):
+        surfaces = get_default_surfaces()
+
+        comp = HMatrixSolve(surfaces=surfaces, hmatrix_tol=1e-12, leaf_size=2)
+        group = get_group(surfaces, comp)
+
+        run_test(self, group, atol=1e-4, rtol=1e-4)
+
+    def test_matches_dense(self):
+        surfaces = get_surfaces()
+
+        comp = HMatrixSolve(surfaces=surfaces, hmatrix_tol=1e-6, leaf_size=8)
+        prob = om.Problem(get_group(surfaces, comp))
+        prob.setup()
+        prob.run_model()
+
+        # Some of the blocks are compressed.
+        self.assertTrue(len(comp.hmtx.low_rank_blocks) > 0)
+
+        rings = VortexRings(surfaces)
+        nodes = np.concatenate([prob[surface['name'] + '_vortex_mesh'].reshape((-1, 3))
+            for surface in surfaces])
+        normals = np.concatenate([prob[surface['name'] + '_normals'].reshape((-1, 3))
+            for surface in surfaces])
+        panels = np.arange(rings.system_size)
+
+        vel = rings.panel_velocities(prob['coll_pts'], nodes, _get_u_dir(5.), panels)
+        mtx = np.einsum('ijk,ik->ij', vel, normals)
+        rhs = -np.einsum('ij,ij->i', prob['freestream_velocities'], normals)
+
+        np.testing.assert_allclose(prob['circulations'], lu_solve(lu_factor(mtx), rhs),
+            rtol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import numpy as np
+
+import openmdao.api as om
+
+from openaerostruct.aerodynamics.collocation_points import CollocationPoints
+from openaerostruct.aerodynamics.eval_mtx import EvalVelMtx
+from openaerostruct.aerodynamics.eval_velocities import EvalVelocities
+from openaerostruct.aerodynamics.matrix_free_eval_velocities import MatrixFreeEvalVelocities
+from openaerostruct.aerodynamics.vortex_mesh import VortexMesh
+from openaerostruct.utils.testing import run_test, get_default_surfaces
+
+
+def get_group(surfaces, comps):
+    system_size = 0
+    for surface in surfaces:
+        nx, ny = surface['mesh'].shape[:2]
+        system_size += (nx - 1) * (ny - 1)
+
+    np.random.seed(314)
+
+    indep_var_comp = om.IndepVarComp()
+    for surface in surfaces:
+        indep_var_comp.add_output(surface['name'] + '_def_mesh', val=surface['mesh'], units='m')
+    indep_var_comp.add_output('freestream_velocities',
+        val=np.random.random_sample((system_size, 3)), units='m/s')
+    indep_var_comp.add_output('circulations',
+        val=np.random.random_sample(system_size), units='m**2/s')
+    indep_var_comp.add_output('alpha', val=5., units='deg')
+
+    group = om.Group()
+    group.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+    group.add_subsystem('vortex_mesh', VortexMesh(surfaces=surfaces), promotes=['*'])
+    group.add_subsystem('collocation_points', CollocationPoints(surfaces=surfaces),
+        promotes=['*'])
+    for name, comp in comps:
+        group.add_subsystem(name, comp, promotes=['*'])
+
+    return group
+
+
+class Test(unittest.TestCase):
+
+    def test(self):
+        surfaces = get_default_surfaces()
+
+        comp = MatrixFreeEvalVelocities(surfaces=surfaces, eval_name='force_pts',
+            num_eval_points=11)
+        group = get_group(surfaces, [('comp', comp)])
+
+        run_test(self, group, atol=1e-4, rtol=1e-4)
+
+    def test_matches_vel_mtx(self):
+        surfaces = get_default_surfaces()
+
+        of = ['force_pts_velocities']
+        wrt = ['alpha', 'circulations', 'freestream_velocities'] + \
+            [surface['name'] + '_def_mesh' for surface in surfaces]
+
+        for mode in ['fwd', 'rev']:
+            probs = []
+            for matrix_free in [False, True]:
+                if matrix_free:
+                    comps = [('eval_velocities', MatrixFreeEvalVelocities(surfaces=surfaces,
+                        eval_name='force_pts', num_eval_points=11))]
+                else:
+                    comps = [
+                        ('mtx_assy_forces', EvalVelMtx(surfaces=surfaces, eval_name='force_pts',
+                            num_eval_points=11, fuse_vectors=True)),
+                        ('eval_velocities', EvalVelocities(surfaces=surfaces,
+                            eval_name='force_pts', num_eval_points=11)),
+                    ]
+
+                prob = om.Problem(get_group(surfaces, comps))
+                prob.setup(mode=mode)
+                prob.run_model()
+                probs.append(prob)
+
+            np.testing.assert_allclose(probs[0]['force_pts_velocities'],
+                probs[1]['force_pts_velocities'], rtol=1e-12)
+
+            jacs = [prob.compute_totals(of=of, wrt=wrt) for prob in probs]
+
+            for key in jacs[0]:
+                np.testing.assert_allclose(jacs[0][key], jacs[1][key], rtol=1e-6, atol=1e-10)
+
+
+if __name__ == '__main__':
+    unittest.main()
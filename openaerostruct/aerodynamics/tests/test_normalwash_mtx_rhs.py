@@ -0,0 +1,83 @@
+import unittest
+import numpy as np
+
+import openmdao.api as om
+
+from openaerostruct.aerodynamics.eval_mtx import EvalVelMtx
+from openaerostruct.aerodynamics.mtx_rhs import VLMMtxRHSComp
+from openaerostruct.aerodynamics.normalwash_mtx_rhs import VLMNormalwashMtxRHSComp
+from openaerostruct.utils.testing import run_test, get_default_surfaces
+
+
+class Test(unittest.TestCase):
+
+    def test(self):
+        surfaces = get_default_surfaces()
+
+        comp = VLMNormalwashMtxRHSComp(surfaces=surfaces)
+
+        run_test(self, comp, complex_flag=True)
+
+    def test_fuse_vectors(self):
+        surfaces = get_default_surfaces()
+
+        comp = VLMNormalwashMtxRHSComp(surfaces=surfaces, block_size=3, fuse_vectors=True,
+            unique_filaments=True)
+
+        run_test(self, comp, complex_flag=True)
+
+    def test_matches_vel_mtx(self):
+        surfaces = get_default_surfaces()
+
+        system_size = 0
+        for surface in surfaces:
+            nx, ny = surface['mesh'].shape[:2]
+            system_size += (nx - 1) * (ny - 1)
+
+        wrt = ['alpha', 'freestream_velocities']
+        for surface in surfaces:
+            wrt.append('{}_coll_pts_vectors'.format(surface['name']))
+            wrt.append('{}_normals'.format(surface['name']))
+
+        probs = []
+        for normalwash in [False, True]:
+            np.random.seed(314)
+
+            indep_var_comp = om.IndepVarComp()
+            indep_var_comp.add_output('alpha', val=3., units='deg')
+            indep_var_comp.add_output('freestream_velocities',
+                val=np.random.random_sample((system_size, 3)), units='m/s')
+            for surface in surfaces:
+                nx, ny = surface['mesh'].shape[:2]
+                indep_var_comp.add_output('{}_normals'.format(surface['name']),
+                    val=np.random.random_sample((nx - 1, ny - 1, 3)))
+                if surface['symmetry']:
+                    ny = 2 * ny - 1
+                indep_var_comp.add_output('{}_coll_pts_vectors'.format(surface['name']),
+                    val=np.random.random_sample((system_size, nx, ny, 3)), units='m')
+
+            prob = om.Problem()
+            prob.model.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+            if normalwash:
+                prob.model.add_subsystem('mtx_rhs', VLMNormalwashMtxRHSComp(surfaces=surfaces,
+                    block_size=2), promotes=['*'])
+            else:
+                prob.model.add_subsystem('mtx_assy', EvalVelMtx(surfaces=surfaces,
+                    num_eval_points=system_size, eval_name='coll_pts'), promotes=['*'])
+                prob.model.add_subsystem('mtx_rhs', VLMMtxRHSComp(surfaces=surfaces),
+                    promotes=['*'])
+            prob.setup()
+            prob.run_model()
+            probs.append(prob)
+
+        for name in ['mtx', 'rhs']:
+            np.testing.assert_allclose(probs[0][name], probs[1][name], rtol=1e-12, atol=1e-12)
+
+        jacs = [prob.compute_totals(of=['mtx', 'rhs'], wrt=wrt) for prob in probs]
+
+        for key in jacs[0]:
+            np.testing.assert_allclose(jacs[0][key], jacs[1][key], rtol=1e-6, atol=1e-10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -33,6 +33,112 @@ class Test(unittest.TestCase):
 
         run_test(self, group)
 
+    def test_cached_lu(self):
+        surfaces = get_default_surfaces()
+
+        system_size = 0
+        for surface in surfaces:
+            nx = surface['mesh'].shape[0]
+            ny = surface['mesh'].shape[1]
+            system_size += (nx - 1) * (ny - 1)
+
+        np.random.seed(314)
+
+        indep_var_comp = om.IndepVarComp()
+        indep_var_comp.add_output('rhs', val=np.random.random_sample(system_size), units='m/s')
+        indep_var_comp.add_output('mtx',
+            val=np.identity(system_size) + 0.1 * np.random.random_sample((system_size, system_size)),
+            units='1/m')
+
+        prob = om.Problem()
+        prob.model.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+        prob.model.add_subsystem('solve_matrix', SolveMatrix(surfaces=surfaces), promotes=['*'])
+        prob.setup()
+
+        prob.run_model()
+        totals = prob.compute_totals(of=['circulations'], wrt=['rhs', 'mtx'])
+
+        # The linearization reuses the factorization from the nonlinear solve.
+        comp = prob.model.solve_matrix
+        self.assertEqual(comp.num_factorizations, 1)
+        self.assertEqual(comp.num_factorizations_skipped, 1)
+
+        np.testing.assert_allclose(prob['mtx'].dot(totals['circulations', 'rhs']),
+            np.identity(system_size), rtol=1e-10, atol=1e-12)
+
+        # A new matrix is factored again.
+        prob['mtx'] = prob['mtx'] + np.identity(system_size)
+        prob.run_model()
+        self.assertEqual(comp.num_factorizations, 2)
+        np.testing.assert_allclose(prob['mtx'].dot(prob['circulations']), prob['rhs'],
+            rtol=1e-10, atol=1e-12)
+
+    def test_gmres(self):
+        surfaces = get_default_surfaces()
+
+        system_size = 0
+        for surface in surfaces:
+            nx = surface['mesh'].shape[0]
+            ny = surface['mesh'].shape[1]
+            system_size += (nx - 1) * (ny - 1)
+
+        np.random.seed(314)
+
+        indep_var_comp = om.IndepVarComp()
+        indep_var_comp.add_output('rhs', val=np.random.random_sample(system_size), units='m/s')
+        indep_var_comp.add_output('mtx',
+            val=np.identity(system_size) + 0.1 * np.random.random_sample((system_size, system_size)),
+            units='1/m')
+
+        prob = om.Problem()
+        prob.model.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+        prob.model.add_subsystem('solve_matrix', SolveMatrix(surfaces=surfaces, solver='gmres'),
+            promotes=['*'])
+        prob.setup()
+
+        prob.run_model()
+        np.testing.assert_allclose(prob['mtx'].dot(prob['circulations']), prob['rhs'],
+            rtol=1e-10, atol=1e-12)
+
+        totals = prob.compute_totals(of=['circulations'], wrt=['rhs'])
+        np.testing.assert_allclose(prob['mtx'].dot(totals['circulations', 'rhs']),
+            np.identity(system_size), rtol=1e-10, atol=1e-10)
+
+        # Rerunning from the converged circulations takes at most one iteration.
+        comp = prob.model.solve_matrix
+        num_iterations = comp.num_gmres_iterations
+        prob.run_model()
+        self.assertLessEqual(comp.num_gmres_iterations - num_iterations, 1)
+
+    def test_gmres_maxiter(self):
+        surfaces = get_default_surfaces()
+
+        system_size = 0
+        for surface in surfaces:
+            nx = surface['mesh'].shape[0]
+            ny = surface['mesh'].shape[1]
+            system_size += (nx - 1) * (ny - 1)
+
+        np.random.seed(314)
+
+        indep_var_comp = om.IndepVarComp()
+        indep_var_comp.add_output('rhs', val=np.random.random_sample(system_size), units='m/s')
+        indep_var_comp.add_output('mtx',
+            val=np.identity(system_size) + 0.1 * np.random.random_sample((system_size, system_size)),
+            units='1/m')
+
+        comp = SolveMatrix(surfaces=surfaces, solver='gmres', gmres_restart=2, gmres_maxiter=4)
+
+        prob = om.Problem()
+        prob.model.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+        prob.model.add_subsystem('solve_matrix', comp, promotes=['*'])
+        prob.setup()
+
+        # The iterations stop at gmres_maxiter, across restarts.
+        with self.assertRaises(om.AnalysisError):
+            prob.run_model()
+        self.assertEqual(comp.num_gmres_iterations, 4)
+
 
 if __name__ == '__main__':
     unittest.main()
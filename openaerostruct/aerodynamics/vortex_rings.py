@@ -0,0 +1,318 @@
+"""
+Direct summation of the velocities induced by the VLM vortex rings.
+
+The velocities, and their derivatives with respect to the evaluation points,
+the vortex mesh and alpha, are evaluated from the same filament kernels used
+in EvalVelMtx, without forming the dense influence matrices.
+"""
+from __future__ import print_function
+import numpy as np
+
+from openaerostruct.aerodynamics.eval_mtx import _compute_finite_vortex, \
+    _compute_finite_vortex_deriv1, _compute_finite_vortex_deriv2, \
+    _compute_semi_infinite_vortex, _compute_semi_infinite_vortex_deriv, _get_u_dir
+
+
+# Number of (evaluation point, vortex ring) pairs processed at once by the
+# direct summations used for the derivatives. This bounds their memory use.
+_block_entries = 20000
+
+# Order in which the filament endpoints of each ring are visited, using the
+# corner ordering [A, B, C, D] = [(i, j), (i, j+1), (i+1, j+1), (i+1, j)].
+_ring_filaments = ((1, 0), (0, 3), (3, 2), (2, 1))
+
+
+def _compute_ring_vel(r, u, last):
+    """
+    Compute the velocities induced by unit-strength vortex rings.
+
+    Parameters
+    ----------
+    r[num_eval_points, num_rings, 4, 3] : numpy array
+        The vectors from the four ring corners to each evaluation point.
+    u[3] : numpy array
+        Unit vector along the semi-infinite trailing vortex legs.
+    last[num_rings] : numpy array
+        Whether each ring is in the last chordwise row, in which case it also
+        sheds the semi-infinite trailing legs.
+
+    Returns
+    -------
+    vel[num_eval_points, num_rings, 3] : numpy array
+        The induced velocities.
+    """
+    vel = np.zeros(r.shape[:2] + (3,), dtype=np.result_type(r, u))
+
+    for i1, i2 in _ring_filaments:
+        vel += _compute_finite_vortex(r[:, :, i1], r[:, :, i2])
+
+    if np.any(last):
+        r1 = r[:, last, 2]
+        r2 = r[:, last, 3]
+        u = np.broadcast_to(u, r1.shape)
+        vel[:, last] += _compute_finite_vortex(r1, r2) \
+            - _compute_semi_infinite_vortex(u, r1) \
+            + _compute_semi_infinite_vortex(u, r2)
+
+    return vel
+
+
+def _compute_ring_vel_derivs(r, u, last):
+    """
+    Compute the derivatives of the ring-induced velocities with respect to
+    the vectors from each of the four ring corners.
+
+    Returns
+    -------
+    derivs[num_eval_points, num_rings, 4, 3, 3] : numpy array
+        The derivatives, with the velocity component on the second-last axis.
+    """
+    derivs = np.zeros(r.shape[:3] + (3, 3), dtype=np.result_type(r, u))
+    eye = np.broadcast_to(np.eye(3), r.shape[:2] + (3, 3))
+
+    for i1, i2 in _ring_filaments:
+        r1 = r[:, :, i1]
+        r2 = r[:, :, i2]
+        derivs[:, :, i1] += _compute_finite_vortex_deriv1(r1, r2, eye)
+        derivs[:, :, i2] += _compute_finite_vortex_deriv2(r1, r2, eye)
+
+    if np.any(last):
+        r1 = r[:, last, 2]
+        r2 = r[:, last, 3]
+        u = np.broadcast_to(u, r1.shape)
+        eye = eye[:, last]
+        derivs[:, last, 2] += _compute_finite_vortex_deriv1(r1, r2, eye) \
+            - _compute_semi_infinite_vortex_deriv(u, r1, eye)
+        derivs[:, last, 3] += _compute_finite_vortex_deriv2(r1, r2, eye) \
+            + _compute_semi_infinite_vortex_deriv(u, r2, eye)
+
+    return derivs
+
+
+def _compute_ring_vel_alpha_deriv(r, alpha):
+    """
+    Compute the derivative of the velocities induced by the trailing legs of
+    last-row rings with respect to alpha, using the complex step.
+    """
+    step = 1e-40
+    u = np.broadcast_to(_get_u_dir(alpha + step * 1j), r.shape[:2] + (3,))
+
+    vel = _compute_semi_infinite_vortex(u, r[:, :, 3]) \
+        - _compute_semi_infinite_vortex(u, r[:, :, 2])
+
+    return vel.imag / step
+
+
+class VortexRings(object):
+    """
+    Connectivity of the vortex rings for all lifting surfaces.
+
+    Each panel of a symmetric surface is represented by two rings, the
+    original one and its mirror image, which share the panel's circulation.
+    The vortex mesh points of all surfaces are stacked into a single array of
+    nodes, which the rings index into.
+
+    Parameters
+    ----------
+    surfaces : list of dict
+        The lifting surfaces.
+    """
+
+    def __init__(self, surfaces):
+        ring_nodes = []
+        ring_last = []
+        ring_col = []
+        self.node_slices = []
+
+        num_nodes = 0
+        system_size = 0
+        for surface in surfaces:
+            nx = surface['mesh'].shape[0]
+            ny = surface['mesh'].shape[1]
+
+            if surface['symmetry']:
+                ny_eff = 2 * ny - 1
+            else:
+                ny_eff = ny
+
+            nodes = num_nodes + np.arange(nx * ny_eff).reshape((nx, ny_eff))
+            corners = np.stack([nodes[:-1, :-1], nodes[:-1, 1:], nodes[1:, 1:], nodes[1:, :-1]],
+                axis=-1)
+
+            last = np.zeros((nx - 1, ny_eff - 1), dtype=bool)
+            last[-1, :] = True
+
+            cols = system_size + np.arange((nx - 1) * (ny - 1)).reshape((nx - 1, ny - 1))
+            if surface['symmetry']:
+                cols = np.hstack((cols, cols[:, ::-1]))
+
+            ring_nodes.append(corners.reshape((-1, 4)))
+            ring_last.append(last.flatten())
+            ring_col.append(cols.flatten())
+            self.node_slices.append(slice(num_nodes, num_nodes + nx * ny_eff))
+
+            num_nodes += nx * ny_eff
+            system_size += (nx - 1) * (ny - 1)
+
+        self.ring_nodes = np.concatenate(ring_nodes)
+        self.ring_last = np.concatenate(ring_last)
+        self.ring_col = np.concatenate(ring_col)
+        self.num_nodes = num_nodes
+        self.num_rings = self.ring_col.size
+        self.system_size = system_size
+
+    def get_nodes(self, inputs, surfaces):
+        """
+        Stack the vortex meshes of all surfaces into one array of nodes.
+        """
+        return np.concatenate([inputs[surface['name'] + '_vortex_mesh'].reshape((-1, 3))
+            for surface in surfaces])
+
+    def get_boxes(self, nodes, u):
+        """
+        Compute the bounding box of each ring. The boxes of last-row rings
+        extend to infinity along the trailing legs.
+        """
+        corners = nodes[self.ring_nodes]
+        lower = corners.min(axis=1)
+        upper = corners.max(axis=1)
+
+        for ind in range(3):
+            if u[ind] > 0.:
+                upper[self.ring_last, ind] = np.inf
+            elif u[ind] < 0.:
+                lower[self.ring_last, ind] = -np.inf
+
+        return lower, upper
+
+    def velocities(self, points, nodes, u, rings):
+        """
+        Compute the velocities induced at the points by the given
+        unit-strength rings.
+
+        Returns
+        -------
+        vel[num_points, num_rings, 3] : numpy array
+            The induced velocities.
+        """
+        r = points[:, None, None, :] - nodes[self.ring_nodes[rings]][None, :, :, :]
+        return _compute_ring_vel(r, u, self.ring_last[rings])
+
+    def panel_velocities(self, points, nodes, u, panels):
+        """
+        Compute the velocities induced at the points by the given
+        unit-strength panels, summing the mirrored rings of symmetric surfaces.
+
+        Returns
+        -------
+        vel[num_points, num_panels, 3] : numpy array
+            The induced velocities.
+        """
+        rings = np.nonzero(np.isin(self.ring_col, panels))[0]
+        vel = self.velocities(points, nodes, u, rings)
+
+        position = np.zeros(self.system_size, int)
+        position[panels] = np.arange(panels.size)
+
+        agg = np.zeros((rings.size, panels.size))
+        agg[np.arange(rings.size), position[self.ring_col[rings]]] = 1.
+
+        return np.einsum('ijk,jl->ilk', vel, agg)
+
+    def _get_blocks(self, num_points):
+        block_size = max(1, _block_entries // self.num_rings)
+        for ind_1 in range(0, num_points, block_size):
+            yield slice(ind_1, min(ind_1 + block_size, num_points))
+
+    def induced_velocities(self, points, nodes, alpha, circulations):
+        """
+        Compute the induced velocities at the points by direct summation.
+        """
+        u = _get_u_dir(alpha)
+        ring_circ = circulations[self.ring_col]
+        rings = np.arange(self.num_rings)
+
+        vel = np.zeros((points.shape[0], 3), dtype=np.result_type(points, nodes, ring_circ))
+        for block in self._get_blocks(points.shape[0]):
+            vel[block] = np.einsum('ijk,j->ik',
+                self.velocities(points[block], nodes, u, rings), ring_circ)
+
+        return vel
+
+    def induced_velocities_transpose(self, points, nodes, alpha, d_vel):
+        """
+        Multiply the transpose of the map from the circulations to the induced
+        velocities at the points by d_vel, by direct summation.
+        """
+        u = _get_u_dir(alpha)
+        rings = np.arange(self.num_rings)
+
+        d_ring_circ = np.zeros(self.num_rings)
+        for block in self._get_blocks(points.shape[0]):
+            d_ring_circ += np.einsum('ijk,ik->j',
+                self.velocities(points[block], nodes, u, rings), d_vel[block])
+
+        return np.bincount(self.ring_col, d_ring_circ, minlength=self.system_size)
+
+    def jacvec(self, points, nodes, alpha, circulations, d_points, d_nodes, d_alpha):
+        """
+        Compute the forward derivatives of the induced velocities with respect
+        to the evaluation points, the vortex mesh nodes and alpha, for fixed
+        circulations. Any of the seeds may be None.
+        """
+        u = _get_u_dir(alpha)
+        ring_circ = circulations[self.ring_col]
+        last = self.ring_last
+        corners = nodes[self.ring_nodes]
+
+        d_vel = np.zeros((points.shape[0], 3))
+        for block in self._get_blocks(points.shape[0]):
+            r = points[block, None, None, :] - corners[None, :, :, :]
+
+            if d_points is not None or d_nodes is not None:
+                dr = np.zeros(r.shape)
+                if d_points is not None:
+                    dr += d_points[block, None, None, :]
+                if d_nodes is not None:
+                    dr -= d_nodes[self.ring_nodes][None, :, :, :]
+
+                derivs = _compute_ring_vel_derivs(r, u, last)
+                d_vel[block] += np.einsum('ijkab,ijkb,j->ia', derivs, dr, ring_circ)
+
+            if d_alpha is not None:
+                derivs = _compute_ring_vel_alpha_deriv(r[:, last], alpha)
+                d_vel[block] += np.einsum('ija,j->ia', derivs, ring_circ[last]) * d_alpha
+
+        return d_vel
+
+    def vecjac(self, points, nodes, alpha, circulations, d_vel):
+        """
+        Compute the reverse derivatives of the induced velocities with respect
+        to the evaluation points, the vortex mesh nodes and alpha, for fixed
+        circulations.
+        """
+        u = _get_u_dir(alpha)
+        ring_circ = circulations[self.ring_col]
+        last = self.ring_last
+        corners = nodes[self.ring_nodes]
+
+        d_points = np.zeros(points.shape)
+        d_corners = np.zeros(corners.shape)
+        d_alpha = 0.
+        for block in self._get_blocks(points.shape[0]):
+            r = points[block, None, None, :] - corners[None, :, :, :]
+
+            derivs = _compute_ring_vel_derivs(r, u, last)
+            d_r = np.einsum('ia,ijkab,j->ijkb', d_vel[block], derivs, ring_circ)
+            d_points[block] += d_r.sum(axis=(1, 2))
+            d_corners -= d_r.sum(axis=0)
+
+            derivs = _compute_ring_vel_alpha_deriv(r[:, last], alpha)
+            d_alpha += np.einsum('ia,ija,j->', d_vel[block], derivs, ring_circ[last])
+
+        d_nodes = np.zeros((self.num_nodes, 3))
+        for ind in range(3):
+            d_nodes[:, ind] = np.bincount(self.ring_nodes.flatten(),
+                d_corners[:, :, ind].flatten(), minlength=self.num_nodes)
+
+        return d_points, d_nodes, d_alpha
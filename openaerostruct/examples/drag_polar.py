@@ -5,8 +5,6 @@ import numpy as np
 import matplotlib.pylab as plt
 
 import openmdao.api as om
-            DirectSolver, BalanceComp, ArmijoGoldsteinLS, BoundsEnforceLS, \
-            NonlinearBlockGS
 from openaerostruct.geometry.utils import generate_mesh
 from openaerostruct.geometry.geometry_group import Geometry
 from openaerostruct.aerodynamics.aero_groups import AeroPoint
@@ -23,7 +21,13 @@ def compute_drag_polar(Mach, alphas, surfaces, trimmed=False):
     # conditions to the problem.
     indep_var_comp = om.IndepVarComp()
     indep_var_comp.add_output('v', val=248.136, units='m/s')
-    indep_var_comp.add_output('alpha', val=0., units = 'deg')
+    # Without trimming, all the angles of attack are analyzed in one pass
+    if trimmed:
+        indep_var_comp.add_output('alpha', val=0., units = 'deg')
+        num_alpha = None
+    else:
+        indep_var_comp.add_output('alpha', val=alphas, units = 'deg')
+        num_alpha = len(alphas)
     indep_var_comp.add_output('Mach_number', val=Mach)
     indep_var_comp.add_output('re', val=1.e6, units='1/m')
     indep_var_comp.add_output('rho', val=0.38, units='kg/m**3')
@@ -47,16 +51,25 @@ def compute_drag_polar(Mach, alphas, surfaces, trimmed=False):
         # 'aero_states' group.
         prob.model.connect(name + '.mesh', 'aero.aero_states.' + name + '_def_mesh')
 
+        # Connect the thickness-to-chord ratio to the performance groups of
+        # each angle of attack
+        if trimmed:
+            perf_names = ['aero.' + name + '_perf']
+        else:
+            perf_names = ['aero.alpha_{}.{}_perf'.format(ind, name) for ind in range(num_alpha)]
+        for perf_name in perf_names:
+            prob.model.connect(name + '.t_over_c', perf_name + '.t_over_c')
+
     # Create the aero point group, which contains the actual aerodynamic
     # analyses
     point_name = 'aero'
-    aero_group = AeroPoint(surfaces=surfaces)
+    aero_group = AeroPoint(surfaces=surfaces, num_alpha=num_alpha)
     prob.model.add_subsystem(point_name, aero_group,
         promotes_inputs=['v', 'alpha', 'Mach_number', 're', 'rho', 'cg'])
 
     # For trimmed polar, setup balance component
     if trimmed == True:
-        bal = BalanceComp()
+        bal = om.BalanceComp()
         bal.add_balance(name='tail_rotation', rhs_val = 0., units = 'deg')
         prob.model.add_subsystem('balance', bal,
             promotes_outputs = ['tail_rotation'])
@@ -80,17 +93,23 @@ def compute_drag_polar(Mach, alphas, surfaces, trimmed=False):
 
     prob.model.list_outputs(residuals = True)
 
-    CLs = []
-    CDs = []
-    CMs = []
+    if trimmed:
+        CLs = []
+        CDs = []
+        CMs = []
+
+        for a in alphas:
+            prob['alpha'] =  a
+            prob.run_model()
+            CLs.append(prob['aero.CL'][0])
+            CDs.append(prob['aero.CD'][0])
+            CMs.append(prob['aero.CM'][1]) # Take only the longitudinal CM
+            #print(a, prob['aero.CL'], prob['aero.CD'], prob['aero.CM'][1])
 
-    for a in alphas:
-        prob['alpha'] =  a
-        prob.run_model()
-        CLs.append(prob['aero.CL'][0])
-        CDs.append(prob['aero.CD'][0])
-        CMs.append(prob['aero.CM'][1]) # Take only the longitudinal CM
-        #print(a, prob['aero.CL'], prob['aero.CD'], prob['aero.CM'][1])
+    else:
+        CLs = list(prob['aero.CL'][:, 0])
+        CDs = list(prob['aero.CD'][:, 0])
+        CMs = list(prob['aero.CM'][:, 1]) # Take only the longitudinal CM
 
     # Plot CL vs alpha and drag polar
     fig,axes =  plt.subplots(nrows=3)
@@ -136,7 +155,7 @@ if __name__=='__main__':
                 # Airfoil properties for viscous drag calculation
                 'k_lam' : 0.05,         # percentage of chord with laminar
                                         # flow, used for viscous drag
-                't_over_c' : 0.15,      # thickness over chord ratio (NACA0015)
+                't_over_c_cp' : np.array([0.15]),      # thickness over chord ratio (NACA0015)
                 'c_max_t' : .303,       # chordwise location of maximum (NACA0015)
                                         # thickness
                 'with_viscous' : True,  # if true, compute viscous drag
@@ -177,7 +196,7 @@ if __name__=='__main__':
                 # Airfoil properties for viscous drag calculation
                 'k_lam' : 0.05,         # percentage of chord with laminar
                                         # flow, used for viscous drag
-                't_over_c' : 0.15,      # thickness over chord ratio (NACA0015)
+                't_over_c_cp' : np.array([0.15]),      # thickness over chord ratio (NACA0015)
                 'c_max_t' : .303,       # chordwise location of maximum (NACA0015)
                                         # thickness
                 'with_viscous' : True,  # if true, compute viscous drag
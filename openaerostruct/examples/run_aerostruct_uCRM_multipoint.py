@@ -27,6 +27,7 @@ from openaerostruct.geometry.utils import generate_mesh
 from openaerostruct.integration.aerostruct_groups import AerostructGeometry, AerostructPoint
 import openmdao.api as om
 from openaerostruct.structures.wingbox_fuel_vol_delta import WingboxFuelVolDelta
+from openaerostruct.structures.fem import FactorizationCache
 from openaerostruct.utils.constants import grav_constant
 
 # Provide coordinates for a portion of an airfoil for the wingbox cross-section as an nparray with dtype=complex (to work with the complex-step approximation for derivatives).
@@ -146,6 +147,10 @@ for surface in surfaces:
     # Add group to the problem with the name of the surface.
     prob.model.add_subsystem(name, aerostruct_group)
 
+# The points share the structural geometry, so they can share the
+# factorizations of the stiffness matrices too
+factorization_cache = FactorizationCache()
+
 # Loop through and add a certain number of aerostruct points
 for i in range(2):
 
@@ -153,7 +158,8 @@ for i in range(2):
     # Connect the parameters within the model for each aerostruct point
 
     # Create the aero point group and add it to the model
-    AS_point = AerostructPoint(surfaces=surfaces, internally_connect_fuelburn=False)
+    AS_point = AerostructPoint(surfaces=surfaces, internally_connect_fuelburn=False,
+        factorization_cache=factorization_cache)
 
     prob.model.add_subsystem(point_name, AS_point)
 
@@ -425,6 +431,10 @@ class Test(unittest.TestCase):
             # Add group to the problem with the name of the surface.
             prob.model.add_subsystem(name, aerostruct_group)
 
+        # The points share the structural geometry, so they can share the
+        # factorizations of the stiffness matrices too
+        factorization_cache = FactorizationCache()
+
         # Loop through and add a certain number of aerostruct points
         for i in range(2):
 
@@ -432,7 +442,8 @@ class Test(unittest.TestCase):
             # Connect the parameters within the model for each aerostruct point
 
             # Create the aero point group and add it to the model
-            AS_point = AerostructPoint(surfaces=surfaces, internally_connect_fuelburn=False)
+            AS_point = AerostructPoint(surfaces=surfaces, internally_connect_fuelburn=False,
+                factorization_cache=factorization_cache)
 
             prob.model.add_subsystem(point_name, AS_point)
 
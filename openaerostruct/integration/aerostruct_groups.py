@@ -3,10 +3,13 @@ from openaerostruct.geometry.geometry_group import Geometry
 from openaerostruct.transfer.displacement_transfer_group import DisplacementTransferGroup
 from openaerostruct.structures.spatial_beam_setup import SpatialBeamSetup
 from openaerostruct.structures.spatial_beam_states import SpatialBeamStates
+from openaerostruct.structures.spatial_beam_weight_loads import SpatialBeamWeightLoads, get_weight_loads
+from openaerostruct.structures.fem import FactorizationCache
 from openaerostruct.aerodynamics.functionals import VLMFunctionals
 from openaerostruct.structures.spatial_beam_functionals import SpatialBeamFunctionals
 from openaerostruct.functionals.total_performance import TotalPerformance
 from openaerostruct.transfer.load_transfer import LoadTransfer
+from openaerostruct.integration.anderson_block_gs import AndersonBlockGS
 from openaerostruct.aerodynamics.states import VLMStates
 from openaerostruct.aerodynamics.compressible_states import CompressibleVLMStates
 from openaerostruct.structures.tube_group import TubeGroup
@@ -89,21 +92,29 @@ class CoupledAS(om.Group):
 
     def initialize(self):
         self.options.declare('surface', types=dict)
+        self.options.declare('factorization_cache', default=None, allow_none=True,
+                             types=FactorizationCache)
+        self.options.declare('include_weight_loads', types=bool, default=True)
 
     def setup(self):
         surface = self.options['surface']
+        include_weight_loads = self.options['include_weight_loads']
 
         promotes = []
-        if surface['struct_weight_relief']:
+        if not include_weight_loads:
+            promotes = get_weight_loads(surface)
+        elif surface['struct_weight_relief']:
             promotes = promotes + list(set(['nodes', 'element_mass', 'load_factor']))
-        if surface['distributed_fuel_weight']:
+        if include_weight_loads and surface['distributed_fuel_weight']:
             promotes = promotes + list(set(['nodes', 'load_factor']))
-        if 'n_point_masses' in surface.keys():
+        if include_weight_loads and 'n_point_masses' in surface.keys():
             promotes = promotes + list(set(['point_mass_locations',
                 'point_masses', 'nodes', 'load_factor', 'engine_thrusts']))
 
         self.add_subsystem('struct_states',
-            SpatialBeamStates(surface=surface),
+            SpatialBeamStates(surface=surface,
+                factorization_cache=self.options['factorization_cache'],
+                include_weight_loads=include_weight_loads),
             promotes_inputs=['local_stiff_transformed', 'forces', 'loads'] + promotes, promotes_outputs=['disp'])
 
         self.add_subsystem('def_mesh',
@@ -153,10 +164,57 @@ class AerostructPoint(om.Group):
                              'flows. Defaults to False.')
         self.options.declare('rotational', False, types=bool,
                              desc="Set to True to turn on support for computing angular velocities")
+        self.options.declare('aic_block_size', default=None, types=int, allow_none=True,
+                             desc='Number of evaluation points to process at once when '
+                             'assembling the AIC matrices. If None, all points are processed together.')
+        self.options.declare('fuse_vectors', default=False, types=bool,
+                             desc='If True, compute the vectors from the vortex meshes to the '
+                             'evaluation points inside the AIC assembly instead of storing them.')
+        self.options.declare('unique_filaments', default=False, types=bool,
+                             desc='If True, evaluate each unique vortex filament once when '
+                             'assembling the AIC matrices.')
+        self.options.declare('aic_solver', default='direct', values=['direct', 'gmres'],
+                             desc='Solver for the AIC linear system, either a dense LU solve or '
+                             'GMRES with a per-surface block-Jacobi preconditioner.')
+        self.options.declare('normalwash_mtx', default=False, types=bool,
+                             desc='If True, project the AIC terms onto the panel normals as '
+                             'they are computed instead of storing the full velocity influences.')
+        self.options.declare('body_fixed_wake', default=False, types=bool,
+                             desc='If True, align the trailing vortex legs with the body x-axis '
+                             'instead of the freestream, so that the AIC matrix and its '
+                             'factorization only depend on the geometry.')
+        self.options.declare('factorization_cache', default=None, allow_none=True,
+                             types=FactorizationCache,
+                             desc='If the same cache is given to several points, the points '
+                             'share the structural stiffness matrix factorizations of their '
+                             'surfaces, which only depend on the design.')
+        self.options.declare('separate_weight_loads', default=False, types=bool,
+                             desc='If True, compute the structural weight, fuel weight, point mass, '
+                             'and engine thrust loads of each surface once in a '
+                             '<surface>_weight_loads group before the coupled group, since they '
+                             'only depend on the design. Their inputs are then connected to that '
+                             'group instead of coupled.<surface>, and load_factor is promoted '
+                             'from it.')
+        self.options.declare('coupled_linear_solver', default='direct', values=['direct', 'krylov'],
+                             desc='Linear solver for the coupled derivatives, either a direct solve '
+                             'of the assembled coupled Jacobian, or GMRES preconditioned by block '
+                             'Gauss-Seidel, which reuses the factorizations of the AIC and '
+                             'stiffness matrices instead of factoring the whole Jacobian.')
+        self.options.declare('coupled_nonlinear_solver', default='aitken', values=['aitken', 'anderson'],
+                             desc='Nonlinear solver for the coupled group, either block Gauss-Seidel '
+                             'with Aitken relaxation, or with Anderson acceleration of the '
+                             'displacements and loads.')
 
     def setup(self):
         surfaces = self.options['surfaces']
         rotational = self.options['rotational']
+        aic_block_size = self.options['aic_block_size']
+        fuse_vectors = self.options['fuse_vectors']
+        unique_filaments = self.options['unique_filaments']
+        aic_solver = self.options['aic_solver']
+        normalwash_mtx = self.options['normalwash_mtx']
+        body_fixed_wake = self.options['body_fixed_wake']
+        separate_weight_loads = self.options['separate_weight_loads']
 
         coupled = om.Group()
 
@@ -205,9 +263,19 @@ class AerostructPoint(om.Group):
             # Add components to the 'coupled' group for each surface.
             # The 'coupled' group must contain all components and parameters
             # needed to converge the aerostructural system.
-            coupled_AS_group = CoupledAS(surface=surface)
+            coupled_AS_group = CoupledAS(surface=surface,
+                factorization_cache=self.options['factorization_cache'],
+                include_weight_loads=not separate_weight_loads)
 
-            if surface['distributed_fuel_weight'] or 'n_point_masses' in surface.keys() or surface['struct_weight_relief']:
+            # Only the aerodynamic loads change within the coupled group, so
+            # the other loads can be connected from outside of it
+            if separate_weight_loads:
+                for load in get_weight_loads(surface):
+                    self.connect(name + '_weight_loads.' + load, 'coupled.' + name + '.' + load)
+
+            if separate_weight_loads:
+                prom_in = []
+            elif surface['distributed_fuel_weight'] or 'n_point_masses' in surface.keys() or surface['struct_weight_relief']:
                 prom_in = ['load_factor']
             else:
                 prom_in = []
@@ -215,10 +283,19 @@ class AerostructPoint(om.Group):
             coupled.add_subsystem(name, coupled_AS_group, promotes_inputs=prom_in)
 
         if self.options['compressible'] == True:
-            aero_states = CompressibleVLMStates(surfaces=surfaces, rotational=rotational)
+            if body_fixed_wake:
+                raise ValueError('The compressible aerodynamic states do not support a '
+                                 'body-fixed wake.')
+            aero_states = CompressibleVLMStates(surfaces=surfaces, rotational=rotational,
+                aic_block_size=aic_block_size, fuse_vectors=fuse_vectors,
+                unique_filaments=unique_filaments, aic_solver=aic_solver,
+                normalwash_mtx=normalwash_mtx)
             prom_in = ['v', 'alpha', 'beta', 'rho', 'Mach_number']
         else:
-            aero_states = VLMStates(surfaces=surfaces, rotational=rotational)
+            aero_states = VLMStates(surfaces=surfaces, rotational=rotational,
+                aic_block_size=aic_block_size, fuse_vectors=fuse_vectors,
+                unique_filaments=unique_filaments, aic_solver=aic_solver,
+                normalwash_mtx=normalwash_mtx, body_fixed_wake=body_fixed_wake)
             prom_in = ['v', 'alpha', 'beta', 'rho']
 
         # Add a single 'aero_states' component for the whole system within the
@@ -242,7 +319,17 @@ class AerostructPoint(om.Group):
         # coupled.linear_solver = ScipyKrylov()
         # coupled.linear_solver.precon = om.LinearRunOnce()
 
-        coupled.nonlinear_solver = om.NonlinearBlockGS(use_aitken=True)
+        if self.options['coupled_nonlinear_solver'] == 'aitken':
+            coupled.nonlinear_solver = om.NonlinearBlockGS(use_aitken=True)
+        else:
+            # Accelerate the iterations on the coupling variables
+            accelerated_outputs = []
+            for surface in surfaces:
+                name = surface['name']
+                accelerated_outputs.extend([name + '.*.disp', name + '_loads.loads'])
+
+            coupled.nonlinear_solver = AndersonBlockGS(accelerated_outputs=accelerated_outputs)
+
         coupled.nonlinear_solver.options['maxiter'] = 100
         coupled.nonlinear_solver.options['atol'] = 1e-7
         coupled.nonlinear_solver.options['rtol'] = 1e-30
@@ -251,8 +338,25 @@ class AerostructPoint(om.Group):
 
         # coupled.linear_solver = om.DirectSolver()
 
-        coupled.linear_solver = om.DirectSolver(assemble_jac=True)
-        coupled.options['assembled_jac_type'] = 'csc'
+        if self.options['coupled_linear_solver'] == 'direct':
+            coupled.linear_solver = om.DirectSolver(assemble_jac=True)
+            coupled.options['assembled_jac_type'] = 'csc'
+        else:
+            # GMRES preconditioned by one block Gauss-Seidel sweep. The sweep
+            # solves the structures and the aerodynamics exactly with the
+            # stored FEM and SolveMatrix factorizations, so the preconditioned
+            # system only differs from the identity through the feedback of
+            # the loads to the structures, and GMRES effectively iterates on
+            # the loads at the interface.
+            coupled.linear_solver = om.ScipyKrylov()
+            coupled.linear_solver.options['maxiter'] = 100
+            coupled.linear_solver.options['atol'] = 1e-30
+            coupled.linear_solver.options['rtol'] = 1e-10
+            coupled.linear_solver.options['iprint'] = -1
+            coupled.linear_solver.options['err_on_non_converge'] = True
+            coupled.linear_solver.precon = om.LinearBlockGS()
+            coupled.linear_solver.precon.options['maxiter'] = 1
+            coupled.linear_solver.precon.options['iprint'] = -1
 
         # coupled.nonlinear_solver = om.NewtonSolver(solve_subsystems=True)
         # coupled.nonlinear_solver.options['maxiter'] = 50
@@ -264,6 +368,14 @@ class AerostructPoint(om.Group):
         if self.options['compressible'] == True:
             prom_in.append('Mach_number')
 
+        # Add the groups that compute the loads that only depend on the design
+        if separate_weight_loads:
+            for surface in surfaces:
+                if get_weight_loads(surface):
+                    self.add_subsystem(surface['name'] + '_weight_loads',
+                        SpatialBeamWeightLoads(surface=surface),
+                        promotes_inputs=['load_factor'])
+
         # Add the coupled group to the model problem
         self.add_subsystem('coupled', coupled, promotes_inputs=prom_in)
 
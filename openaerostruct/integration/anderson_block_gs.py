@@ -0,0 +1,154 @@
+from __future__ import division, print_function
+from fnmatch import fnmatchcase
+
+import numpy as np
+
+import openmdao
+import openmdao.api as om
+
+
+class AndersonBlockGS(om.NonlinearBlockGS):
+    """
+    Nonlinear block Gauss-Seidel solver with Anderson acceleration.
+
+    Each Gauss-Seidel sweep is treated as a fixed-point map on the accelerated
+    outputs, which for the aerostructural coupling are the displacements and
+    the loads. The differences between the last `anderson_depth` iterates and
+    sweeps are used to build a multi-secant approximation of the inverse
+    Jacobian of the fixed-point residual, and the next iterate is the
+    combination of the previous sweeps that minimizes this residual.
+
+    The sweep itself, and the residuals used for the convergence checks, are
+    left to NonlinearBlockGS, so without use_apply_nonlinear the residual is
+    the change in the outputs over the sweep. The accelerated outputs are only
+    accessed by name, and the solver relies on the _iter_initialize and
+    _single_iteration hooks that NonlinearBlockGS uses for its own iterations.
+
+    With anderson_depth = 0, this is plain block Gauss-Seidel with the
+    relaxation factor anderson_beta.
+
+    Attributes
+    ----------
+    _accel_names : list of str or None
+        Names of the accelerated outputs, relative to the group.
+    _delta_x : list of ndarray
+        Differences between consecutive iterates of the accelerated outputs.
+    _delta_f : list of ndarray
+        Differences between consecutive fixed-point residuals.
+    _x_prev : ndarray or None
+        Accelerated outputs before the previous sweep.
+    _f_prev : ndarray or None
+        Fixed-point residual of the previous sweep.
+    """
+
+    SOLVER = 'NL: NLBGS-Anderson'
+
+    def __init__(self, **kwargs):
+        super(AndersonBlockGS, self).__init__(**kwargs)
+
+        # Fail early if NonlinearBlockGS no longer implements its iterations
+        # with the hooks that are overridden here, since the overrides would
+        # then silently never run.
+        for hook in ['_iter_initialize', '_single_iteration']:
+            if hook not in vars(om.NonlinearBlockGS):
+                raise RuntimeError('AndersonBlockGS is not supported with OpenMDAO {}, whose '
+                                   'NonlinearBlockGS has no {} method.'.format(
+                                       openmdao.__version__, hook))
+
+        self._accel_names = None
+        self._delta_x = []
+        self._delta_f = []
+        self._x_prev = None
+        self._f_prev = None
+
+    def _declare_options(self):
+        super(AndersonBlockGS, self)._declare_options()
+
+        self.options.declare('anderson_depth', default=5, types=int, lower=0,
+                             desc='Number of previous iterations kept in the history used '
+                             'to accelerate the iterations.')
+        self.options.declare('anderson_beta', default=1., types=float,
+                             desc='Relaxation factor applied to the fixed-point residual.')
+        self.options.declare('accelerated_outputs', default=None, types=list, allow_none=True,
+                             desc='Glob patterns for the names of the accelerated outputs, '
+                             'relative to the group. If None, all outputs are accelerated.')
+
+    def _iter_initialize(self):
+        if self.options['use_aitken']:
+            raise ValueError('{}: use_aitken cannot be combined with the Anderson '
+                             'acceleration.'.format(type(self).__name__))
+
+        system = self._system()
+        patterns = self.options['accelerated_outputs']
+        names = list(system._outputs.keys())
+
+        if patterns is not None:
+            names = [name for name in names
+                     if any(fnmatchcase(name, pattern) for pattern in patterns)]
+
+            if not names:
+                raise ValueError('No outputs of {} match the accelerated outputs {}.'.format(
+                    system.pathname, patterns))
+
+        self._accel_names = names
+
+        # The history is only valid for a single solve
+        self._delta_x = []
+        self._delta_f = []
+        self._x_prev = None
+        self._f_prev = None
+
+        return super(AndersonBlockGS, self)._iter_initialize()
+
+    def _single_iteration(self):
+        outputs = self._system()._outputs
+
+        x = self._get_accelerated(outputs)
+        super(AndersonBlockGS, self)._single_iteration()
+        g = self._get_accelerated(outputs)
+
+        x_new = self._anderson_update(x, g)
+
+        ind = 0
+        for name in self._accel_names:
+            size = np.size(outputs[name])
+            outputs[name] = x_new[ind:ind + size].reshape(np.shape(outputs[name]))
+            ind += size
+
+    def _get_accelerated(self, outputs):
+        """
+        Return the accelerated outputs as a flat array.
+        """
+        return np.concatenate([np.ravel(outputs[name]) for name in self._accel_names])
+
+    def _anderson_update(self, x, g):
+        """
+        Return the next iterate of the accelerated outputs from the current
+        iterate x and the result of the Gauss-Seidel sweep g.
+        """
+        depth = self.options['anderson_depth']
+        beta = self.options['anderson_beta']
+
+        f = g - x
+
+        if self._f_prev is not None and depth > 0:
+            self._delta_x.append(x - self._x_prev)
+            self._delta_f.append(f - self._f_prev)
+            if len(self._delta_x) > depth:
+                self._delta_x.pop(0)
+                self._delta_f.pop(0)
+
+        self._x_prev = x
+        self._f_prev = f
+
+        if not self._delta_f:
+            return x + beta * f
+
+        delta_x = np.array(self._delta_x).T
+        delta_f = np.array(self._delta_f).T
+
+        # Least-squares combination of the previous residuals that best
+        # cancels the current one
+        gamma = np.linalg.lstsq(delta_f, f, rcond=None)[0]
+
+        return x + beta * f - (delta_x + beta * delta_f).dot(gamma)
@@ -0,0 +1,86 @@
+from __future__ import division, print_function
+import numpy as np
+
+import openmdao.api as om
+
+
+class ComputeNodalWeightings(om.ExplicitComponent):
+    """
+    Compute the normalized inverse distance weightings that distribute the
+    loads from each point mass to the structural nodes. The weightings are
+    shared by the point mass and engine thrust loads.
+
+    Parameters
+    ----------
+    point_mass_locations[n_point_masses, 3] : numpy array
+        XYZ location for each point mass in the global frame.
+    nodes[ny, 3] : numpy array
+        Flattened array with coordinates for each FEM node.
+
+    Returns
+    -------
+    nodal_weightings[n_point_masses, ny] : numpy array
+        The normalized weighting factor for each node. The closest nodes have the
+        greatest weighting, while farther away nodes have less.
+    """
+
+    def initialize(self):
+        self.options.declare('surface', types=dict)
+
+    def setup(self):
+        self.surface = surface = self.options['surface']
+        self.ny = ny = surface['mesh'].shape[1]
+        self.n_point_masses = n_point_masses = surface['n_point_masses']
+
+        self.add_input('point_mass_locations', val=np.zeros((n_point_masses, 3)), units='m')
+        self.add_input('nodes', val=np.zeros((ny, 3)), units='m')
+
+        self.add_output('nodal_weightings', val=np.zeros((n_point_masses, ny)))
+
+        # The weightings only depend on the spanwise coordinates, and each
+        # weighting depends on all of the nodes through the normalization
+        weightings_indices = np.arange(n_point_masses * ny).reshape((n_point_masses, ny))
+
+        rows = weightings_indices.flatten()
+        cols = np.repeat(3 * np.arange(n_point_masses) + 1, ny)
+        self.declare_partials('nodal_weightings', 'point_mass_locations', rows=rows, cols=cols)
+
+        rows = np.repeat(rows, ny)
+        cols = np.tile(3 * np.arange(ny) + 1, n_point_masses * ny)
+        self.declare_partials('nodal_weightings', 'nodes', rows=rows, cols=cols)
+
+    def _inverse_distances(self, inputs):
+        """ Return the inverse distance of each node to each point mass and its derivative. """
+        # The y-distance between the nodes and the point mass locations
+        span_dist = inputs['point_mass_locations'][:, 1:2] - inputs['nodes'][np.newaxis, :, 1]
+
+        # Compute the normalized inverse distance weightings for all of the
+        # nodes. These weightings determine the amount of the force and
+        # moment that each of the nodes receive.
+        dist10 = span_dist**10  # TODO: investigate effect of power here
+        inv_dist10 = 1 / (dist10 + 1e-10)
+        dinv__ddist = -10 * span_dist**9 * inv_dist10**2
+
+        return inv_dist10, dinv__ddist
+
+    def compute(self, inputs, outputs):
+        inv_dist10, _ = self._inverse_distances(inputs)
+
+        outputs['nodal_weightings'] = inv_dist10 / np.sum(inv_dist10, axis=1)[:, np.newaxis]
+
+    def compute_partials(self, inputs, partials):
+        ny = self.ny
+
+        inv_dist10, dinv__ddist = self._inverse_distances(inputs)
+        sum_inv = np.sum(inv_dist10, axis=1)[:, np.newaxis]
+        weightings = inv_dist10 / sum_inv
+
+        partials['nodal_weightings', 'point_mass_locations'] = \
+            ((dinv__ddist - weightings * np.sum(dinv__ddist, axis=1)[:, np.newaxis]) / sum_inv).flatten()
+
+        # Derivatives of the weightings of each point mass wrt the distance of
+        # each node, ordered as (point mass, weighting, node)
+        dweightings__ddist = -np.einsum('pi,pk->pik', weightings, dinv__ddist / sum_inv)
+        dweightings__ddist[:, np.arange(ny), np.arange(ny)] += dinv__ddist / sum_inv
+
+        partials['nodal_weightings', 'nodes'] = -dweightings__ddist.flatten()
@@ -14,7 +14,8 @@ class CreateRHS(om.ExplicitComponent):
     ----------
     loads[ny, 6] : numpy array
         Flattened array containing the loads applied on the FEM component,
-        computed from the sectional forces.
+        computed from the sectional forces. With vec_size > 1, there is a
+        leading axis with one entry per load case.
 
     Returns
     -------
@@ -25,25 +26,35 @@ class CreateRHS(om.ExplicitComponent):
 
     def initialize(self):
         self.options.declare('surface', types=dict)
+        self.options.declare('vec_size', types=int, default=1,
+                             desc='Number of load cases.')
 
     def setup(self):
         surface = self.options['surface']
+        vec_size = self.options['vec_size']
 
         self.ny = surface['mesh'].shape[1]
 
-        self.add_input('total_loads', val=np.zeros((self.ny, 6)), units='N')
-        self.add_output('forces', val=np.ones(((self.ny+1)*6)), units='N')
+        shape = (vec_size, ) if vec_size > 1 else ()
+
+        self.add_input('total_loads', val=np.zeros(shape + (self.ny, 6)), units='N')
+        self.add_output('forces', val=np.ones(shape + ((self.ny+1)*6, )), units='N')
 
         n = self.ny * 6
         arange = np.arange((n))
-        self.declare_partials('forces', 'total_loads', val=1., rows=arange, cols=arange)
+        rows = np.tile(arange, vec_size) + np.repeat((n+6)*np.arange(vec_size), n)
+        cols = np.arange(n * vec_size)
+        self.declare_partials('forces', 'total_loads', val=1., rows=rows, cols=cols)
 
     def compute(self, inputs, outputs):
-        outputs['forces'][:] = 0.
+        vec_size = self.options['vec_size']
+        forces = outputs['forces'].reshape(vec_size, -1)
+
+        forces[:] = 0.
 
         # Populate the right-hand side of the linear system using the
         # prescribed or computed loads
-        outputs['forces'][:6*self.ny] += inputs['total_loads'].reshape(self.ny*6)
+        forces[:, :6*self.ny] += inputs['total_loads'].reshape(vec_size, self.ny*6)
 
         # Remove extremely small values from the RHS so the linear system
         # can more easily be solved
@@ -19,6 +19,7 @@ class Disp(om.ExplicitComponent):
     disp_aug[6*(ny+1)] : numpy array
         Augmented displacement array. Obtained by solving the system
         K * disp_aug = forces, where forces is a flattened version of loads.
+        With vec_size > 1, there is a leading axis with one entry per load case.
 
     Returns
     -------
@@ -29,20 +30,30 @@ class Disp(om.ExplicitComponent):
 
     def initialize(self):
         self.options.declare('surface', types=dict)
+        self.options.declare('vec_size', types=int, default=1,
+                             desc='Number of load cases.')
 
     def setup(self):
         surface = self.options['surface']
+        vec_size = self.options['vec_size']
 
         self.ny = surface['mesh'].shape[1]
 
-        self.add_input('disp_aug', val=np.zeros(((self.ny+1)*6)), units='m')
-        self.add_output('disp', val=np.zeros((self.ny, 6)), units='m')
+        shape = (vec_size, ) if vec_size > 1 else ()
+
+        self.add_input('disp_aug', val=np.zeros(shape + ((self.ny+1)*6, )), units='m')
+        self.add_output('disp', val=np.zeros(shape + (self.ny, 6)), units='m')
 
         n = self.ny * 6
         arange = np.arange((n))
-        self.declare_partials('disp', 'disp_aug', val=1., rows=arange, cols=arange)
+        rows = np.arange(n * vec_size)
+        cols = np.tile(arange, vec_size) + np.repeat((n+6)*np.arange(vec_size), n)
+        self.declare_partials('disp', 'disp_aug', val=1., rows=rows, cols=cols)
 
     def compute(self, inputs, outputs):
+        vec_size = self.options['vec_size']
+
         # Obtain the relevant portions of disp_aug and store the reshaped
         # displacements in disp
-        outputs['disp'] = inputs['disp_aug'][:-6].reshape((-1, 6))
+        disp_aug = inputs['disp_aug'].reshape(vec_size, -1)
+        outputs['disp'] = disp_aug[:, :-6].reshape(outputs['disp'].shape)
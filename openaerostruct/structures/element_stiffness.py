@@ -0,0 +1,170 @@
+from __future__ import print_function
+import numpy as np
+
+import openmdao.api as om
+
+from openaerostruct.structures.utils import element_frames
+from openaerostruct.structures.local_stiff import coeffs_2, coeffs_y, coeffs_z
+from openaerostruct.structures.local_stiff_permuted import col_indices
+
+
+class ElementStiffness(om.ExplicitComponent):
+    """
+    Compute the element stiffness matrices in the global frame directly from
+    the nodes and the section properties. This gives the same result as the
+    Transform, Length, LocalStiff, LocalStiffPermuted, and
+    LocalStiffTransformed components of AssembleKGroup in a single component.
+
+    Parameters
+    ----------
+    nodes[ny, 3] : numpy array
+        Flattened array with coordinates for each FEM node.
+    A[ny-1] : numpy array
+        Areas for each FEM element.
+    Iy[ny-1] : numpy array
+        Mass moment of inertia around the y-axis for each FEM element.
+    Iz[ny-1] : numpy array
+        Mass moment of inertia around the z-axis for each FEM element.
+    J[ny-1] : numpy array
+        Polar moment of inertia for each FEM element.
+
+    Returns
+    -------
+    local_stiff_transformed[ny-1, 12, 12] : numpy array
+        Stiffness matrix of each element in the global frame.
+    """
+
+    def initialize(self):
+        self.options.declare('surface', types=dict)
+
+    def setup(self):
+        surface = self.options['surface']
+
+        self.ny = ny = surface['mesh'].shape[1]
+        num_elems = ny - 1
+
+        self.E = surface['E']
+        self.G = surface['G']
+
+        self.add_input('nodes', shape=(ny, 3), units='m')
+        self.add_input('A', shape=num_elems, units='m**2')
+        self.add_input('J', shape=num_elems, units='m**4')
+        self.add_input('Iy', shape=num_elems, units='m**4')
+        self.add_input('Iz', shape=num_elems, units='m**4')
+
+        self.add_output('local_stiff_transformed', shape=(num_elems, 12, 12))
+
+        # The local stiffness matrix is a linear combination of these 8 fixed
+        # patterns: the axial and torsion terms, which scale with 1/L, and the
+        # bending terms about y and z, which scale with 1/L**3, 1/L**2, and 1/L.
+        patterns = np.zeros((8, 12, 12))
+        patterns[0, 0:2, 0:2] = coeffs_2
+        patterns[1, 2:4, 2:4] = coeffs_2
+
+        num_L = np.array([0, 1, 0, 1])
+        num_L = num_L[:, np.newaxis] + num_L[np.newaxis, :]
+        for power in range(3):
+            patterns[2 + power, 4:8, 4:8] = coeffs_y * (num_L == power)
+            patterns[5 + power, 8:12, 8:12] = coeffs_z * (num_L == power)
+
+        # Permute the patterns to the ordering of the element dofs
+        self.patterns = np.zeros((8, 12, 12))
+        self.patterns[:, col_indices[:, np.newaxis], col_indices[np.newaxis, :]] = patterns
+
+        stiff_indices = np.arange(144 * num_elems).reshape((num_elems, 12, 12))
+
+        # Each element depends on its own two nodes
+        mesh_indices = np.arange(3 * ny).reshape((ny, 3))
+        elem_nodes = np.concatenate([mesh_indices[:-1], mesh_indices[1:]], axis=1)
+
+        rows = np.repeat(stiff_indices.flatten(), 6)
+        cols = np.repeat(elem_nodes, 144, axis=0).flatten()
+        self.declare_partials('local_stiff_transformed', 'nodes', rows=rows, cols=cols)
+
+        # The rotations only mix dofs within each 3x3 block, so the axial and
+        # torsion terms only fill the translational and rotational blocks.
+        trans_dofs = np.array([0, 1, 2, 6, 7, 8])
+        rot_dofs = trans_dofs + 3
+        all_dofs = np.arange(12)
+        self.prop_dofs = {'A': trans_dofs, 'J': rot_dofs, 'Iy': all_dofs, 'Iz': all_dofs}
+
+        for name, dofs in self.prop_dofs.items():
+            rows = stiff_indices[:, dofs[:, np.newaxis], dofs[np.newaxis, :]].flatten()
+            cols = np.repeat(np.arange(num_elems), len(dofs)**2)
+            self.declare_partials('local_stiff_transformed', name, rows=rows, cols=cols)
+
+    def _coefficients(self, inputs, L):
+        """ Return the coefficients of the 8 local stiffness patterns. """
+        E = self.E
+        G = self.G
+
+        return np.stack([
+            E * inputs['A'] / L,
+            G * inputs['J'] / L,
+            E * inputs['Iy'] / L**3,
+            E * inputs['Iy'] / L**2,
+            E * inputs['Iy'] / L,
+            E * inputs['Iz'] / L**3,
+            E * inputs['Iz'] / L**2,
+            E * inputs['Iz'] / L,
+        ], axis=1)
+
+    def _rotate(self, T, mtx):
+        """
+        Compute T^T mtx T for block diagonal transformations made of the 3x3
+        element frames T, for arrays of 12x12 matrices with any number of
+        leading axes after the element axis.
+        """
+        shape = mtx.shape
+        mtx = mtx.reshape(shape[:-2] + (4, 3, 4, 3))
+        rotated = np.einsum('eij,e...aibk,ekl->e...ajbl', T, mtx, T, optimize=True)
+        return rotated.reshape(shape)
+
+    def compute(self, inputs, outputs):
+        L, T = element_frames(inputs['nodes'])
+
+        local_stiff = np.einsum('eq,qij->eij', self._coefficients(inputs, L), self.patterns)
+
+        outputs['local_stiff_transformed'] = self._rotate(T, local_stiff)
+
+    def compute_partials(self, inputs, partials):
+        E = self.E
+        G = self.G
+        num_elems = self.ny - 1
+
+        L, T, dL, dT = element_frames(inputs['nodes'], derivs=True)
+
+        coeffs = self._coefficients(inputs, L)
+        local_stiff = np.einsum('eq,qij->eij', coeffs, self.patterns)
+
+        # Derivatives of the local stiffness wrt the section properties and
+        # the element length, which are then rotated to the global frame
+        # together
+        bending_fac = E / np.stack([L**3, L**2, L], axis=1)
+        powers = np.array([1., 1., 3., 2., 1., 3., 2., 1.])
+
+        dlocal = np.stack([
+            np.einsum('e,ij->eij', E / L, self.patterns[0]),
+            np.einsum('e,ij->eij', G / L, self.patterns[1]),
+            np.einsum('eq,qij->eij', bending_fac, self.patterns[2:5]),
+            np.einsum('eq,qij->eij', bending_fac, self.patterns[5:8]),
+            np.einsum('eq,qij->eij', -coeffs * powers / L[:, np.newaxis], self.patterns),
+        ], axis=1)
+        dstiff = self._rotate(T, dlocal)
+
+        for ind, (name, dofs) in enumerate(self.prop_dofs.items()):
+            partials['local_stiff_transformed', name] = \
+                dstiff[:, ind, dofs[:, np.newaxis], dofs[np.newaxis, :]].flatten()
+
+        # Derivatives wrt the element vector, through the element length...
+        dstiff_dP = np.einsum('eij,ek->eijk', dstiff[:, 4], dL)
+
+        # ...and through the element frame, using the symmetry of the local
+        # stiffness matrix for the derivative of the second rotation
+        local_stiff = local_stiff.reshape((num_elems, 4, 3, 4, 3))
+        dframe = np.einsum('eijk,eaibm,eml->eajblk', dT, local_stiff, T, optimize=True)
+        dframe = dframe + dframe.transpose((0, 3, 4, 1, 2, 5))
+        dstiff_dP += dframe.reshape((num_elems, 12, 12, 3))
+
+        partials['local_stiff_transformed', 'nodes'] = np.stack([-dstiff_dP, dstiff_dP],
+            axis=3).flatten()
@@ -22,6 +22,8 @@ class FailureExact(om.ExplicitComponent):
 
     def initialize(self):
         self.options.declare('surface', types=dict)
+        self.options.declare('vec_size', types=int, default=1,
+                             desc='Number of load cases.')
 
     def setup(self):
         surface = self.options['surface']
@@ -33,11 +35,17 @@ class FailureExact(om.ExplicitComponent):
 
         self.ny = surface['mesh'].shape[1]
         self.sigma = surface['yield']
+        vec_size = self.options['vec_size']
 
-        self.add_input('vonmises', val=np.zeros((self.ny-1, num_failure_criteria)), units='N/m**2')
-        self.add_output('failure', val=np.zeros((self.ny-1, num_failure_criteria)))
+        shape = (self.ny-1, num_failure_criteria)
+        if vec_size > 1:
+            shape = (vec_size, ) + shape
 
-        self.declare_partials('failure', 'vonmises', val=np.eye(((self.ny-1)*num_failure_criteria)) / self.sigma)
+        self.add_input('vonmises', val=np.zeros(shape), units='N/m**2')
+        self.add_output('failure', val=np.zeros(shape))
+
+        arange = np.arange(np.prod(shape))
+        self.declare_partials('failure', 'vonmises', val=1. / self.sigma, rows=arange, cols=arange)
 
     def compute(self, inputs, outputs):
         outputs['failure'] = inputs['vonmises'] / self.sigma - 1
@@ -30,13 +30,16 @@ class FailureKS(om.ExplicitComponent):
     failure : float
         KS aggregation quantity obtained by combining the failure criteria
         for each FEM node. Used to simplify the optimization problem by
-        reducing the number of constraints.
+        reducing the number of constraints. With vec_size > 1, there is one
+        value per load case.
 
     """
 
     def initialize(self):
         self.options.declare('surface', types=dict)
         self.options.declare('rho', types=float, default=100.)
+        self.options.declare('vec_size', types=int, default=1,
+                             desc='Number of load cases.')
 
     def setup(self):
         surface = self.options['surface']
@@ -48,47 +51,57 @@ class FailureKS(om.ExplicitComponent):
             num_failure_criteria = 4
 
         self.ny = surface['mesh'].shape[1]
+        vec_size = self.options['vec_size']
 
-        self.add_input('vonmises', val=np.zeros((self.ny-1, num_failure_criteria)), units='N/m**2')
-        self.add_output('failure', val=0.)
+        if vec_size > 1:
+            self.add_input('vonmises', val=np.zeros((vec_size, self.ny-1, num_failure_criteria)), units='N/m**2')
+            self.add_output('failure', val=np.zeros(vec_size))
+        else:
+            self.add_input('vonmises', val=np.zeros((self.ny-1, num_failure_criteria)), units='N/m**2')
+            self.add_output('failure', val=0.)
 
         self.sigma = surface['yield']
         self.rho = rho
 
-        self.declare_partials('*', '*')
+        # Each load case is aggregated separately
+        n = (self.ny - 1) * num_failure_criteria
+        rows = np.repeat(np.arange(vec_size), n)
+        cols = np.arange(vec_size * n)
+        self.declare_partials('*', '*', rows=rows, cols=cols)
 
     def compute(self, inputs, outputs):
         sigma = self.sigma
         rho = self.rho
-        vonmises = inputs['vonmises']
+        vonmises = inputs['vonmises'].reshape(self.options['vec_size'], -1)
 
-        fmax = np.max(vonmises/sigma - 1)
+        fmax = np.max(vonmises/sigma - 1, axis=1)
 
         nlog, nsum, nexp = np.log, np.sum, np.exp
-        ks = 1 / rho * nlog(nsum(nexp(rho * (vonmises/sigma - 1 - fmax))))
+        ks = 1 / rho * nlog(nsum(nexp(rho * (vonmises/sigma - 1 - fmax[:, np.newaxis])), axis=1))
         outputs['failure'] = fmax + ks
 
     def compute_partials(self, inputs, partials):
-        vonmises = inputs['vonmises']
+        vec_size = self.options['vec_size']
+        vonmises = inputs['vonmises'].reshape(vec_size, -1)
         sigma = self.sigma
         rho = self.rho
 
-        # Find the location of the max stress constraint
-        fmax = np.max(vonmises / sigma - 1)
-        i, j = np.where((vonmises/sigma - 1)==fmax)
-        i, j = i[0], j[0]
+        # Find the location of the max stress constraint for each load case
+        j = np.argmax(vonmises / sigma - 1, axis=1)
+        i = np.arange(vec_size)
+        fmax = (vonmises / sigma - 1)[i, j][:, np.newaxis]
 
         # Set incoming seed as 1 so we simply get the jacobian entries
         ksb = 1.
 
         # Use results from the AD code to compute the jacobian entries
-        tempb0 = ksb / (rho * np.sum(np.exp(rho * (vonmises/sigma - fmax - 1))))
-        tempb = np.exp(rho*(vonmises/sigma-fmax-1))*rho*tempb0
-        fmaxb = ksb - np.sum(tempb)
+        tempb0 = ksb / (rho * np.sum(np.exp(rho * (vonmises/sigma - fmax - 1)), axis=1))
+        tempb = np.exp(rho*(vonmises/sigma-fmax-1))*rho*tempb0[:, np.newaxis]
+        fmaxb = ksb - np.sum(tempb, axis=1)
 
         # Populate the entries
         derivs = tempb / sigma
         derivs[i, j] += fmaxb / sigma
 
-        # Reshape and save them to the jac dict
-        partials['failure', 'vonmises'] = derivs.reshape(1, -1)
+        # Flatten and save them to the jac dict
+        partials['failure', 'vonmises'] = derivs.flatten()
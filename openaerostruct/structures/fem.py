@@ -4,32 +4,94 @@ from __future__ import division, print_function
 from six.moves import range
 
 import numpy as np
-from scipy.sparse import coo_matrix
+from scipy.linalg import cholesky_banded, cho_solve_banded, solve_banded, LinAlgError
+from scipy.sparse import csc_matrix
 from scipy.sparse.linalg import splu
 
 import openmdao.api as om
 
 
+class FactorizationCache(object):
+    """
+    Stiffness matrix factorizations shared between FEM components.
+
+    The points of a multipoint problem all see the same local_stiff_transformed
+    from the shared geometry, so their FEM components can share one
+    factorization per design. Each factorization is stored with a copy of the
+    stiffness data it was computed from, and is only reused for identical data.
+
+    Attributes
+    ----------
+    num_factorizations : int
+        Number of factorizations computed so far.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self.num_factorizations = 0
+
+    def get_factorization(self, key, data, factor):
+        """
+        Return the stored factorization for this stiffness data, or compute it.
+
+        Parameters
+        ----------
+        key : hashable
+            Identifies the stiffness matrix, such as the surface name.
+        data : ndarray
+            Values of the stiffness matrix.
+        factor : callable
+            Function that computes the factorization of the stiffness matrix.
+
+        Returns
+        -------
+        object
+            Factorization of the stiffness matrix.
+        """
+        if key in self._entries:
+            cached_data, factorization = self._entries[key]
+            if cached_data.dtype == data.dtype and np.array_equal(cached_data, data):
+                return factorization
+
+        factorization = factor()
+        self._entries[key] = (data.copy(), factorization)
+        self.num_factorizations += 1
+
+        return factorization
+
+
 class FEM(om.ImplicitComponent):
     """
     Component that solves a linear system, Ax=b.
 
     Designed to handle small, dense linear systems (Ax=B) that can be efficiently solved with
-    sparse lu-decomposition. It can be vectorized to either solve for multiple right hand sides,
-    or to solve multiple linear systems.
+    sparse lu-decomposition. It can be vectorized to solve for multiple right hand sides, such
+    as several load cases, which all share a single factorization of A.
 
     A is represented sparsely as a local_stiff_transformed, which is an ny x 12 x 12 array.
 
+    With the 'banded' solver, the clamped degrees of freedom are eliminated instead of being
+    enforced through the augmentation rows, and the remaining stiffness matrix, which is
+    block-tridiagonal with 6 x 6 blocks, is factored with a banded Cholesky decomposition.
+    The augmented solution, including the reaction terms, is then recovered from the
+    boundary condition rows, so both solvers return the same disp_aug.
+
     Attributes
     ----------
     _lup : None or list(object)
         matrix factorizations returned from scipy.linag.lu_factor for each A matrix
+    _band_factor : None or tuple
+        Banded factorization of the reduced stiffness matrix for the 'banded' solver, stored
+        as the factorization kind, the factored band, and copies of the stiffness entries
+        that couple the free and clamped degrees of freedom.
     k_cols : ndarray
         Cached column indices for sparse representation of stiffness matrix.
     k_rows : ndarray
         Cached row indices for sparse representation of stiffness matrix.
-    k_data : ndarray
-        Cached values for sparse representation of stiffness matrix.
+    _K : csc_matrix
+        Cached stiffness matrix whose data is updated in place from local_stiff_transformed.
+    _K_cs : None or csc_matrix
+        Complex copy of the cached stiffness matrix, used when complex stepping.
     """
 
     def __init__(self, **kwargs):
@@ -43,9 +105,11 @@ class FEM(om.ImplicitComponent):
         """
         super(FEM, self).__init__(**kwargs)
         self._lup = None
+        self._band_factor = None
         self.k_cols = None
         self.k_rows = None
-        self.k_data = None
+        self._K = None
+        self._K_cs = None
 
     def initialize(self):
         """
@@ -53,7 +117,14 @@ class FEM(om.ImplicitComponent):
         """
         self.options.declare('surface', types=dict)
         self.options.declare('vec_size', types=int, default=1,
-                             desc='Number of linear systems to solve.')
+                             desc='Number of right hand sides to solve for.')
+        self.options.declare('solver', default='splu', values=['splu', 'banded'],
+                             desc='Sparse LU solve of the augmented stiffness matrix, or a '
+                             'banded Cholesky solve with the clamped nodes eliminated.')
+        self.options.declare('factorization_cache', default=None, allow_none=True,
+                             types=FactorizationCache,
+                             desc='If given, the stiffness matrix factorization is shared with '
+                             'the other FEM components of this surface that use this cache.')
 
     def setup(self):
         """
@@ -125,15 +196,50 @@ class FEM(om.ImplicitComponent):
         rows6 = index + arange
         cols6 = num_dofs + arange
 
-        self.k_rows = rows = np.concatenate([rows1, rows2, rows3, rows4, rows5, rows6, cols6])
-        self.k_cols = cols = np.concatenate([cols1, cols2, cols3, cols4, cols5, cols6, rows6])
+        rows = np.concatenate([rows1, rows2, rows3, rows4, rows5, rows6, cols6])
+        cols = np.concatenate([cols1, cols2, cols3, cols4, cols5, cols6, rows6])
+
+        # Entries of local_stiff_transformed that make up each stiffness entry, with -1 for
+        # none. The interior diagonal blocks are the sum of two element blocks.
+        src = np.arange((ny - 1) * 144).reshape(ny - 1, 12, 12)
+        no_src = np.full(72 * ny, -1)
+        src1 = np.concatenate([
+            src[:, :6, 6:].flatten(),
+            src[:, 6:, :6].flatten(),
+            src[0, :6, :6].flatten(),
+            src[-1, 6:, 6:].flatten(),
+            src[0:-1, 6:, 6:].flatten(),
+            np.full(12, -1)])
+        src2 = np.concatenate([no_src, src[1:, :6, :6].flatten(), np.full(12, -1)])
+
+        # Store the entries in CSC order, so that the data of the cached CSC matrix can be
+        # updated in place with a single precomputed scatter and used directly as the
+        # partials of the residual.
+        order = np.lexsort((rows, cols))
+        self.k_rows = rows = rows[order]
+        self.k_cols = cols = cols[order]
+        src1 = src1[order]
+        src2 = src2[order]
+
+        self._k_slots = np.where(src1 >= 0)[0]
+        self._k_src = src1[self._k_slots]
+        self._k_dup_slots = np.where(src2 >= 0)[0]
+        self._k_dup_src = src2[self._k_dup_slots]
+
+        data = np.where(src1 >= 0, 0., 1e9)
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(cols, minlength=size))])
+        self._K = csc_matrix((data, rows, indptr), shape=(size, size))
+        self._K_cs = None
 
         sp_size = len(rows)
-        vec_rows = np.tile(rows, vec_size) + np.repeat(sp_size*np.arange(vec_size), sp_size)
-        vec_cols = np.tile(cols, vec_size) + np.repeat(sp_size*np.arange(vec_size), sp_size)
+        vec_rows = np.tile(rows, vec_size) + np.repeat(size*np.arange(vec_size), sp_size)
+        vec_cols = np.tile(cols, vec_size) + np.repeat(size*np.arange(vec_size), sp_size)
 
         self.declare_partials(of='disp_aug', wrt='disp_aug', rows=vec_rows, cols=vec_cols)
 
+        if self.options['solver'] == 'banded':
+            self._setup_banded(index, num_dofs)
+
         base_row = np.tile(0, 12)
         base_col = np.arange(12)
         row = np.tile(base_row, 12) + np.repeat(np.arange(12), 12)
@@ -141,6 +247,11 @@ class FEM(om.ImplicitComponent):
         rows = np.tile(row, ny-1) + np.repeat(6*np.arange(ny-1), 144)
         cols = np.tile(col, ny-1) + np.repeat(144*np.arange(ny-1), 144)
 
+        # All right hand sides share the same stiffness matrix
+        sp_size = len(rows)
+        rows = np.tile(rows, vec_size) + np.repeat(size*np.arange(vec_size), sp_size)
+        cols = np.tile(cols, vec_size)
+
         self.declare_partials('disp_aug', 'local_stiff_transformed', rows=rows, cols=cols)
 
     def apply_nonlinear(self, inputs, outputs, residuals):
@@ -157,7 +268,7 @@ class FEM(om.ImplicitComponent):
             unscaled, dimensional residuals written to via residuals[key]
         """
         K = self.assemble_CSC_K(inputs)
-        residuals['disp_aug'] = K.dot(outputs['disp_aug']) - inputs['forces']
+        residuals['disp_aug'] = K.dot(outputs['disp_aug'].T).T - inputs['forces']
 
     def solve_nonlinear(self, inputs, outputs):
         """
@@ -170,10 +281,23 @@ class FEM(om.ImplicitComponent):
         outputs : Vector
             unscaled, dimensional output variables read via outputs[key]
         """
-        # lu factorization for use with solve_linear
+        # factorization for use with solve_linear
         K = self.assemble_CSC_K(inputs)
-        self._lup = splu(K)
-        outputs['disp_aug'] = self._lup.solve(inputs['forces'])
+        solver = self.options['solver']
+        cache = self.options['factorization_cache']
+
+        if cache is None:
+            factorization = self._factor(K)
+        else:
+            key = (self.options['surface']['name'], solver)
+            factorization = cache.get_factorization(key, K.data, lambda: self._factor(K))
+
+        if solver == 'banded':
+            self._band_factor = factorization
+        else:
+            self._lup = factorization
+
+        outputs['disp_aug'] = self._solve(inputs['forces'])
 
     def linearize(self, inputs, outputs, J):
         """
@@ -193,9 +317,12 @@ class FEM(om.ImplicitComponent):
         ny = self.ny
 
         idx = np.tile(np.tile(np.arange(12), 12), ny-1) + np.repeat(6*np.arange(ny-1), 144)
-        J['disp_aug', 'local_stiff_transformed'] = np.tile(x[idx], vec_size)
+        J['disp_aug', 'local_stiff_transformed'] = x.reshape(vec_size, -1)[:, idx].flatten()
 
-        J['disp_aug', 'disp_aug'] = np.tile(self.k_data, vec_size)
+        # The cached stiffness matrix may have been overwritten since it was last assembled
+        # from these inputs.
+        K = self.assemble_CSC_K(inputs)
+        J['disp_aug', 'disp_aug'] = np.tile(K.data, vec_size)
 
     def solve_linear(self, d_outputs, d_residuals, mode):
         r"""
@@ -215,40 +342,159 @@ class FEM(om.ImplicitComponent):
         mode : str
             either 'fwd' or 'rev'
         """
-        vec_size = self.options['vec_size']
-
+        # All right hand sides are solved at once with the stored factorization.
         if mode == 'fwd':
-            if vec_size > 1:
-                for j in range(vec_size):
-                    d_outputs['disp_aug'] = self._lup.solve(d_residuals['disp_aug'][j])
-            else:
-                d_outputs['disp_aug'] = self._lup.solve(d_residuals['disp_aug'])
+            d_outputs['disp_aug'] = self._solve(d_residuals['disp_aug'])
         else:
-            if vec_size > 1:
-                for j in range(vec_size):
-                    d_residuals['disp_aug'] = self._lup.solve(d_outputs['disp_aug'][j])
-            else:
-                d_residuals['disp_aug'] = self._lup.solve(d_outputs['disp_aug'])
+            d_residuals['disp_aug'] = self._solve(d_outputs['disp_aug'])
 
-    def assemble_CSC_K(self, inputs):
+    def _setup_banded(self, index, num_dofs):
+        """
+        Cache the maps from the sparse stiffness data to the band storage of the reduced
+        stiffness matrix and to its coupling with the clamped degrees of freedom.
+        """
+        # Only the stiffness entries, without the augmentation entries
+        k_entries = np.where((self.k_rows < num_dofs) & (self.k_cols < num_dofs))[0]
+        rows = self.k_rows[k_entries]
+        cols = self.k_cols[k_entries]
+
+        free = np.ones(num_dofs, dtype=bool)
+        free[index:index + 6] = False
+        self.free_dofs = np.where(free)[0]
+        self.clamped_dofs = index + np.arange(6)
+
+        # Numbering of the degrees of freedom once the clamped node is removed
+        reduced = np.cumsum(free) - 1
+        row_free = free[rows]
+        col_free = free[cols]
+
+        # Upper band storage, as expected by cholesky_banded. With 6 x 6 blocks on the three
+        # block diagonals, there are 11 superdiagonals.
+        self._bandwidth = bw = 11
+        mask = row_free & col_free
+        self._band_entries = k_entries[mask]
+        self._band_rows = bw + reduced[rows[mask]] - reduced[cols[mask]]
+        self._band_cols = reduced[cols[mask]]
+
+        # Coupling of the free degrees of freedom with the clamped displacements
+        mask = row_free & ~col_free
+        self._fc_entries = k_entries[mask]
+        self._fc_rows = reduced[rows[mask]]
+        self._fc_cols = cols[mask] - index
+
+        # Rows of the clamped node, which give the reaction terms
+        mask = ~row_free
+        self._c_entries = k_entries[mask]
+        self._c_rows = rows[mask] - index
+        self._c_cols = cols[mask]
+
+    def _factor(self, K):
         """
-        Assemble the stiffness matrix in sparse CSC format.
+        Factor the stiffness matrix with the selected solver.
+
+        Parameters
+        ----------
+        K : csc_matrix
+            Augmented stiffness matrix.
+
+        Returns
+        -------
+        object
+            Factorization used by _solve.
+        """
+        if self.options['solver'] == 'banded':
+            return self._factor_banded(K.data)
+
+        return splu(K)
+
+    def _factor_banded(self, data):
+        """
+        Factor the reduced stiffness matrix in band storage.
+
+        The entries of the clamped rows and columns are copied along with the factorization,
+        since the cached stiffness matrix is overwritten by the next assembly.
+        """
+        bw = self._bandwidth
+        ab = np.zeros((2 * bw + 1, len(self.free_dofs)), dtype=data.dtype)
+        ab[self._band_rows, self._band_cols] = data[self._band_entries]
+
+        fc_data = data[self._fc_entries]
+        c_data = data[self._c_entries]
+
+        if np.iscomplexobj(ab):
+            # The complex Cholesky factorization is Hermitian, which is not what complex step
+            # needs, so fall back on a banded LU solve.
+            return ('lu', ab, fc_data, c_data)
+
+        try:
+            return ('cholesky', cholesky_banded(ab[:bw + 1]), fc_data, c_data)
+        except LinAlgError:
+            raise om.AnalysisError('The structural stiffness matrix of {} is not positive '
+                                   'definite.'.format(self.options['surface']['name']))
+
+    def _solve(self, rhs):
+        """
+        Solve the augmented system with the stored factorization.
+
+        Parameters
+        ----------
+        rhs : ndarray
+            Right hand side of the augmented system, or one right hand side per row.
 
         Returns
         -------
         ndarray
-            Stiffness matrix as dense ndarray.
+            Solution of the augmented system, with the same shape as rhs.
         """
-        k_loc = inputs['local_stiff_transformed']
-        size = self.size
+        if self.options['solver'] == 'splu':
+            return self._lup.solve(rhs.T).T
+
+        num_dofs = self.size - 6
+        kind, factor, fc_data, c_data = self._band_factor
+        rhs = rhs.T
+        shape = (-1, ) + (1, ) * (rhs.ndim - 1)
+        sol = np.zeros(rhs.shape, dtype=np.result_type(rhs, factor))
+
+        # The augmentation rows prescribe the clamped displacements.
+        u_c = rhs[num_dofs:] / 1e9
+        sol[self.clamped_dofs] = u_c
+
+        b = rhs[self.free_dofs].astype(sol.dtype)
+        np.add.at(b, self._fc_rows, -fc_data.reshape(shape) * u_c[self._fc_cols])
+
+        if kind == 'cholesky':
+            sol[self.free_dofs] = cho_solve_banded((factor, False), b)
+        else:
+            bw = self._bandwidth
+            sol[self.free_dofs] = solve_banded((bw, bw), factor, b)
+
+        # The remaining rows of the clamped node give the augmentation terms.
+        reaction = np.zeros(sol[num_dofs:].shape, dtype=sol.dtype)
+        np.add.at(reaction, self._c_rows, c_data.reshape(shape) * sol[self._c_cols])
+        sol[num_dofs:] = (rhs[self.clamped_dofs] - reaction) / 1e9
+
+        return sol.T
 
-        data1 = k_loc[:, :6, 6:].flatten()
-        data2 = k_loc[:, 6:, :6].flatten()
-        data3 = k_loc[0, :6, :6].flatten()
-        data4 = k_loc[-1, 6:, 6:].flatten()
-        data5 = (k_loc[0:-1, 6:, 6:] + k_loc[1:, :6, :6]).flatten()
-        data6 = np.full((6, ), 1e9)
+    def assemble_CSC_K(self, inputs):
+        """
+        Update the cached stiffness matrix in sparse CSC format.
+
+        Returns
+        -------
+        csc_matrix
+            Stiffness matrix, which is overwritten by the next call.
+        """
+        k_loc = inputs['local_stiff_transformed'].ravel()
+
+        if np.iscomplexobj(k_loc):
+            if self._K_cs is None:
+                self._K_cs = self._K.astype(complex)
+            K = self._K_cs
+        else:
+            K = self._K
 
-        self.k_data = data = np.concatenate([data1, data2, data3, data4, data5, data6, data6])
+        data = K.data
+        data[self._k_slots] = k_loc[self._k_src]
+        data[self._k_dup_slots] += k_loc[self._k_dup_src]
 
-        return coo_matrix((data, (self.k_rows, self.k_cols)), shape=(size, size)).tocsc()
+        return K
@@ -2,78 +2,139 @@ from __future__ import division, print_function
 import numpy as np
 
 import openmdao.api as om
+from openaerostruct.structures.utils import weight_loads, weight_loads_sparsity
 from openaerostruct.utils.constants import grav_constant
 
 
-def norm(vec):
-    return np.sqrt(np.sum(vec**2))
-
 class FuelLoads(om.ExplicitComponent):
     """
     Compute the nodal loads from the distributed fuel within the wing
     to be applied to the wing structure.
 
+    With vec_size > 1, fuel_mass and load_factor are arrays with one entry
+    per fuel state (e.g., full, half, and reserve tanks) and the loads gain a
+    leading axis with one entry per fuel state.
+
     Parameters
     ----------
+    fuel_vols[ny-1] : numpy array
+        Internal volume of each wingbox segment.
+    nodes[ny, 3] : numpy array
+        Flattened array with coordinates for each FEM node.
+    fuel_mass : float
+        Mass of the fuel, not including the reserve fuel.
+    load_factor : float
+        Load factor for the flight point.
 
     Returns
     -------
-
+    fuel_weight_loads[ny, 6] : numpy array
+        Flattened array containing the loads applied on the FEM component,
+        computed from the weight of the fuel in each wingbox segment.
     """
 
     def initialize(self):
         self.options.declare('surface', types=dict)
+        self.options.declare('vec_size', types=int, default=1,
+                             desc='Number of fuel states.')
 
     def setup(self):
         self.surface = surface = self.options['surface']
-        self.ny = surface['mesh'].shape[1]
+        self.ny = ny = surface['mesh'].shape[1]
+        vec_size = self.options['vec_size']
+
+        if vec_size > 1:
+            shape = (vec_size, )
+            scalar = np.ones(vec_size)
+        else:
+            shape = ()
+            scalar = 1.
 
         self.add_input('fuel_vols', val=np.ones((self.ny-1)), units='m**3')
         self.add_input('nodes', val=np.zeros((self.ny, 3)), units='m')
-        self.add_input('fuel_mass', val=1., units='kg')
-        self.add_input('load_factor', val=1.)
-        self.add_output('fuel_weight_loads', val=np.zeros((self.ny, 6)), units='N')
+        self.add_input('fuel_mass', val=scalar, units='kg')
+        self.add_input('load_factor', val=scalar)
+        self.add_output('fuel_weight_loads', val=np.zeros(shape + (self.ny, 6)), units='N')
 
-        self.declare_partials('*', '*',  method='cs')
+        nym1 = ny - 1
 
-    def compute(self, inputs, outputs):
-        nodes = inputs['nodes']
+        # Each fuel state scales the loads of a unit fuel weight, and its rows
+        # start at these offsets
+        vec_rows = 6 * ny * np.arange(vec_size)
 
-        element_lengths = np.ones(self.ny - 1, dtype=complex)
-        for i in range(self.ny - 1):
-            element_lengths[i] = norm(nodes[i+1] - nodes[i])
+        loads_indices = np.arange(6 * ny).reshape((ny, 6))
 
-        # And we also need the deltas between consecutive nodes
-        deltas = nodes[1:, :] - nodes[:-1, :]
+        # Only the z-force and the x- and y-moments are nonzero
+        nonzero_rows = loads_indices[:, 2:5].flatten()
 
-        # Fuel weight
-        fuel_weight = (inputs['fuel_mass'] + self.surface['Wf_reserve']) * grav_constant * inputs['load_factor']
+        rows = np.tile(nonzero_rows, vec_size) + np.repeat(vec_rows, 3 * ny)
+        cols = np.repeat(np.arange(vec_size), 3 * ny)
+
+        self.declare_partials('fuel_weight_loads', ['fuel_mass', 'load_factor'], rows=rows, cols=cols)
+
+        # The fuel is distributed based on the volume fractions, so every load
+        # depends on every volume
+        rows = np.repeat(nonzero_rows, nym1)
+        cols = np.tile(np.arange(nym1), 3 * ny)
+        rows = np.tile(rows, vec_size) + np.repeat(vec_rows, len(rows))
+        cols = np.tile(cols, vec_size)
+
+        self.declare_partials('fuel_weight_loads', 'fuel_vols', rows=rows, cols=cols)
+
+        rows, cols, self.nodes_map = weight_loads_sparsity(ny)
+        rows = np.tile(rows, vec_size) + np.repeat(vec_rows, len(rows))
+        cols = np.tile(cols, vec_size)
 
+        self.declare_partials('fuel_weight_loads', 'nodes', rows=rows, cols=cols)
+
+    def _fuel_weight_factor(self):
+        """ Factor between the fuel mass times the load factor and the fuel weight. """
         if self.surface['symmetry']:
-            fuel_weight /= 2.
+            return grav_constant / 2.
+        return grav_constant
+
+    def compute(self, inputs, outputs):
+        vec_size = self.options['vec_size']
+
+        # Fuel weight
+        fuel_weight = (inputs['fuel_mass'] + self.surface['Wf_reserve']) * inputs['load_factor'] \
+            * self._fuel_weight_factor()
 
+        # Loads for a unit total fuel weight, which is divided among the
+        # segments based on their volumes
         vols = inputs['fuel_vols']
-        sum_vols = np.sum(vols)
+        loads = weight_loads(inputs['nodes'], vols / np.sum(vols))
+
+        outputs['fuel_weight_loads'] = np.einsum('v,ij->vij', fuel_weight.reshape(vec_size), loads).reshape(
+            outputs['fuel_weight_loads'].shape)
+
+    def compute_partials(self, inputs, partials):
+        vec_size = self.options['vec_size']
+        ny = self.ny
 
-        # Now we need the fuel weight per segment
-        # Assume it's divided evenly based on vols
-        z_weights = vols * fuel_weight / sum_vols
+        fuel_mass = inputs['fuel_mass'].reshape(vec_size) + self.surface['Wf_reserve']
+        load_factor = inputs['load_factor'].reshape(vec_size)
+        factor = self._fuel_weight_factor()
+        fuel_weight = fuel_mass * load_factor * factor
 
-        # Assume weight coincides with the elastic axis
-        z_forces_for_each = z_weights / 2.
-        z_moments_for_each = z_weights * element_lengths / 12. * (deltas[:, 0]**2 + deltas[:,1]**2)**0.5 / element_lengths
+        vols = inputs['fuel_vols']
+        sum_vols = np.sum(vols)
 
-        loads = np.zeros((self.ny, 6), dtype=complex)
+        loads, dloads__dweights, dloads__dnodes = weight_loads(inputs['nodes'], vols / sum_vols,
+            self.nodes_map)
+        nonzero_loads = loads[:, 2:5].flatten()
 
-        # Loads in z-direction
-        loads[:-1, 2] = loads[:-1, 2] - z_forces_for_each
-        loads[1:, 2] = loads[1:, 2] - z_forces_for_each
+        partials['fuel_weight_loads', 'fuel_mass'] = np.outer(load_factor * factor, nonzero_loads).flatten()
+        partials['fuel_weight_loads', 'load_factor'] = np.outer(fuel_mass * factor, nonzero_loads).flatten()
 
-        # Bending moments for consistency
-        loads[:-1, 3] = loads[:-1, 3] - z_moments_for_each * deltas[: , 1] / element_lengths
-        loads[1:, 3] = loads[1:, 3] + z_moments_for_each * deltas[: , 1] / element_lengths
+        # Loads per unit weight of each segment
+        loads_per_weight = np.zeros((ny, 3, ny - 1))
+        arange = np.arange(ny - 1)
+        for ind in range(3):
+            loads_per_weight[arange, ind, arange] = dloads__dweights[:, 2 * ind]
+            loads_per_weight[arange + 1, ind, arange] = dloads__dweights[:, 2 * ind + 1]
 
-        loads[:-1, 4] = loads[:-1, 4] - z_moments_for_each * deltas[: , 0] / element_lengths
-        loads[1:, 4] = loads[1:, 4] + z_moments_for_each * deltas[: , 0] / element_lengths
+        dloads__dvols = (loads_per_weight.reshape((3 * ny, ny - 1)) - nonzero_loads[:, np.newaxis]) / sum_vols
+        partials['fuel_weight_loads', 'fuel_vols'] = np.outer(fuel_weight, dloads__dvols).flatten()
 
-        outputs['fuel_weight_loads'] = loads
+        partials['fuel_weight_loads', 'nodes'] = np.outer(fuel_weight, dloads__dnodes).flatten()
@@ -2,11 +2,9 @@ from __future__ import print_function, division
 import numpy as np
 
 import openmdao.api as om
+from openaerostruct.structures.utils import norm
 
 
-def norm(vec):
-    return np.sqrt(np.sum(vec**2))
-
 class WingboxFuelVol(om.ExplicitComponent):
     """
     Computes the internal volumes of the wingbox segments.
@@ -36,17 +34,29 @@ class WingboxFuelVol(om.ExplicitComponent):
         self.add_input('A_int', val=np.zeros((self.ny-1)), units='m**2')
         self.add_output('fuel_vols', val=np.zeros((self.ny-1)), units='m**3')
 
-        self.declare_partials('*', '*', method='cs')
+        # Each volume depends on its own internal area and its two nodes
+        arange = np.arange(self.ny-1)
+        self.declare_partials('fuel_vols', 'A_int', rows=arange, cols=arange)
+
+        rows = np.repeat(arange, 6)
+        cols = np.arange(3 * self.ny)[np.arange(6) + 3 * arange[:, np.newaxis]].flatten()
+        self.declare_partials('fuel_vols', 'nodes', rows=rows, cols=cols)
 
     def compute(self, inputs, outputs):
         nodes = inputs['nodes']
 
-        element_lengths = np.zeros(self.ny-1, dtype=type(nodes[0, 0]))
-
-        for i in range(self.ny - 1):
-            element_lengths[i] = norm(nodes[i+1] - nodes[i])
+        element_lengths = norm(nodes[1:] - nodes[:-1], axis=1)
 
         # Next we multiply the element lengths with the A_int for the internal volumes of the wingobox segments
-        vols = element_lengths * inputs['A_int']
+        outputs['fuel_vols'] = element_lengths * inputs['A_int']
+
+    def compute_partials(self, inputs, partials):
+        nodes = inputs['nodes']
+
+        deltas = nodes[1:] - nodes[:-1]
+        element_lengths = norm(deltas, axis=1)
+
+        partials['fuel_vols', 'A_int'] = element_lengths
 
-        outputs['fuel_vols'] = vols
+        dvols__ddel = (inputs['A_int'] / element_lengths)[:, np.newaxis] * deltas
+        partials['fuel_vols', 'nodes'] = np.concatenate([-dvols__ddel, dvols__ddel], axis=1).flatten()
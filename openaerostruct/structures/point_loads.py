@@ -0,0 +1,118 @@
+from __future__ import division, print_function
+import numpy as np
+
+import openmdao.api as om
+from openaerostruct.structures.utils import skew
+
+
+class PointLoads(om.ExplicitComponent):
+    """
+    Base class for the loads on the structure due to forces applied at the
+    point mass locations, such as their weights or the engine thrusts.
+    Each force acts in a fixed direction and is distributed to all of the
+    structural nodes by the nodal weightings, so the nodes closest to the
+    point masses receive proportionally larger loads.
+
+    Subclasses must set the class attributes `direction`, the (3,) unit
+    vector of the forces, and `loads_name`, the name of the loads output, and
+    define a `_magnitudes(inputs)` method. It returns the magnitude of the
+    force of each point mass, computed from the inputs of the subclass, and a
+    dict with their derivatives wrt these inputs, as (n_point_masses, input
+    size) arrays. Missing any of them is an error when the component is set up.
+
+    Parameters
+    ----------
+    point_mass_locations[n_point_masses, 3] : numpy array
+        XYZ location for each point mass in the global frame.
+    nodal_weightings[n_point_masses, ny] : numpy array
+        The normalized weighting factor for each node.
+    nodes[ny, 3] : numpy array
+        Flattened array with coordinates for each FEM node.
+    """
+
+    direction = None
+    loads_name = None
+
+    def initialize(self):
+        self.options.declare('surface', types=dict)
+
+    def setup(self):
+        for name in ['direction', 'loads_name', '_magnitudes']:
+            if getattr(self, name, None) is None:
+                raise TypeError('{} must define `{}` to compute the loads of a PointLoads '
+                                'component.'.format(type(self).__name__, name))
+
+        self.surface = surface = self.options['surface']
+        self.ny = ny = surface['mesh'].shape[1]
+        self.n_point_masses = n_point_masses = surface['n_point_masses']
+
+        self.add_input('point_mass_locations', val=np.zeros((n_point_masses, 3)), units='m')
+        self.add_input('nodal_weightings', val=np.zeros((n_point_masses, ny)))
+        self.add_input('nodes', val=np.zeros((ny, 3)), units='m')
+
+        self.add_output(self.loads_name, val=np.zeros((ny, 6)), units='N') ## WARNING!!! UNITS ARE A MIXTURE OF N & N*m
+
+        loads_indices = np.arange(6 * ny).reshape((ny, 6))
+        moments_indices = loads_indices[:, 3:]
+
+        # Each weighting only loads its own node
+        rows = np.tile(loads_indices.flatten(), n_point_masses)
+        cols = np.repeat(np.arange(n_point_masses * ny), 6)
+        self.declare_partials(self.loads_name, 'nodal_weightings', rows=rows, cols=cols)
+
+        # The moments of every node depend on the locations of all point masses
+        rows = np.repeat(moments_indices.flatten(), 3 * n_point_masses)
+        cols = np.tile(np.arange(3 * n_point_masses), 3 * ny)
+        self.declare_partials(self.loads_name, 'point_mass_locations', rows=rows, cols=cols)
+
+        # ...but only on the location of their own node
+        rows = np.repeat(moments_indices.flatten(), 3)
+        cols = np.tile(np.arange(3 * ny).reshape((ny, 1, 3)), (1, 3, 1)).flatten()
+        self.declare_partials(self.loads_name, 'nodes', rows=rows, cols=cols)
+
+    def _unit_loads(self, inputs):
+        """
+        Return the loads on each node for a unit force of each point mass, as
+        an (n_point_masses, ny, 6) array.
+        """
+        direction = self.direction
+
+        # Get the vectors between the nodes and the point mass locations
+        xyz_dist = inputs['point_mass_locations'][:, np.newaxis, :] - inputs['nodes'][np.newaxis, :, :]
+
+        unit_loads = np.zeros((self.n_point_masses, self.ny, 6), dtype=xyz_dist.dtype)
+        unit_loads[:, :, :3] = direction
+
+        # Compute the moments based on the Euclidean distance vectors from
+        # the nodes to the point masses, crossed with the forces
+        unit_loads[:, :, 3:] = np.cross(xyz_dist, direction)
+
+        return unit_loads
+
+    def compute(self, inputs, outputs):
+        magnitudes, _ = self._magnitudes(inputs)
+
+        # Accumulate the forces and moments from all of the point masses
+        forces = inputs['nodal_weightings'] * magnitudes[:, np.newaxis]
+        outputs[self.loads_name] = np.einsum('pi,pij->ij', forces, self._unit_loads(inputs))
+
+    def compute_partials(self, inputs, partials):
+        ny = self.ny
+        loads_name = self.loads_name
+
+        magnitudes, dmagnitudes = self._magnitudes(inputs)
+        nodal_weightings = inputs['nodal_weightings']
+        unit_loads = self._unit_loads(inputs)
+
+        partials[loads_name, 'nodal_weightings'] = (unit_loads * magnitudes[:, np.newaxis, np.newaxis]).flatten()
+
+        # d(a x e)/da = -skew(e)
+        forces = nodal_weightings * magnitudes[:, np.newaxis]
+        skew_dir = skew(self.direction)
+        partials[loads_name, 'point_mass_locations'] = -np.einsum('pi,ab->iapb', forces, skew_dir).flatten()
+        partials[loads_name, 'nodes'] = np.einsum('i,ab->iab', np.sum(forces, axis=0), skew_dir).flatten()
+
+        # The loads are linear in the magnitudes of the forces
+        dloads__dmagnitudes = np.einsum('pi,pij->ijp', nodal_weightings, unit_loads).reshape((6 * ny, -1))
+        for name, dmagnitude in dmagnitudes.items():
+            partials[loads_name, name] = dloads__dmagnitudes.dot(dmagnitude)
@@ -68,15 +68,28 @@ class SectionPropertiesWingbox(om.ExplicitComponent):
 
         self.mesh = surface['mesh']
         self.ny = self.mesh.shape[1]
+        num_elems = self.ny - 1
 
         # original thickness-to-chord ratio of the airfoil provided by the user
         self.orig_wb_af_t_over_c = surface['original_wingbox_airfoil_t_over_c']
 
-        # airfoil coordinates provided by the user
-        self.data_x_upper = surface['data_x_upper']
-        self.data_x_lower = surface['data_x_lower']
-        self.data_y_upper = surface['data_y_upper']
-        self.data_y_lower = surface['data_y_lower']
+        # airfoil coordinates provided by the user, normalized by the chord
+        self.data_x_upper = x_upper = np.real(surface['data_x_upper'])
+        self.data_x_lower = x_lower = np.real(surface['data_x_lower'])
+        self.data_y_upper = y_upper = np.real(surface['data_y_upper'])
+        self.data_y_lower = y_lower = np.real(surface['data_y_lower'])
+
+        # The unrotated wingbox only depends on the chord and the thickness
+        # scaling, so its areas reduce to these sums over the airfoil
+        # coordinates.
+        self.area_coeff = (np.sum((x_upper[1:] - x_upper[:-1]) * (y_upper[1:] + y_upper[:-1]))
+            - np.sum((x_lower[1:] - x_lower[:-1]) * (y_lower[1:] + y_lower[:-1]))) / 2
+        self.skin_coeff = (x_upper[-1] - x_upper[0] + x_lower[-1] - x_lower[0]) / 2
+        self.spar_coeff = (y_upper[0] - y_lower[0] + y_upper[-1] - y_lower[-1]) / 2
+
+        # Segments of the upper and lower skins
+        self.seg_x = np.concatenate([x_upper[1:] - x_upper[:-1], x_lower[1:] - x_lower[:-1]])
+        self.seg_y = np.concatenate([y_upper[1:] - y_upper[:-1], y_lower[1:] - y_lower[:-1]])
 
         self.add_input('streamwise_chords', val=np.ones((self.ny - 1)),units='m')
         self.add_input('fem_chords', val=np.ones((self.ny - 1)),units='m')
@@ -98,9 +111,28 @@ class SectionPropertiesWingbox(om.ExplicitComponent):
         self.add_output('hfront', val=np.ones((self.ny - 1)),units='m')
         self.add_output('hrear', val=np.ones((self.ny - 1)),units='m')
 
-        self.declare_partials('*', '*', method='cs')
-
-    def compute(self, inputs, outputs):
+        # Each section only depends on the inputs of its own element. The
+        # enclosed and internal areas do not change with twist, and the spar
+        # positions do not depend on the skin thickness.
+        all_inputs = ['streamwise_chords', 'fem_chords', 'fem_twists',
+                      'spar_thickness', 'skin_thickness', 't_over_c']
+        self.dependencies = {name: all_inputs for name in
+            ['A', 'Iy', 'Qz', 'Iz', 'htop', 'hbottom']}
+        for name in ['A_enc', 'A_int', 'J']:
+            self.dependencies[name] = [inp for inp in all_inputs if inp != 'fem_twists']
+        for name in ['hfront', 'hrear']:
+            self.dependencies[name] = [inp for inp in all_inputs if inp != 'skin_thickness']
+
+        arange = np.arange(num_elems)
+        for name, inputs in self.dependencies.items():
+            self.declare_partials(name, inputs, rows=arange, cols=arange)
+
+    def _compute_section(self, inputs):
+        """
+        Compute the section properties and their derivatives wrt the fem chord,
+        the thickness scaling of the airfoil, the twist, the skin thickness,
+        and the spar thickness, in that order along the first axis.
+        """
 
         # NOTE: In the code below, the x- and y-axes correspond to the element
         # local z- and y-axes, respectively.
@@ -113,159 +145,295 @@ class SectionPropertiesWingbox(om.ExplicitComponent):
         streamwise_chord = inputs['streamwise_chords']
         theta = inputs['fem_twists']
 
-        # Scale data points with chord
-        data_x_upper = np.outer(self.data_x_upper, chord)
-        data_y_upper = np.outer(self.data_y_upper, chord)
-        data_x_lower = np.outer(self.data_x_lower, chord)
-        data_y_lower = np.outer(self.data_y_lower, chord)
+        num_elems = self.ny - 1
+        dtype = chord.dtype
+
+        # The y-coordinates are scaled by the streamwise t/c design variable
+        # and the streamwise chord
+        scale = t_over_c / t_over_c_original * streamwise_chord
 
-        # Scale y-coordinates by t/c design variable which is streamwise t/c
-        data_y_upper *= t_over_c / t_over_c_original * streamwise_chord / chord
-        data_y_lower *= t_over_c / t_over_c_original * streamwise_chord / chord
+        ts = skin_thickness
+        tp = spar_thickness
+
+        ts_d = np.zeros((5, num_elems), dtype=dtype)
+        ts_d[3] = 1.
+        tp_d = np.zeros((5, num_elems), dtype=dtype)
+        tp_d[4] = 1.
 
         # Compute enclosed area for torsion constant
         # This currently does not change with twist
         # Also compute internal area for internal volume calculation for fuel
-        x_up_diff = data_x_upper[1:] - data_x_upper[:-1]
-        x_low_diff = data_x_lower[1:] - data_x_lower[:-1]
-        y_up_diff = data_y_upper[1:] - data_y_upper[:-1]
-        y_low_diff = data_y_lower[1:] - data_y_lower[:-1]
-
-        y_up_add = data_y_upper[1:] + data_y_upper[:-1]
-        y_low_add = data_y_lower[1:] + data_y_lower[:-1]
-
-        A_enc = (x_up_diff) * (y_up_add - skin_thickness ) / 2 # area above 0 line
-        A_enc += (x_low_diff) * (-y_low_add - skin_thickness ) / 2 # area below 0 line
-        A_int = (x_up_diff) * (y_up_add - 2*skin_thickness ) / 2 # area above 0 line
-        A_int += (x_low_diff) * (-y_low_add - 2*skin_thickness ) / 2 # area below 0 line
-
-        A_enc = np.sum(A_enc, axis=0)
-        A_int = np.sum(A_int, axis=0)
-
-        A_enc -= (data_y_upper[0] - data_y_lower[0]) * spar_thickness / 2 # area of spars
-        A_enc -= (data_y_upper[-1] - data_y_lower[-1]) * spar_thickness / 2 # area of spars
-        A_int -= (data_y_upper[0] - data_y_lower[0]) * spar_thickness # area of spars
-        A_int -= (data_y_upper[-1] - data_y_lower[-1]) * spar_thickness # area of spars
-
-        outputs['A_enc'] = A_enc
-        outputs['A_int'] = A_int
+        A_enc = chord * scale * self.area_coeff - chord * ts * self.skin_coeff - scale * tp * self.spar_coeff
+        A_enc_d = np.zeros((5, num_elems), dtype=dtype)
+        A_enc_d[0] = scale * self.area_coeff - ts * self.skin_coeff
+        A_enc_d[1] = chord * self.area_coeff - tp * self.spar_coeff
+        A_enc_d[3] = -chord * self.skin_coeff
+        A_enc_d[4] = -scale * self.spar_coeff
+
+        A_int = chord * scale * self.area_coeff - 2 * chord * ts * self.skin_coeff - 2 * scale * tp * self.spar_coeff
+        A_int_d = np.zeros((5, num_elems), dtype=dtype)
+        A_int_d[0] = scale * self.area_coeff - 2 * ts * self.skin_coeff
+        A_int_d[1] = chord * self.area_coeff - 2 * tp * self.spar_coeff
+        A_int_d[3] = -2 * chord * self.skin_coeff
+        A_int_d[4] = -2 * scale * self.spar_coeff
 
         # Compute perimeter to thickness ratio for torsion constant
         # This currently does not change with twist
-        p_by_t_1 = (x_up_diff**2 + y_up_diff**2)**0.5 / skin_thickness # length / thickness of caps
-        p_by_t_2 = (x_low_diff**2 + y_low_diff**2)**0.5 / skin_thickness # length / thickness of caps
+        seg_x = np.outer(self.seg_x, chord)
+        seg_y = np.outer(self.seg_y, scale)
+        seg_len = (seg_x**2 + seg_y**2)**0.5
 
-        p_by_t = np.sum(p_by_t_1 + p_by_t_2, axis=0)
-
-        p_by_t += (data_y_upper[0] - data_y_lower[0] - skin_thickness) / spar_thickness # length / thickness of spars
-        p_by_t += (data_y_upper[-1] - data_y_lower[-1] - skin_thickness) / spar_thickness # length / thickness of spars
+        p_by_t = np.sum(seg_len, axis=0) / ts + (2 * scale * self.spar_coeff - 2 * ts) / tp
+        p_by_t_d = np.zeros((5, num_elems), dtype=dtype)
+        p_by_t_d[0] = np.sum(seg_x * self.seg_x[:, np.newaxis] / seg_len, axis=0) / ts
+        p_by_t_d[1] = np.sum(seg_y * self.seg_y[:, np.newaxis] / seg_len, axis=0) / ts + 2 * self.spar_coeff / tp
+        p_by_t_d[3] = -np.sum(seg_len, axis=0) / ts**2 - 2 / tp
+        p_by_t_d[4] = -(2 * scale * self.spar_coeff - 2 * ts) / tp**2
 
         # Torsion constant
         J = 4 * A_enc**2 / p_by_t
-
-        outputs['J'] = J
+        J_d = 8 * A_enc / p_by_t * A_enc_d - J / p_by_t * p_by_t_d
 
         # Rotate the wingbox
-        rot_mat = np.array([[np.cos(theta), np.sin(theta)],
-                            [-np.sin(theta), np.cos(theta)]])
-
-        data_x_upper_2 = rot_mat[0, 0] * data_x_upper + rot_mat[0, 1] * data_y_upper
-        data_y_upper_2 = rot_mat[1, 0] * data_x_upper + rot_mat[1, 1] * data_y_upper
-        data_x_lower_2 = rot_mat[0, 0] * data_x_lower + rot_mat[0, 1] * data_y_lower
-        data_y_lower_2 = rot_mat[1, 0] * data_x_lower + rot_mat[1, 1] * data_y_lower
-
-        data_x_upper = data_x_upper_2.copy()
-        data_y_upper = data_y_upper_2.copy()
-        data_x_lower = data_x_lower_2.copy()
-        data_y_lower = data_y_lower_2.copy()
-
-        x_up_diff = data_x_upper[1:] - data_x_upper[:-1]
-        x_low_diff = data_x_lower[1:] - data_x_lower[:-1]
-        y_up_diff = data_y_upper[1:] - data_y_upper[:-1]
-        y_low_diff = data_y_lower[1:] - data_y_lower[:-1]
-
-        y_up_add = data_y_upper[1:] + data_y_upper[:-1]
-        y_low_add = data_y_lower[1:] + data_y_lower[:-1]
+        cos = np.cos(theta)
+        sin = np.sin(theta)
+
+        def rotate(data_x, data_y):
+            x = np.outer(data_x, chord)
+            y = np.outer(data_y, scale)
+
+            x_rot = cos * x + sin * y
+            y_rot = -sin * x + cos * y
+
+            x_rot_d = np.zeros((5, ) + x.shape, dtype=dtype)
+            x_rot_d[0] = np.outer(data_x, cos)
+            x_rot_d[1] = np.outer(data_y, sin)
+            x_rot_d[2] = y_rot
+
+            y_rot_d = np.zeros((5, ) + x.shape, dtype=dtype)
+            y_rot_d[0] = -np.outer(data_x, sin)
+            y_rot_d[1] = np.outer(data_y, cos)
+            y_rot_d[2] = -x_rot
+
+            return x_rot, y_rot, x_rot_d, y_rot_d
+
+        x_upper, y_upper, x_upper_d, y_upper_d = rotate(self.data_x_upper, self.data_y_upper)
+        x_lower, y_lower, x_lower_d, y_lower_d = rotate(self.data_x_lower, self.data_y_lower)
+
+        x_up_diff = x_upper[1:] - x_upper[:-1]
+        x_low_diff = x_lower[1:] - x_lower[:-1]
+        y_up_diff = y_upper[1:] - y_upper[:-1]
+        y_low_diff = y_lower[1:] - y_lower[:-1]
+
+        x_up_diff_d = x_upper_d[:, 1:] - x_upper_d[:, :-1]
+        x_low_diff_d = x_lower_d[:, 1:] - x_lower_d[:, :-1]
+        y_up_diff_d = y_upper_d[:, 1:] - y_upper_d[:, :-1]
+        y_low_diff_d = y_lower_d[:, 1:] - y_lower_d[:, :-1]
+
+        # Midline heights of the skin segments
+        y_up_mid = (y_upper[1:] + y_upper[:-1]) / 2 - ts / 2
+        y_low_mid = (y_lower[1:] + y_lower[:-1]) / 2 + ts / 2
+        y_up_mid_d = (y_upper_d[:, 1:] + y_upper_d[:, :-1]) / 2 - ts_d[:, np.newaxis] / 2
+        y_low_mid_d = (y_lower_d[:, 1:] + y_lower_d[:, :-1]) / 2 + ts_d[:, np.newaxis] / 2
+
+        # Heights and midpoints of the front and rear spars
+        h_front = y_upper[0] - y_lower[0] - 2 * ts
+        h_rear = y_upper[-1] - y_lower[-1] - 2 * ts
+        h_front_d = y_upper_d[:, 0] - y_lower_d[:, 0] - 2 * ts_d
+        h_rear_d = y_upper_d[:, -1] - y_lower_d[:, -1] - 2 * ts_d
+
+        y_front = (y_upper[0] + y_lower[0]) / 2
+        y_rear = (y_upper[-1] + y_lower[-1]) / 2
+        y_front_d = (y_upper_d[:, 0] + y_lower_d[:, 0]) / 2
+        y_rear_d = (y_upper_d[:, -1] + y_lower_d[:, -1]) / 2
 
         # Compute area moment of inertia about x axis
         # First compute centroid and area
-        first_moment_area_upper = (y_up_add / 2 - (skin_thickness/2) ) * skin_thickness * x_up_diff
-        upper_area = skin_thickness * x_up_diff
+        len_skins = np.sum(x_up_diff, axis=0) + np.sum(x_low_diff, axis=0)
+        len_skins_d = np.sum(x_up_diff_d, axis=1) + np.sum(x_low_diff_d, axis=1)
 
-        first_moment_area_lower = (y_low_add / 2 + (skin_thickness/2) ) * skin_thickness * x_low_diff
-        lower_area = skin_thickness * x_low_diff
+        area = ts * len_skins + (h_front + h_rear) * tp
+        area_d = ts_d * len_skins + ts * len_skins_d + (h_front_d + h_rear_d) * tp + (h_front + h_rear) * tp_d
 
-        first_moment_area_front_spar = (data_y_upper[0] - data_y_lower[0] - 2 * skin_thickness) * spar_thickness * (data_y_upper[0] + data_y_lower[0]) / 2
-        first_moment_area_rear_spar = (data_y_upper[-1] - data_y_lower[-1] - 2 * skin_thickness) * spar_thickness * (data_y_upper[-1] + data_y_lower[-1]) / 2
-        area_spars = ((data_y_upper[0] - data_y_lower[0] - 2 * skin_thickness) + (data_y_upper[-1] - data_y_lower[-1] - 2 * skin_thickness)) * spar_thickness
+        first_moment_area = ts * np.sum(y_up_mid * x_up_diff + y_low_mid * x_low_diff, axis=0) \
+            + tp * (h_front * y_front + h_rear * y_rear)
+        first_moment_area_d = ts_d * np.sum(y_up_mid * x_up_diff + y_low_mid * x_low_diff, axis=0) \
+            + ts * np.sum(y_up_mid_d * x_up_diff + y_up_mid * x_up_diff_d
+                + y_low_mid_d * x_low_diff + y_low_mid * x_low_diff_d, axis=1) \
+            + tp_d * (h_front * y_front + h_rear * y_rear) \
+            + tp * (h_front_d * y_front + h_front * y_front_d + h_rear_d * y_rear + h_rear * y_rear_d)
 
-        area = np.sum(upper_area, axis=0) + np.sum(lower_area, axis=0) + area_spars
-
-        outputs['A'] = area
-
-        centroid = (np.sum(first_moment_area_upper, axis=0) + np.sum(first_moment_area_lower, axis=0) + first_moment_area_front_spar + first_moment_area_rear_spar) / area
+        centroid = first_moment_area / area
+        centroid_d = (first_moment_area_d - centroid * area_d) / area
 
         # Then compute area moment of inertia for upward bending
         # This is calculated using derived analytical expression assuming linear interpolation between airfoil data points
-        a = y_up_diff / x_up_diff
-        b = (y_up_diff + skin_thickness) / 2
-        x2 = x_up_diff
-
-        I_horiz_1 = 2 * ((1./12. * a**3 * x2**4 + 1./3. * a**2 * x2**3 * b + 1./2. * a * x2**2 * b**2 + 1./3. * b**3 * x2))
-        I_horiz_2 = x2 * skin_thickness * (y_up_add / 2 - skin_thickness / 2 - centroid)**2
-
-        I_horiz = np.sum(I_horiz_1 + I_horiz_2, axis=0)
-
-        # Compute area moment of inertia about y axis
-        a = -y_low_diff / x_low_diff
-        b = (-y_low_diff + skin_thickness) / 2
-        x2 = x_low_diff
-
-        I_horiz += np.sum(2 * ((1./12. * a**3 * x2**4 + 1./3. * a**2 * x2**3 * b + 1./2. * a * x2**2 * b**2 + 1./3. * b**3 * x2)), axis=0)
-        I_horiz += np.sum(x2 * skin_thickness * ((-y_low_add)/2 - skin_thickness/2 + centroid)**2, axis=0)
-
-        # Contribution from the forward spar
-        I_horiz += 1./12. * spar_thickness * (data_y_upper[0] - data_y_lower[0] - 2 * skin_thickness)**3 + spar_thickness * (data_y_upper[0] - data_y_lower[0] - 2 * skin_thickness) * ((data_y_upper[0] + data_y_lower[0]) / 2 - centroid)**2
-        # Contribution from the rear spar
-        I_horiz += 1./12. * spar_thickness * (data_y_upper[-1] - data_y_lower[-1] - 2 * skin_thickness)**3 + spar_thickness * (data_y_upper[-1] - data_y_lower[-1] - 2 * skin_thickness) * ((data_y_upper[-1] + data_y_lower[-1]) / 2 - centroid)**2
-
-        outputs['Iz'] = I_horiz
+        def skin_inertia(dx, dy, dx_d, dy_d):
+            b = (dy + ts) / 2
+            b_d = (dy_d + ts_d[:, np.newaxis]) / 2
+
+            f = 1./12. * dy**3 + 1./3. * dy**2 * b + 1./2. * dy * b**2 + 1./3. * b**3
+            df_ddy = 1./4. * dy**2 + 2./3. * dy * b + 1./2. * b**2
+            df_db = 1./3. * dy**2 + dy * b + b**2
+
+            inertia = np.sum(2 * dx * f, axis=0)
+            inertia_d = np.sum(2 * dx_d * f + 2 * dx * (df_ddy * dy_d + df_db * b_d), axis=1)
+            return inertia, inertia_d
+
+        def parallel_axis(dx, y_mid, dx_d, y_mid_d):
+            dist = y_mid - centroid
+            dist_d = y_mid_d - centroid_d[:, np.newaxis]
+
+            inertia = ts * np.sum(dx * dist**2, axis=0)
+            inertia_d = ts_d * np.sum(dx * dist**2, axis=0) \
+                + ts * np.sum(dx_d * dist**2 + 2 * dx * dist * dist_d, axis=1)
+            return inertia, inertia_d
+
+        def spar_inertia(h, y_mid, h_d, y_mid_d):
+            dist = y_mid - centroid
+            dist_d = y_mid_d - centroid_d
+
+            inertia = 1./12. * tp * h**3 + tp * h * dist**2
+            inertia_d = tp_d * (1./12. * h**3 + h * dist**2) \
+                + tp * (1./4. * h**2 * h_d + h_d * dist**2 + 2 * h * dist * dist_d)
+            return inertia, inertia_d
+
+        I_horiz = np.zeros(num_elems, dtype=dtype)
+        I_horiz_d = np.zeros((5, num_elems), dtype=dtype)
+
+        for inertia, inertia_d in [
+                skin_inertia(x_up_diff, y_up_diff, x_up_diff_d, y_up_diff_d),
+                parallel_axis(x_up_diff, y_up_mid, x_up_diff_d, y_up_mid_d),
+                skin_inertia(x_low_diff, -y_low_diff, x_low_diff_d, -y_low_diff_d),
+                parallel_axis(x_low_diff, y_low_mid, x_low_diff_d, y_low_mid_d),
+                spar_inertia(h_front, y_front, h_front_d, y_front_d),
+                spar_inertia(h_rear, y_rear, h_rear_d, y_rear_d)]:
+            I_horiz += inertia
+            I_horiz_d += inertia_d
 
         # Compute the Q required for transverse shear stress due to upward bending
-        Q_upper = np.sum(((y_up_add / 2 - (skin_thickness/2) ) - centroid) * skin_thickness * x_up_diff, axis=0)
+        dist = y_up_mid - centroid
+        dist_d = y_up_mid_d - centroid_d[:, np.newaxis]
 
-        Q_upper += (data_y_upper[0] - skin_thickness - centroid)**2 / 2 * (spar_thickness)
-        Q_upper += (data_y_upper[-1] - skin_thickness - centroid)**2 / 2 * (spar_thickness)
+        Q_upper = ts * np.sum(dist * x_up_diff, axis=0)
+        Q_upper_d = ts_d * np.sum(dist * x_up_diff, axis=0) \
+            + ts * np.sum(dist_d * x_up_diff + dist * x_up_diff_d, axis=1)
 
-        outputs['Qz'] = Q_upper
+        for ind in [0, -1]:
+            dist = y_upper[ind] - ts - centroid
+            dist_d = y_upper_d[:, ind] - ts_d - centroid_d
 
-        # Compute area moment of inertia for backward bending
-        I_vert = 0
-        first_moment_area_front = (data_y_upper[0] - data_y_lower[0]) * spar_thickness * (data_x_upper[0] + spar_thickness / 2)
-        first_moment_area_rear = (data_y_upper[-1] - data_y_lower[-1]) * spar_thickness * (data_x_upper[-1] - spar_thickness / 2)
-        centroid_Ivert = (first_moment_area_front + first_moment_area_rear) / \
-                        ( ((data_y_upper[0] - data_y_lower[0]) + (data_y_upper[-1] - data_y_lower[-1])) * spar_thickness)
+            Q_upper += dist**2 / 2 * tp
+            Q_upper_d += dist * dist_d * tp + dist**2 / 2 * tp_d
 
-        I_vert += 1./12. * (data_y_upper[0] - data_y_lower[0]) * spar_thickness**3 + (data_y_upper[0] - data_y_lower[0]) * spar_thickness * (centroid_Ivert - (data_x_upper[0] + spar_thickness/2))**2
-        I_vert += 1./12. * (data_y_upper[-1] - data_y_lower[-1]) * spar_thickness**3 + (data_y_upper[-1] - data_y_lower[-1]) * spar_thickness * (data_x_upper[-1] - spar_thickness/2 - centroid_Ivert)**2
+        # Compute area moment of inertia for backward bending
+        h_front = y_upper[0] - y_lower[0]
+        h_rear = y_upper[-1] - y_lower[-1]
+        h_front_d = y_upper_d[:, 0] - y_lower_d[:, 0]
+        h_rear_d = y_upper_d[:, -1] - y_lower_d[:, -1]
+
+        x_front = x_upper[0] + tp / 2
+        x_rear = x_upper[-1] - tp / 2
+        x_front_d = x_upper_d[:, 0] + tp_d / 2
+        x_rear_d = x_upper_d[:, -1] - tp_d / 2
+
+        first_moment_area = (h_front * x_front + h_rear * x_rear) * tp
+        first_moment_area_d = (h_front_d * x_front + h_front * x_front_d
+            + h_rear_d * x_rear + h_rear * x_rear_d) * tp \
+            + (h_front * x_front + h_rear * x_rear) * tp_d
+        area_spars = (h_front + h_rear) * tp
+        area_spars_d = (h_front_d + h_rear_d) * tp + (h_front + h_rear) * tp_d
+
+        centroid_Ivert = first_moment_area / area_spars
+        centroid_Ivert_d = (first_moment_area_d - centroid_Ivert * area_spars_d) / area_spars
+
+        I_vert = np.zeros(num_elems, dtype=dtype)
+        I_vert_d = np.zeros((5, num_elems), dtype=dtype)
+
+        for h, x_mid, h_d, x_mid_d in [(h_front, x_front, h_front_d, x_front_d),
+                                       (h_rear, x_rear, h_rear_d, x_rear_d)]:
+            dist = centroid_Ivert - x_mid
+            dist_d = centroid_Ivert_d - x_mid_d
+
+            I_vert += 1./12. * h * tp**3 + h * tp * dist**2
+            I_vert_d += 1./12. * (h_d * tp**3 + 3 * h * tp**2 * tp_d) \
+                + (h_d * tp + h * tp_d) * dist**2 + 2 * h * tp * dist * dist_d
 
         # Add contribution of skins
-        I_vert += 2 * ( 1./12. * skin_thickness * (data_x_upper[-1] - data_x_upper[0] - 2 * spar_thickness)**3 + skin_thickness * (data_x_upper[-1] - data_x_upper[0] - 2 * spar_thickness) * (centroid_Ivert - (data_x_upper[-1] + data_x_upper[0]) / 2)**2 )
+        width = x_upper[-1] - x_upper[0] - 2 * tp
+        width_d = x_upper_d[:, -1] - x_upper_d[:, 0] - 2 * tp_d
+        dist = centroid_Ivert - (x_upper[-1] + x_upper[0]) / 2
+        dist_d = centroid_Ivert_d - (x_upper_d[:, -1] + x_upper_d[:, 0]) / 2
 
-        outputs['Iy'] = I_vert
+        I_vert += 2 * (1./12. * ts * width**3 + ts * width * dist**2)
+        I_vert_d += 2 * (1./12. * (ts_d * width**3 + 3 * ts * width**2 * width_d)
+            + (ts_d * width + ts * width_d) * dist**2 + 2 * ts * width * dist * dist_d)
 
         # Distances for calculating max bending stresses (KS function used)
         ks_rho = 500. # Hard coded, see Martins and Poon 2005 for more
-        fmax_upper = np.max(data_y_upper, axis=0)
-        htop = fmax_upper + 1 / ks_rho * np.log(np.sum(np.exp(ks_rho * (data_y_upper - fmax_upper)), axis=0)) - centroid
 
-        fmax_lower = np.max(-data_y_lower, axis=0)
-        hbottom = fmax_lower + 1 / ks_rho * np.log(np.sum(np.exp(ks_rho * (-data_y_lower - fmax_lower)), axis=0)) + centroid
+        def ks(f, f_d):
+            fmax = np.max(f.real, axis=0)
+            exp = np.exp(ks_rho * (f - fmax))
+            sum_exp = np.sum(exp, axis=0)
+            return fmax + 1 / ks_rho * np.log(sum_exp), np.sum(exp * f_d, axis=1) / sum_exp
+
+        ks_upper, ks_upper_d = ks(y_upper, y_upper_d)
+        ks_lower, ks_lower_d = ks(-y_lower, -y_lower_d)
+
+        outputs = {
+            'A': area,
+            'A_enc': A_enc,
+            'A_int': A_int,
+            'Iy': I_vert,
+            'Qz': Q_upper,
+            'Iz': I_horiz,
+            'J': J,
+            'htop': ks_upper - centroid,
+            'hbottom': ks_lower + centroid,
+            'hfront': centroid_Ivert - x_upper[0],
+            'hrear': x_upper[-1] - centroid_Ivert,
+        }
+        derivs = {
+            'A': area_d,
+            'A_enc': A_enc_d,
+            'A_int': A_int_d,
+            'Iy': I_vert_d,
+            'Qz': Q_upper_d,
+            'Iz': I_horiz_d,
+            'J': J_d,
+            'htop': ks_upper_d - centroid_d,
+            'hbottom': ks_lower_d + centroid_d,
+            'hfront': centroid_Ivert_d - x_upper_d[:, 0],
+            'hrear': x_upper_d[:, -1] - centroid_Ivert_d,
+        }
+
+        return outputs, derivs
+
+    def compute(self, inputs, outputs):
+        section, _ = self._compute_section(inputs)
+
+        for name, val in section.items():
+            outputs[name] = val
 
-        hfront =  centroid_Ivert - data_x_upper[0]
-        hrear = data_x_upper[-1] - centroid_Ivert
+    def compute_partials(self, inputs, partials):
+        t_over_c_original = self.orig_wb_af_t_over_c
+        t_over_c = inputs['t_over_c']
+        streamwise_chord = inputs['streamwise_chords']
 
-        outputs['htop'] = htop
-        outputs['hbottom'] = hbottom
-        outputs['hfront'] = hfront
-        outputs['hrear'] = hrear
+        _, derivs = self._compute_section(inputs)
+
+        # Map the derivatives to the inputs; the thickness scaling depends on
+        # both the streamwise chord and t/c
+        for name, deriv in derivs.items():
+            deriv_inputs = {
+                'fem_chords': deriv[0],
+                'streamwise_chords': deriv[1] * t_over_c / t_over_c_original,
+                't_over_c': deriv[1] * streamwise_chord / t_over_c_original,
+                'fem_twists': deriv[2],
+                'skin_thickness': deriv[3],
+                'spar_thickness': deriv[4],
+            }
+
+            for inp in self.dependencies[name]:
+                partials[name, inp] = deriv_inputs[inp]
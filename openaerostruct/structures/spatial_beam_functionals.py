@@ -10,13 +10,17 @@ from openaerostruct.structures.failure_ks import FailureKS
 
 class SpatialBeamFunctionals(om.Group):
     """ Group that contains the spatial beam functionals used to evaluate
-    performance. """
+    performance. With num_load_cases > 1, vonmises and failure are computed
+    for each load case in the stacked displacements. """
 
     def initialize(self):
         self.options.declare('surface', types=dict)
+        self.options.declare('num_load_cases', types=int, default=1,
+                             desc='Number of load cases in the stacked displacements.')
 
     def setup(self):
         surface = self.options['surface']
+        num_load_cases = self.options['num_load_cases']
 
         # Commented out energy for now since we haven't ever used its output
         # self.add_subsystem('energy',
@@ -30,12 +34,12 @@ class SpatialBeamFunctionals(om.Group):
                      promotes_outputs=['thickness_intersects'])
 
             self.add_subsystem('vonmises',
-                     VonMisesTube(surface=surface),
+                     VonMisesTube(surface=surface, vec_size=num_load_cases),
                      promotes_inputs=['radius', 'nodes', 'disp'],
                      promotes_outputs=['vonmises'])
         elif surface['fem_model_type'] == 'wingbox':
             self.add_subsystem('vonmises',
-                     VonMisesWingbox(surface=surface),
+                     VonMisesWingbox(surface=surface, vec_size=num_load_cases),
                      promotes_inputs=['Qz', 'J', 'A_enc', 'spar_thickness', 'htop', 'hbottom', 'hfront', 'hrear', 'nodes', 'disp'],
                      promotes_outputs=['vonmises'])
         else:
@@ -49,11 +53,11 @@ class SpatialBeamFunctionals(om.Group):
 
         if surface['exact_failure_constraint']:
             self.add_subsystem('failure',
-                     FailureExact(surface=surface),
+                     FailureExact(surface=surface, vec_size=num_load_cases),
                      promotes_inputs=['vonmises'],
                      promotes_outputs=['failure'])
         else:
             self.add_subsystem('failure',
-                    FailureKS(surface=surface),
+                    FailureKS(surface=surface, vec_size=num_load_cases),
                     promotes_inputs=['vonmises'],
                     promotes_outputs=['failure'])
@@ -1,6 +1,6 @@
 import openmdao.api as om
 from openaerostruct.structures.compute_nodes import ComputeNodes
-from openaerostruct.structures.assemble_k_group import AssembleKGroup
+from openaerostruct.structures.element_stiffness import ElementStiffness
 from openaerostruct.structures.weight import Weight
 from openaerostruct.structures.structural_cg import StructuralCG
 from openaerostruct.structures.fuel_vol import WingboxFuelVol
@@ -21,7 +21,7 @@ class SpatialBeamSetup(om.Group):
                  promotes_inputs=['mesh'], promotes_outputs=['nodes'])
 
         self.add_subsystem('assembly',
-                 AssembleKGroup(surface=surface),
+                 ElementStiffness(surface=surface),
                  promotes_inputs=['A', 'Iy', 'Iz', 'J', 'nodes'], promotes_outputs=['local_stiff_transformed'])
 
         self.add_subsystem('structural_mass',
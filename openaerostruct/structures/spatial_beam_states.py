@@ -1,63 +1,67 @@
 import openmdao.api as om
 from openaerostruct.structures.create_rhs import CreateRHS
-from openaerostruct.structures.fem import FEM
+from openaerostruct.structures.fem import FEM, FactorizationCache
 from openaerostruct.structures.disp import Disp
-from openaerostruct.structures.wing_weight_loads import StructureWeightLoads
-from openaerostruct.structures.fuel_loads import FuelLoads
+from openaerostruct.structures.spatial_beam_weight_loads import SpatialBeamWeightLoads, get_weight_loads
 from openaerostruct.structures.total_loads import TotalLoads
-from openaerostruct.structures.compute_point_mass_loads import ComputePointMassLoads
-from openaerostruct.structures.compute_thrust_loads import ComputeThrustLoads
 
 class SpatialBeamStates(om.Group):
-    """ Group that contains the spatial beam states. """
+    """ Group that contains the spatial beam states.
+
+    With num_load_cases > 1, loads, load_factor, and disp are stacked along a
+    leading axis and all load cases are solved with a single factorization of
+    the stiffness matrix. The weight loads are then computed once for a load
+    factor of 1 and scaled by the load factor of each case.
+    """
 
     def initialize(self):
         self.options.declare('surface', types=dict)
+        self.options.declare('num_load_cases', types=int, default=1,
+                             desc='Number of load cases to solve for at once.')
+        self.options.declare('factorization_cache', default=None, allow_none=True,
+                             types=FactorizationCache,
+                             desc='If given, the stiffness matrix factorization is shared with '
+                             'the other spatial beam states that use this cache.')
+        self.options.declare('include_weight_loads', types=bool, default=True,
+                             desc='If False, the weight and thrust loads are inputs of this group '
+                             'instead of being computed in it.')
 
     def setup(self):
         surface = self.options['surface']
+        num_load_cases = self.options['num_load_cases']
+
+        promotes = get_weight_loads(surface)
 
-        promotes = []
-        if surface['struct_weight_relief']:
-            self.add_subsystem('struct_weight_loads',
-                     StructureWeightLoads(surface=surface),
-                     promotes_inputs=['element_mass', 'nodes', 'load_factor'],
-                     promotes_outputs=['struct_weight_loads'])
-            promotes.append('struct_weight_loads')
-
-        if surface['distributed_fuel_weight']:
-            self.add_subsystem('fuel_loads',
-                     FuelLoads(surface=surface),
-                     promotes_inputs=['nodes', 'load_factor', 'fuel_vols', 'fuel_mass'],
-                     promotes_outputs=['fuel_weight_loads'])
-            promotes.append('fuel_weight_loads')
-
-        if 'n_point_masses' in surface.keys():
-            self.add_subsystem('point_masses',
-                     ComputePointMassLoads(surface=surface),
-                     promotes_inputs=['point_mass_locations', 'point_masses', 'nodes', 'load_factor'],
-                     promotes_outputs=['loads_from_point_masses'])
-            promotes.append('loads_from_point_masses')
-
-            self.add_subsystem('thrust_loads',
-                     ComputeThrustLoads(surface=surface),
-                     promotes_inputs=['point_mass_locations', 'engine_thrusts', 'nodes'],
-                     promotes_outputs=['loads_from_thrusts'])
-            promotes.append('loads_from_thrusts')
+        # The weight loads may instead be computed outside of this group, for
+        # instance once per point outside of the aerostructural coupled loop
+        if self.options['include_weight_loads'] and promotes:
+            self.add_subsystem('weight_loads',
+                     SpatialBeamWeightLoads(surface=surface, num_load_cases=num_load_cases),
+                     promotes_inputs=['*'], promotes_outputs=['*'])
+
+        if num_load_cases > 1 and promotes:
+            promotes.append('load_factor')
 
         self.add_subsystem('total_loads',
-                 TotalLoads(surface=surface),
+                 TotalLoads(surface=surface, vec_size=num_load_cases),
                  promotes_inputs=['loads'] + promotes,
                  promotes_outputs=['total_loads'])
 
         self.add_subsystem('create_rhs',
-                 CreateRHS(surface=surface),
+                 CreateRHS(surface=surface, vec_size=num_load_cases),
                  promotes_inputs=['total_loads'], promotes_outputs=['forces'])
 
+        # The banded solver can be selected for fine spanwise meshes
+        if 'fem_solver' in surface.keys():
+            fem_solver = surface['fem_solver']
+        else:
+            fem_solver = 'splu'
+
         self.add_subsystem('fem',
-                 FEM(surface=surface),
+                 FEM(surface=surface, solver=fem_solver, vec_size=num_load_cases,
+                     factorization_cache=self.options['factorization_cache']),
                  promotes_inputs=['*'], promotes_outputs=['*'])
 
         self.add_subsystem('disp',
-                 Disp(surface=surface),
+                 Disp(surface=surface, vec_size=num_load_cases),
                  promotes_inputs=['*'], promotes_outputs=['*'])
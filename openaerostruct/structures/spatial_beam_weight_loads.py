@@ -0,0 +1,76 @@
+import openmdao.api as om
+from openaerostruct.structures.wing_weight_loads import StructureWeightLoads
+from openaerostruct.structures.fuel_loads import FuelLoads
+from openaerostruct.structures.compute_nodal_weightings import ComputeNodalWeightings
+from openaerostruct.structures.compute_point_mass_loads import ComputePointMassLoads
+from openaerostruct.structures.compute_thrust_loads import ComputeThrustLoads
+
+
+class SpatialBeamWeightLoads(om.Group):
+    """ Group that contains the loads that only depend on the design.
+
+    These are the loads from the structural weight, the fuel weight, the
+    point masses, and the engine thrusts. They do not depend on the
+    displacements, so in an aerostructural analysis they can be computed once
+    per point instead of on every coupled iteration.
+
+    With num_load_cases > 1, the weight loads are computed for a load factor
+    of 1 and the load factor is applied in TotalLoads.
+    """
+
+    def initialize(self):
+        self.options.declare('surface', types=dict)
+        self.options.declare('num_load_cases', types=int, default=1,
+                             desc='Number of load cases to solve for at once.')
+
+    def setup(self):
+        surface = self.options['surface']
+
+        # With several load cases, the load factor is applied in TotalLoads
+        if self.options['num_load_cases'] > 1:
+            load_factor = []
+        else:
+            load_factor = ['load_factor']
+
+        if surface['struct_weight_relief']:
+            self.add_subsystem('struct_weight_loads',
+                     StructureWeightLoads(surface=surface),
+                     promotes_inputs=['element_mass', 'nodes'] + load_factor,
+                     promotes_outputs=['struct_weight_loads'])
+
+        if surface['distributed_fuel_weight']:
+            self.add_subsystem('fuel_loads',
+                     FuelLoads(surface=surface),
+                     promotes_inputs=['nodes', 'fuel_vols', 'fuel_mass'] + load_factor,
+                     promotes_outputs=['fuel_weight_loads'])
+
+        if 'n_point_masses' in surface.keys():
+            # The point mass and thrust loads share the same nodal weightings
+            self.add_subsystem('weightings',
+                     ComputeNodalWeightings(surface=surface),
+                     promotes_inputs=['point_mass_locations', 'nodes'],
+                     promotes_outputs=['nodal_weightings'])
+
+            self.add_subsystem('point_masses',
+                     ComputePointMassLoads(surface=surface),
+                     promotes_inputs=['point_mass_locations', 'point_masses', 'nodal_weightings',
+                                      'nodes'] + load_factor,
+                     promotes_outputs=['loads_from_point_masses'])
+
+            self.add_subsystem('thrust_loads',
+                     ComputeThrustLoads(surface=surface),
+                     promotes_inputs=['point_mass_locations', 'engine_thrusts', 'nodal_weightings',
+                                      'nodes'],
+                     promotes_outputs=['loads_from_thrusts'])
+
+
+def get_weight_loads(surface):
+    """ Return the names of the loads computed by SpatialBeamWeightLoads for a surface. """
+    weight_loads = []
+    if surface['struct_weight_relief']:
+        weight_loads.append('struct_weight_loads')
+    if surface['distributed_fuel_weight']:
+        weight_loads.append('fuel_weight_loads')
+    if 'n_point_masses' in surface.keys():
+        weight_loads.extend(['loads_from_point_masses', 'loads_from_thrusts'])
+    return weight_loads
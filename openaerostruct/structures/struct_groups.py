@@ -8,13 +8,21 @@ from openaerostruct.structures.wingbox_group import WingboxGroup
 
 
 class SpatialBeamAlone(om.Group):
-    """ Group that contains everything needed for a structural-only problem. """
+    """ Group that contains everything needed for a structural-only problem.
+
+    With num_load_cases > 1, loads and load_factor are stacked along a leading
+    axis, and disp, vonmises, and failure are returned for each load case.
+    """
 
     def initialize(self):
         self.options.declare('surface', types=dict)
+        self.options.declare('num_load_cases', types=int, default=1,
+                             desc='Number of load cases to analyze with a single '
+                             'factorization of the stiffness matrix.')
 
     def setup(self):
         surface = self.options['surface']
+        num_load_cases = self.options['num_load_cases']
 
         tube_promotes = []
         tube_inputs = []
@@ -72,17 +80,17 @@ class SpatialBeamAlone(om.Group):
                 'point_masses', 'nodes', 'load_factor', 'engine_thrusts']))
 
         self.add_subsystem('struct_states',
-            SpatialBeamStates(surface=surface),
+            SpatialBeamStates(surface=surface, num_load_cases=num_load_cases),
             promotes_inputs=['local_stiff_transformed', 'forces', 'loads'] + promotes,
             promotes_outputs=['disp'])
 
         if surface['fem_model_type'] == 'tube':
             self.add_subsystem('struct_funcs',
-                SpatialBeamFunctionals(surface=surface),
+                SpatialBeamFunctionals(surface=surface, num_load_cases=num_load_cases),
                 promotes_inputs=['thickness', 'radius', 'nodes', 'disp'],
                 promotes_outputs=['thickness_intersects', 'vonmises', 'failure'])
         else:
             self.add_subsystem('struct_funcs',
-                SpatialBeamFunctionals(surface=surface),
+                SpatialBeamFunctionals(surface=surface, num_load_cases=num_load_cases),
                 promotes_inputs=['spar_thickness', 'disp','Qz', 'J', 'A_enc', 'htop', 'hbottom', 'hfront', 'hrear', 'nodes'],
                 promotes_outputs=['vonmises', 'failure'])
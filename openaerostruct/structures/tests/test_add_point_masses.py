@@ -3,15 +3,14 @@ import numpy as np
 
 from openmdao.utils.assert_utils import assert_rel_error
 import openmdao.api as om
+from openaerostruct.structures.compute_nodal_weightings import ComputeNodalWeightings
 from openaerostruct.structures.compute_point_mass_loads import ComputePointMassLoads
 from openaerostruct.utils.testing import run_test, get_default_surfaces
+from openaerostruct.utils.constants import grav_constant
 
 
-derivs_added = False
-
 class Test(unittest.TestCase):
 
-    @unittest.skipUnless(derivs_added, "Analytic derivs not added yet")
     def test_derivs(self):
         surface = get_default_surfaces()[0]
 
@@ -40,11 +39,11 @@ class Test(unittest.TestCase):
         indep_var_comp.add_output('point_mass_locations', val=point_mass_locations, units='m')
 
         group.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+        group.add_subsystem('nodal_weightings', ComputeNodalWeightings(surface=surface), promotes=['*'])
         group.add_subsystem('compute_point_mass_loads', comp, promotes=['*'])
 
         prob = run_test(self, group,  complex_flag=True, step=1e-8, atol=1e-5, compact_print=True)
 
-    @unittest.skipUnless(derivs_added, "Analytic derivs not added yet")
     def test_simple_values(self):
         surface = get_default_surfaces()[0]
 
@@ -63,7 +62,7 @@ class Test(unittest.TestCase):
                             [0., 2., 0.],
                             [0., 3., 0.]])
 
-        point_masses = np.array([[1/9.8]])
+        point_masses = np.array([[1/grav_constant]])
 
         point_mass_locations = np.array([[.55012, 0.1, 0.]])
 
@@ -72,11 +71,12 @@ class Test(unittest.TestCase):
         indep_var_comp.add_output('point_mass_locations', val=point_mass_locations, units='m')
 
         group.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+        group.add_subsystem('nodal_weightings', ComputeNodalWeightings(surface=surface), promotes=['*'])
         group.add_subsystem('compute_point_mass_loads', comp, promotes=['*'])
 
         prob = run_test(self, group,  complex_flag=True, step=1e-8, atol=1e-5, compact_print=True)
 
-        truth_array = np.array([0, 0, -1., 0., 0.55012, 0.])
+        truth_array = np.array([0, 0, -1., -0.1, 0.55012, 0.])
 
         assert_rel_error(self, prob['comp.loads_from_point_masses'][0, :], truth_array, 1e-6)
 
@@ -0,0 +1,47 @@
+import unittest
+import numpy as np
+
+import openmdao.api as om
+from openaerostruct.structures.compute_nodal_weightings import ComputeNodalWeightings
+from openaerostruct.utils.testing import run_test, get_default_surfaces
+
+
+class Test(unittest.TestCase):
+
+    def test(self):
+        surface = get_default_surfaces()[0]
+
+        surface['n_point_masses'] = 3
+
+        comp = ComputeNodalWeightings(surface=surface)
+
+        group = om.Group()
+
+        indep_var_comp = om.IndepVarComp()
+
+        nodesval = np.array([[0., 0., 0.],
+                            [0., 1., 0.],
+                            [0., 2., 0.],
+                            [0., 3., 0.]])
+
+        point_mass_locations = np.array([[2.1, 0.1, 0.2],
+                                         [3.2, 1.2, 0.3],
+                                         [1.5, 2.6, 0.1]])
+
+        indep_var_comp.add_output('nodes', val=nodesval, units='m')
+        indep_var_comp.add_output('point_mass_locations', val=point_mass_locations, units='m')
+
+        group.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+        group.add_subsystem('nodal_weightings', comp, promotes=['*'])
+
+        prob = run_test(self, group, complex_flag=True, method='cs', compact_print=True)
+
+        weightings = prob['comp.nodal_weightings']
+        np.testing.assert_allclose(np.sum(weightings, axis=1), 1., rtol=1e-12)
+
+        # Each point mass is mostly carried by its closest node
+        np.testing.assert_equal(np.argmax(weightings, axis=1), [0, 1, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+
+import openmdao.api as om
+
+from openaerostruct.structures.assemble_k_group import AssembleKGroup
+from openaerostruct.structures.element_stiffness import ElementStiffness
+from openaerostruct.utils.testing import run_test, get_default_surfaces
+
+
+class Test(unittest.TestCase):
+
+    def get_inputs(self, ny):
+        np.random.seed(314)
+
+        nodes = np.zeros((ny, 3))
+        nodes[:, 0] = np.linspace(0.5, 0., ny) + 0.1 * np.random.random_sample(ny)
+        nodes[:, 1] = np.linspace(-5., 0., ny)
+        nodes[:, 2] = 0.2 * np.random.random_sample(ny)
+
+        indep_var_comp = om.IndepVarComp()
+        indep_var_comp.add_output('nodes', val=nodes, units='m')
+        for name in ['A', 'Iy', 'Iz', 'J']:
+            indep_var_comp.add_output(name, val=np.random.random_sample(ny - 1) + 0.5)
+
+        return indep_var_comp
+
+    def test(self):
+        surface = get_default_surfaces()[0]
+
+        # turn down some of these properties, so the absolute deriv error isn't magnified
+        surface['E'] = 7
+        surface['G'] = 3
+
+        ny = surface['mesh'].shape[1]
+
+        group = om.Group()
+        group.add_subsystem('indep_var_comp', self.get_inputs(ny), promotes=['*'])
+        group.add_subsystem('element_stiffness', ElementStiffness(surface=surface), promotes=['*'])
+
+        run_test(self, group, complex_flag=True, method='cs')
+
+    def test_matches_assemble_k_group(self):
+        surface = get_default_surfaces()[0]
+        ny = surface['mesh'].shape[1]
+
+        results = []
+        for comp in [ElementStiffness(surface=surface), AssembleKGroup(surface=surface)]:
+            prob = om.Problem()
+            prob.model.add_subsystem('indep_var_comp', self.get_inputs(ny), promotes=['*'])
+            prob.model.add_subsystem('comp', comp, promotes=['*'])
+            prob.setup()
+            prob.run_model()
+
+            totals = prob.compute_totals('local_stiff_transformed', ['nodes', 'A', 'Iy', 'Iz', 'J'])
+            results.append((prob['local_stiff_transformed'].copy(), totals))
+
+        (stiff, totals), (stiff_ref, totals_ref) = results
+
+        np.testing.assert_allclose(stiff, stiff_ref, rtol=1e-12, atol=1e-12 * np.max(np.abs(stiff_ref)))
+        for key in totals_ref:
+            np.testing.assert_allclose(totals[key], totals_ref[key], rtol=1e-10,
+                atol=1e-12 * np.max(np.abs(totals_ref[key])))
+
+
+if __name__ == '__main__':
+    unittest.main()
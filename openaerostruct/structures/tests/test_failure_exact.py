@@ -18,6 +18,13 @@ class Test(unittest.TestCase):
 
         run_test(self, comp)
 
+    def test_vec_size(self):
+        surface = get_default_surfaces()[0]
+
+        comp = FailureExact(surface=surface, vec_size=3)
+
+        run_test(self, comp)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,4 +1,8 @@
 import unittest
+import numpy as np
+
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_rel_error
 
 from openaerostruct.structures.failure_ks import FailureKS
 from openaerostruct.utils.testing import run_test, get_default_surfaces
@@ -18,6 +22,30 @@ class Test(unittest.TestCase):
 
         run_test(self, comp, complex_flag=True, step=1e-40, method='cs', compact_print=False)
 
+    def test_vec_size(self):
+        surface = get_default_surfaces()[0]
+        surface['yield'] = .02
+        ny = surface['mesh'].shape[1]
+
+        vonmises = np.random.random_sample((3, ny - 1, 2)) * .03
+
+        comp = FailureKS(surface=surface, vec_size=3)
+        prob = run_test(self, comp, complex_flag=True, step=1e-40, method='cs')
+
+        prob['comp.vonmises'] = vonmises
+        prob.run_model()
+
+        # Each load case is aggregated separately
+        single = om.Problem()
+        single.model.add_subsystem('comp', FailureKS(surface=surface))
+        single.setup()
+
+        for ind in range(3):
+            single['comp.vonmises'] = vonmises[ind]
+            single.run_model()
+
+            assert_rel_error(self, prob['comp.failure'][ind], single['comp.failure'], 1e-12)
+
 
 if __name__ == '__main__':
     unittest.main()
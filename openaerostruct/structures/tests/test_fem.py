@@ -1,6 +1,9 @@
 import unittest
+import numpy as np
 
-from openaerostruct.structures.fem import FEM
+import openmdao.api as om
+
+from openaerostruct.structures.fem import FEM, FactorizationCache
 from openaerostruct.utils.testing import run_test, get_default_surfaces
 
 
@@ -14,6 +17,178 @@ class Test(unittest.TestCase):
 
         run_test(self, comp)
 
+    def test_assemble_K(self):
+        surface = get_default_surfaces()[0]
+        ny = surface['mesh'].shape[1]
+
+        prob = om.Problem()
+        prob.model.add_subsystem('fem', FEM(surface=surface))
+        prob.setup()
+
+        np.random.seed(314)
+        local_stiff = np.random.random_sample((ny - 1, 12, 12))
+
+        # Reference assembly of the element blocks
+        K_ref = np.zeros((6 * ny + 6, 6 * ny + 6))
+        for ind in range(ny - 1):
+            K_ref[6 * ind:6 * ind + 12, 6 * ind:6 * ind + 12] += local_stiff[ind]
+        index = 6 * (ny - 1)
+        K_ref[index + np.arange(6), 6 * ny + np.arange(6)] = 1e9
+        K_ref[6 * ny + np.arange(6), index + np.arange(6)] = 1e9
+
+        # The cached matrix is updated in place on repeated calls
+        for scale in [1., 2.]:
+            K = prob.model.fem.assemble_CSC_K({'local_stiff_transformed': scale * local_stiff})
+            K_ref[:6 * ny, :6 * ny] *= scale
+
+            np.testing.assert_allclose(K.toarray(), K_ref)
+
+    def test_vec_size(self):
+        surface = get_default_surfaces()[0]
+        ny = surface['mesh'].shape[1]
+
+        np.random.seed(314)
+        A = np.random.random_sample((ny - 1, 12, 12))
+        local_stiff = np.einsum('nij,nkj->nik', A, A) + 12. * np.eye(12)
+        forces = np.random.random_sample((3, 6 * ny + 6))
+
+        for solver in ['splu', 'banded']:
+            comp = FEM(surface=surface, vec_size=3, solver=solver)
+            prob = run_test(self, comp)
+
+            prob['comp.local_stiff_transformed'] = local_stiff
+            prob['comp.forces'] = forces
+            prob.run_model()
+
+            # Each load case matches a single solve
+            single = om.Problem()
+            single.model.add_subsystem('comp', FEM(surface=surface, solver=solver))
+            single.setup()
+            single['comp.local_stiff_transformed'] = local_stiff
+
+            for ind in range(3):
+                single['comp.forces'] = forces[ind]
+                single.run_model()
+
+                np.testing.assert_allclose(prob['comp.disp_aug'][ind], single['comp.disp_aug'],
+                    rtol=1e-10)
+
+    def test_factorization_cache(self):
+        surface = get_default_surfaces()[0]
+        ny = surface['mesh'].shape[1]
+
+        np.random.seed(314)
+        A = np.random.random_sample((ny - 1, 12, 12))
+        local_stiff = np.einsum('nij,nkj->nik', A, A) + 12. * np.eye(12)
+        forces = np.random.random_sample((2, 6 * ny + 6))
+
+        for solver in ['splu', 'banded']:
+            cache = FactorizationCache()
+
+            indep_var_comp = om.IndepVarComp()
+            indep_var_comp.add_output('local_stiff_transformed', val=local_stiff)
+
+            # Two points that see the same stiffness matrix
+            prob = om.Problem()
+            prob.model.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+            for ind in range(2):
+                prob.model.add_subsystem('fem_{}'.format(ind),
+                    FEM(surface=surface, solver=solver, factorization_cache=cache),
+                    promotes_inputs=['local_stiff_transformed'])
+            prob.setup()
+
+            for ind in range(2):
+                prob['fem_{}.forces'.format(ind)] = forces[ind]
+            prob.run_model()
+
+            self.assertEqual(cache.num_factorizations, 1)
+
+            # A new design is factored once more
+            prob['local_stiff_transformed'] = 2. * local_stiff
+            prob.run_model()
+
+            self.assertEqual(cache.num_factorizations, 2)
+
+            totals = prob.compute_totals(['fem_0.disp_aug', 'fem_1.disp_aug'],
+                ['local_stiff_transformed'])
+
+            for ind in range(2):
+                single = om.Problem()
+                single.model.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+                single.model.add_subsystem('fem', FEM(surface=surface, solver=solver),
+                    promotes_inputs=['local_stiff_transformed'])
+                single.setup()
+                single['local_stiff_transformed'] = 2. * local_stiff
+                single['fem.forces'] = forces[ind]
+                single.run_model()
+
+                name = 'fem_{}.disp_aug'.format(ind)
+                single_totals = single.compute_totals(['fem.disp_aug'], ['local_stiff_transformed'])
+
+                np.testing.assert_allclose(prob[name], single['fem.disp_aug'], rtol=1e-12)
+                np.testing.assert_allclose(totals[name, 'local_stiff_transformed'],
+                    single_totals['fem.disp_aug', 'local_stiff_transformed'], rtol=1e-12, atol=1e-20)
+
+    def test_banded(self):
+        surface = get_default_surfaces()[0]
+
+        comp = FEM(surface=surface, solver='banded')
+
+        run_test(self, comp)
+
+    def test_banded_matches_splu(self):
+        np.random.seed(314)
+
+        for symmetry in [True, False]:
+            surface = get_default_surfaces()[0]
+            surface['symmetry'] = symmetry
+            ny = surface['mesh'].shape[1]
+
+            # Symmetric positive definite element stiffness matrices
+            A = np.random.random_sample((ny - 1, 12, 12))
+            local_stiff = np.einsum('nij,nkj->nik', A, A) + 12. * np.eye(12)
+            forces = np.random.random_sample(6 * ny + 6)
+
+            disp = {}
+            derivs = {}
+            for solver in ['splu', 'banded']:
+                prob = om.Problem()
+                prob.model.add_subsystem('fem', FEM(surface=surface, solver=solver), promotes=['*'])
+                prob.setup(mode='rev')
+
+                prob['local_stiff_transformed'] = local_stiff
+                prob['forces'] = forces
+                prob.run_model()
+
+                disp[solver] = prob['disp_aug'].copy()
+                derivs[solver] = prob.compute_totals('disp_aug', 'forces')['disp_aug', 'forces']
+
+            np.testing.assert_allclose(disp['banded'], disp['splu'], rtol=1e-10)
+            np.testing.assert_allclose(derivs['banded'], derivs['splu'], rtol=1e-10, atol=1e-12)
+
+    def test_banded_reassembly(self):
+        surface = get_default_surfaces()[0]
+        ny = surface['mesh'].shape[1]
+
+        np.random.seed(314)
+        A = np.random.random_sample((ny - 1, 12, 12))
+        local_stiff = np.einsum('nij,nkj->nik', A, A) + 12. * np.eye(12)
+        forces = np.random.random_sample(6 * ny + 6)
+
+        prob = om.Problem()
+        prob.model.add_subsystem('fem', FEM(surface=surface, solver='banded'), promotes=['*'])
+        prob.setup()
+
+        prob['local_stiff_transformed'] = local_stiff
+        prob['forces'] = forces
+        prob.run_model()
+
+        # Assembling another stiffness matrix does not affect the stored factorization
+        comp = prob.model.fem
+        comp.assemble_CSC_K({'local_stiff_transformed': 2. * local_stiff})
+
+        np.testing.assert_allclose(comp._solve(forces), prob['disp_aug'], rtol=1e-12)
+
 
 if __name__ == '__main__':
     unittest.main()
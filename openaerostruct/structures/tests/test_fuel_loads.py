@@ -30,5 +30,46 @@ class Test(unittest.TestCase):
 
         run_test(self, group, complex_flag=True, atol=1e-2, rtol=1e-6)
 
+    def test_fuel_states(self):
+        surface = get_default_surfaces()[0]
+        ny = surface['mesh'].shape[1]
+
+        # Full, half, and reserve tanks
+        nodesval = np.array([[1., 2., 4.],
+                            [20., 22., 7.],
+                            [8., 17., 14.],
+                            [13., 14., 16.]])
+        fuel_vols_val = np.arange(ny-1) + 1.
+        fuel_masses = np.array([10000., 5000., 0.])
+        load_factors = np.array([2.5, 1., -1.])
+
+        group = om.Group()
+
+        indep_var_comp = om.IndepVarComp()
+        indep_var_comp.add_output('nodes', val=nodesval, units='m')
+        indep_var_comp.add_output('fuel_vols', val=fuel_vols_val, units='m**3')
+        indep_var_comp.add_output('fuel_mass', val=fuel_masses, units='kg')
+        indep_var_comp.add_output('load_factor', val=load_factors)
+
+        group.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+        group.add_subsystem('load', FuelLoads(surface=surface, vec_size=3), promotes=['*'])
+
+        p = run_test(self, group, complex_flag=True, method='cs', compact_print=True)
+
+        single = om.Problem()
+        single.model.add_subsystem('load', FuelLoads(surface=surface), promotes=['*'])
+        single.setup()
+        single['nodes'] = nodesval
+        single['fuel_vols'] = fuel_vols_val
+
+        # Each fuel state matches a single evaluation
+        for ind in range(3):
+            single['fuel_mass'] = fuel_masses[ind]
+            single['load_factor'] = load_factors[ind]
+            single.run_model()
+
+            np.testing.assert_allclose(p['comp.fuel_weight_loads'][ind],
+                single['fuel_weight_loads'], rtol=1e-12)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+import numpy as np
+
+import openmdao.api as om
+
+from openaerostruct.structures.fuel_vol import WingboxFuelVol
+from openaerostruct.utils.testing import run_test, get_default_surfaces
+
+
+class Test(unittest.TestCase):
+
+    def test(self):
+        surface = get_default_surfaces()[0]
+        ny = surface['mesh'].shape[1]
+
+        np.random.seed(314)
+
+        nodes = np.zeros((ny, 3))
+        nodes[:, 0] = np.random.random_sample(ny)
+        nodes[:, 1] = np.linspace(-5., 0., ny)
+        nodes[:, 2] = 0.2 * np.random.random_sample(ny)
+
+        indep_var_comp = om.IndepVarComp()
+        indep_var_comp.add_output('nodes', val=nodes, units='m')
+        indep_var_comp.add_output('A_int', val=np.random.random_sample(ny - 1), units='m**2')
+
+        group = om.Group()
+        group.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+        group.add_subsystem('fuel_vol', WingboxFuelVol(surface=surface), promotes=['*'])
+
+        run_test(self, group, complex_flag=True, method='cs')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+import numpy as np
+
+import openmdao.api as om
+from openaerostruct.structures.point_loads import PointLoads
+from openaerostruct.utils.testing import get_default_surfaces
+
+
+class NoDirectionLoads(PointLoads):
+
+    loads_name = 'loads_from_nothing'
+
+    def _magnitudes(self, inputs):
+        return np.zeros(self.n_point_masses), {}
+
+
+class NoMagnitudesLoads(PointLoads):
+
+    direction = np.array([0., 0., -1.])
+    loads_name = 'loads_from_nothing'
+
+
+class Test(unittest.TestCase):
+
+    def test_incomplete_subclasses(self):
+        surface = get_default_surfaces()[0]
+
+        surface['n_point_masses'] = 1
+
+        for comp_class in [NoDirectionLoads, NoMagnitudesLoads]:
+            prob = om.Problem()
+            prob.model.add_subsystem('comp', comp_class(surface=surface))
+
+            with self.assertRaises(TypeError):
+                prob.setup()
+
+
+if __name__ == '__main__':
+    unittest.main()
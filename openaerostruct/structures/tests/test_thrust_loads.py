@@ -3,12 +3,11 @@ import numpy as np
 
 from openmdao.utils.assert_utils import assert_rel_error
 import openmdao.api as om
+from openaerostruct.structures.compute_nodal_weightings import ComputeNodalWeightings
 from openaerostruct.structures.compute_thrust_loads import ComputeThrustLoads
 from openaerostruct.utils.testing import run_test, get_default_surfaces
 
 
-derivs_added = False
-
 class Test(unittest.TestCase):
 
     def test_no_derivs(self):
@@ -38,6 +37,7 @@ class Test(unittest.TestCase):
         indep_var_comp.add_output('point_mass_locations', val=point_mass_locations, units='m')
 
         group.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+        group.add_subsystem('nodal_weightings', ComputeNodalWeightings(surface=surface), promotes=['*'])
         group.add_subsystem('compute_point_mass_loads', comp, promotes=['*'])
 
         prob = om.Problem(model=group)
@@ -49,7 +49,6 @@ class Test(unittest.TestCase):
         assert_rel_error(self, prob['loads_from_thrusts'][0, :], truth_array, 1e-6)
 
 
-    @unittest.skipUnless(derivs_added, "Analytic derivs not added yet")
     def test_derivs(self):
         surface = get_default_surfaces()[0]
 
@@ -78,11 +77,11 @@ class Test(unittest.TestCase):
         indep_var_comp.add_output('point_mass_locations', val=point_mass_locations, units='m')
 
         group.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+        group.add_subsystem('nodal_weightings', ComputeNodalWeightings(surface=surface), promotes=['*'])
         group.add_subsystem('compute_point_mass_loads', comp, promotes=['*'])
 
         prob = run_test(self, group,  complex_flag=True, step=1e-8, atol=1e-5, compact_print=True)
 
-    @unittest.skipUnless(derivs_added, "Analytic derivs not added yet")
     def test_simple_values(self):
         surface = get_default_surfaces()[0]
 
@@ -101,7 +100,7 @@ class Test(unittest.TestCase):
                             [0., 2., 0.],
                             [0., 3., 0.]])
 
-        engine_thrusts = np.array([[1/9.8]])
+        engine_thrusts = np.array([[1.]])
 
         point_mass_locations = np.array([[.55012, 0.1, 0.]])
 
@@ -110,11 +109,12 @@ class Test(unittest.TestCase):
         indep_var_comp.add_output('point_mass_locations', val=point_mass_locations, units='m')
 
         group.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+        group.add_subsystem('nodal_weightings', ComputeNodalWeightings(surface=surface), promotes=['*'])
         group.add_subsystem('compute_point_mass_loads', comp, promotes=['*'])
 
         prob = run_test(self, group,  complex_flag=True, step=1e-8, atol=1e-5, compact_print=True)
 
-        truth_array = np.array([0, 0, -1., 0., 0.55012, 0.])
+        truth_array = np.array([-1., 0, 0., 0., 0., 0.1])
 
         assert_rel_error(self, prob['comp.loads_from_thrusts'][0, :], truth_array, 1e-6)
 
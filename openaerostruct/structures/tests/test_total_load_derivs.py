@@ -5,6 +5,7 @@ from openaerostruct.structures.total_loads import TotalLoads
 from openaerostruct.utils.testing import run_test, get_default_surfaces
 import openmdao.api as om
 import numpy as np
+from openmdao.utils.assert_utils import assert_rel_error
 
 class Test(unittest.TestCase):
 
@@ -31,6 +32,34 @@ class Test(unittest.TestCase):
 
         run_test(self, comp, complex_flag=True)
 
+    def test_load_cases(self):
+        surface = get_default_surfaces()[0]
+        surface['struct_weight_relief'] = True
+        surface['distributed_fuel_weight'] = True
+
+        comp = TotalLoads(surface=surface, vec_size=3)
+
+        group = om.Group()
+
+        indep_var_comp = om.IndepVarComp()
+
+        ny = surface['mesh'].shape[1]
+
+        indep_var_comp.add_output('loads', val=np.random.random_sample((3, ny, 6)), units='N')
+        indep_var_comp.add_output('struct_weight_loads', val=np.random.random_sample((ny, 6)), units='N')
+        indep_var_comp.add_output('fuel_weight_loads', val=np.random.random_sample((ny, 6)), units='N')
+        indep_var_comp.add_output('load_factor', val=np.array([1., 2.5, -1.]))
+
+        group.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+        group.add_subsystem('total_loads', comp, promotes=['*'])
+
+        p = run_test(self, group, complex_flag=True)
+
+        weight_loads = p['comp.struct_weight_loads'] + p['comp.fuel_weight_loads']
+        for ind, load_factor in enumerate([1., 2.5, -1.]):
+            assert_rel_error(self, p['comp.total_loads'][ind],
+                p['comp.loads'][ind] + load_factor * weight_loads, 1e-12)
+
     def test_structural_mass_loads(self):
         surface = get_default_surfaces()[0]
 
@@ -59,5 +88,42 @@ class Test(unittest.TestCase):
 
         # print(p['comp.struct_weight_loads'])
 
+    def test_structural_mass_loads_load_cases(self):
+        surface = get_default_surfaces()[0]
+        ny = surface['mesh'].shape[1]
+
+        nodesval = np.array([[1., 2., 4.],
+                            [20., 22., 7.],
+                            [8., 17., 14.],
+                            [13., 14., 16.]])
+        element_mass_val = np.arange(ny-1)+1
+        load_factors = np.array([1., 2.5, -1.])
+
+        group = om.Group()
+
+        indep_var_comp = om.IndepVarComp()
+        indep_var_comp.add_output('nodes', val=nodesval,units='m')
+        indep_var_comp.add_output('element_mass', val=element_mass_val,units='kg')
+        indep_var_comp.add_output('load_factor', val=load_factors)
+
+        group.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
+        group.add_subsystem('load', StructureWeightLoads(surface=surface, vec_size=3), promotes=['*'])
+
+        p = run_test(self, group, complex_flag=True, compact_print=True)
+
+        single = om.Problem()
+        single.model.add_subsystem('load', StructureWeightLoads(surface=surface), promotes=['*'])
+        single.setup()
+        single['nodes'] = nodesval
+        single['element_mass'] = element_mass_val
+
+        # Each load case matches a single evaluation
+        for ind, load_factor in enumerate(load_factors):
+            single['load_factor'] = load_factor
+            single.run_model()
+
+            np.testing.assert_allclose(p['comp.struct_weight_loads'][ind],
+                single['struct_weight_loads'], rtol=1e-12)
+
 if __name__ == '__main__':
     unittest.main()
@@ -2,6 +2,7 @@ import unittest
 import numpy as np
 
 import openmdao.api as om
+from openmdao.utils.assert_utils import assert_check_partials
 from openaerostruct.structures.vonmises_tube import VonMisesTube
 from openaerostruct.utils.testing import run_test, get_default_surfaces
 
@@ -43,6 +44,45 @@ class Test(unittest.TestCase):
 
         run_test(self, group, complex_flag=True, compact_print=True, method='cs', step=1e-40, atol=2e-4, rtol=1e-8)
 
+    def test_vec_size(self):
+        surface = get_default_surfaces()[0]
+        ny = surface['mesh'].shape[1]
+
+        nodes = np.zeros((ny, 3))
+        nodes[:,0] = np.linspace(0,0.01,ny)
+        nodes[:,1] = np.linspace(0,1,ny)
+
+        radius = 0.01*np.ones((ny - 1))
+
+        # One displacement field per load case
+        disp = np.zeros((3, ny, 6))
+        for i in range(6):
+            disp[:, :, i] = np.outer([1., 2.5, -1.], np.linspace(0,0.001,ny))
+        disp[1, :, 4] *= -1.
+
+        prob = om.Problem()
+        prob.model.add_subsystem('vm_comp', VonMisesTube(surface=surface, vec_size=3), promotes=['*'])
+        prob.setup(force_alloc_complex=True)
+        prob['nodes'] = nodes
+        prob['radius'] = radius
+        prob['disp'] = disp
+        prob.run_model()
+
+        check = prob.check_partials(compact_print=True, method='cs', step=1e-40, out_stream=None)
+        assert_check_partials(check, atol=2e-4, rtol=1e-8)
+
+        single = om.Problem()
+        single.model.add_subsystem('vm_comp', VonMisesTube(surface=surface), promotes=['*'])
+        single.setup()
+        single['nodes'] = nodes
+        single['radius'] = radius
+
+        for ind in range(3):
+            single['disp'] = disp[ind]
+            single.run_model()
+
+            np.testing.assert_allclose(prob['vonmises'][ind], single['vonmises'], rtol=1e-12)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,6 +2,7 @@ import unittest
 import numpy as np
 
 import openmdao.api as om
+from openmdao.utils.assert_utils import assert_check_partials
 from openaerostruct.structures.vonmises_wingbox import VonMisesWingbox
 from openaerostruct.utils.testing import run_test, get_default_surfaces
 
@@ -48,6 +49,47 @@ class Test(unittest.TestCase):
 
         run_test(self, group,  complex_flag=True, step=1e-8, atol=2e-5, compact_print=True)
 
+    def test_vec_size(self):
+        surface = get_default_surfaces()[0]
+        surface['strength_factor_for_upper_skin'] = 1.0
+
+        ny = surface['mesh'].shape[1]
+
+        nodesval = np.array([[0., 0., 0.],
+                            [0., 1., 0.],
+                            [0., 2., 0.],
+                            [0., 3., 0.]])
+
+        disp = np.random.random_sample((3, ny, 6)) * 1e-3
+
+        prob = om.Problem()
+        prob.model.add_subsystem('vonmises_wingbox', VonMisesWingbox(surface=surface, vec_size=3),
+            promotes=['*'])
+        prob.setup(force_alloc_complex=True)
+
+        single = om.Problem()
+        single.model.add_subsystem('vonmises_wingbox', VonMisesWingbox(surface=surface),
+            promotes=['*'])
+        single.setup()
+
+        for p in [prob, single]:
+            p['nodes'] = nodesval
+            for name in ['Qz', 'J', 'A_enc', 'spar_thickness', 'htop', 'hbottom', 'hfront', 'hrear']:
+                p[name] = np.linspace(1., 2., ny - 1)
+
+        prob['disp'] = disp
+        prob.run_model()
+
+        check = prob.check_partials(compact_print=True, method='cs', out_stream=None)
+        assert_check_partials(check, atol=1e-3, rtol=1e-8)
+
+        # Each load case matches a single evaluation
+        for ind in range(3):
+            single['disp'] = disp[ind]
+            single.run_model()
+
+            np.testing.assert_allclose(prob['vonmises'][ind], single['vonmises'], rtol=1e-12)
+
 
 if __name__ == '__main__':
     unittest.main()
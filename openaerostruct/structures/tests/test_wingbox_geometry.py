@@ -23,12 +23,17 @@ class Test(unittest.TestCase):
 
         indep_var_comp = om.IndepVarComp()
 
-        indep_var_comp.add_output('mesh', val=surface['mesh'])
+        # Twist the sections, since the twist angles are not differentiable
+        # for untwisted sections
+        mesh = surface['mesh'].copy()
+        mesh[-1, :, 2] += np.linspace(0.1, 0.3, mesh.shape[1])
+
+        indep_var_comp.add_output('mesh', val=mesh)
 
         group.add_subsystem('indep_var_comp', indep_var_comp, promotes=['*'])
         group.add_subsystem('wingbox_geometry', comp, promotes=['*'])
 
-        run_test(self, group,  complex_flag=True)
+        run_test(self, group,  complex_flag=True, method='cs')
 
 if __name__ == '__main__':
     unittest.main()
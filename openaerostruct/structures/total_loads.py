@@ -8,6 +8,10 @@ class TotalLoads(om.ExplicitComponent):
     """
     Add the loads from the aerodynamics, structural weight, and fuel weight.
 
+    With vec_size > 1, the loads are stacked for several load cases. The weight
+    loads are then computed for a load factor of 1 and scaled by the load
+    factor of each case, while the thrust loads are the same for all cases.
+
     Parameters
     ----------
     loads[ny, 6] : numpy array
@@ -21,6 +25,8 @@ class TotalLoads(om.ExplicitComponent):
         computed from the weight of the fuel.
     loads_from_point_masses[ny, 6] : numpy array
         The cumulative loads from all point masses.
+    load_factor[vec_size] : numpy array
+        Load factor of each load case. Only used if vec_size > 1.
 
     Returns
     -------
@@ -30,50 +36,79 @@ class TotalLoads(om.ExplicitComponent):
 
     def initialize(self):
         self.options.declare('surface', types=dict)
+        self.options.declare('vec_size', types=int, default=1,
+                             desc='Number of load cases.')
 
     def setup(self):
         self.surface = surface = self.options['surface']
         self.ny = surface['mesh'].shape[1]
+        vec_size = self.options['vec_size']
+
+        shape = (vec_size, ) if vec_size > 1 else ()
 
-        self.add_input('loads', val=np.ones((self.ny, 6)), units='N')
+        # Loads that are multiplied by the load factor of each load case
+        self.weight_loads = []
         if surface['struct_weight_relief']:
-            self.add_input('struct_weight_loads', val=np.zeros((self.ny, 6)), units='N')
+            self.weight_loads.append('struct_weight_loads')
         if surface['distributed_fuel_weight']:
-            self.add_input('fuel_weight_loads', val=np.zeros((self.ny, 6)), units='N')
+            self.weight_loads.append('fuel_weight_loads')
+        if 'n_point_masses' in surface.keys():
+            self.weight_loads.append('loads_from_point_masses')
+
+        self.add_input('loads', val=np.ones(shape + (self.ny, 6)), units='N')
+        for name in self.weight_loads:
+            self.add_input(name, val=np.zeros((self.ny, 6)), units='N')
         if 'n_point_masses' in surface.keys():
-            self.add_input('loads_from_point_masses', val=np.zeros((self.ny, 6)), units='N')
             self.add_input('loads_from_thrusts', val=np.zeros((self.ny, 6)), units='N')
+        if vec_size > 1 and self.weight_loads:
+            self.add_input('load_factor', val=np.ones(vec_size))
 
-        self.add_output('total_loads', val=np.ones((self.ny, 6)), units='N')
+        self.add_output('total_loads', val=np.ones(shape + (self.ny, 6)), units='N')
 
-        arange = np.arange(self.ny * 6)
+        n = self.ny * 6
+        arange = np.arange(n * vec_size)
+        tiled = np.tile(np.arange(n), vec_size)
 
         self.declare_partials('total_loads', 'loads',
             rows=arange, cols=arange, val=1.)
 
-        if self.surface['struct_weight_relief']:
-            self.declare_partials('total_loads', 'struct_weight_loads',
-                rows=arange, cols=arange, val=1.)
-
-        if self.surface['distributed_fuel_weight']:
-            self.declare_partials('total_loads', 'fuel_weight_loads',
-                rows=arange, cols=arange, val=1.)
+        for name in self.weight_loads:
+            self.declare_partials('total_loads', name,
+                rows=arange, cols=tiled, val=1.)
 
         if 'n_point_masses' in surface.keys():
-            self.declare_partials('total_loads', 'loads_from_point_masses',
-                rows=arange, cols=arange, val=1.)
             self.declare_partials('total_loads', 'loads_from_thrusts',
-                rows=arange, cols=arange, val=1.)
+                rows=arange, cols=tiled, val=1.)
+
+        if vec_size > 1 and self.weight_loads:
+            self.declare_partials('total_loads', 'load_factor',
+                rows=arange, cols=np.repeat(np.arange(vec_size), n))
 
     def compute(self, inputs, outputs):
+        vec_size = self.options['vec_size']
+
         outputs['total_loads'] = inputs['loads']
 
-        if self.surface['struct_weight_relief']:
-            outputs['total_loads'] += inputs['struct_weight_loads']
+        if self.weight_loads:
+            weight_loads = sum(inputs[name] for name in self.weight_loads)
+
+            if vec_size > 1:
+                weight_loads = np.einsum('i,jk->ijk', inputs['load_factor'], weight_loads)
 
-        if self.surface['distributed_fuel_weight']:
-            outputs['total_loads'] += inputs['fuel_weight_loads']
+            outputs['total_loads'] += weight_loads
 
         if 'n_point_masses' in self.surface.keys():
-            outputs['total_loads'] += inputs['loads_from_point_masses']
             outputs['total_loads'] += inputs['loads_from_thrusts']
+
+    def compute_partials(self, inputs, partials):
+        vec_size = self.options['vec_size']
+
+        if vec_size > 1 and self.weight_loads:
+            n = self.ny * 6
+            weight_loads = sum(inputs[name] for name in self.weight_loads)
+            load_factor = np.repeat(inputs['load_factor'], n)
+
+            for name in self.weight_loads:
+                partials['total_loads', name] = load_factor
+
+            partials['total_loads', 'load_factor'] = np.tile(weight_loads.flatten(), vec_size)
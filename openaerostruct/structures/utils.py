@@ -50,6 +50,182 @@ def cross_d(a,b):
     return dcda,dcdb
 
 
+def skew(vec):
+    """
+    Return the matrices that compute the cross product with each vector in vec,
+    so that skew(a).dot(b) = np.cross(a, b).
+    """
+    mat = np.zeros(vec.shape + (3, ), dtype=vec.dtype)
+    mat[..., 0, 1] = -vec[..., 2]
+    mat[..., 0, 2] = vec[..., 1]
+    mat[..., 1, 0] = vec[..., 2]
+    mat[..., 1, 2] = -vec[..., 0]
+    mat[..., 2, 0] = -vec[..., 1]
+    mat[..., 2, 1] = vec[..., 0]
+    return mat
+
+def element_frames(nodes, derivs=False):
+    """
+    Compute the length and local frame of each element between consecutive
+    nodes. The local x-axis is along the element, the local y-axis is normal to
+    it and to the global x-axis, and the local z-axis completes the frame.
+
+    Returns
+    -------
+    L[ny-1] : numpy array
+        Length of each element.
+    T[ny-1, 3, 3] : numpy array
+        Local x-, y-, and z-axes of each element, as the rows of T.
+    dL[ny-1, 3] : numpy array
+        Derivatives of L wrt the element vector nodes[1:] - nodes[:-1].
+        Only returned if derivs is True.
+    dT[ny-1, 3, 3, 3] : numpy array
+        Derivatives of T wrt the element vector, with the last axis
+        along the element vector. Only returned if derivs is True.
+    """
+    dP = nodes[1:] - nodes[:-1]
+    eye = np.eye(3)
+
+    L = norm(dP, axis=1)
+    x_loc = dP / L[:, np.newaxis]
+
+    w = np.cross(x_loc, np.array([1., 0., 0.]))
+    w_norm = norm(w, axis=1)
+    y_loc = w / w_norm[:, np.newaxis]
+
+    q = np.cross(x_loc, y_loc)
+    q_norm = norm(q, axis=1)
+    z_loc = q / q_norm[:, np.newaxis]
+
+    T = np.stack([x_loc, y_loc, z_loc], axis=1)
+
+    if not derivs:
+        return L, T
+
+    # Derivatives of the unit vectors wrt the vectors they are computed from
+    dx = (eye - np.einsum('ei,ej->eij', x_loc, x_loc)) / L[:, np.newaxis, np.newaxis]
+    dy_dw = (eye - np.einsum('ei,ej->eij', y_loc, y_loc)) / w_norm[:, np.newaxis, np.newaxis]
+    dz_dq = (eye - np.einsum('ei,ej->eij', z_loc, z_loc)) / q_norm[:, np.newaxis, np.newaxis]
+
+    dy = np.einsum('eij,jk,ekl->eil', dy_dw, -skew(np.array([1., 0., 0.])), dx)
+    dq = np.einsum('eij,ejk->eik', skew(x_loc), dy) - np.einsum('eij,ejk->eik', skew(y_loc), dx)
+    dz = np.einsum('eij,ejk->eik', dz_dq, dq)
+
+    return L, T, x_loc, np.stack([dx, dy, dz], axis=1)
+
+
+def weight_loads_sparsity(ny):
+    """
+    Return the sparsity pattern of the derivatives of the loads from element
+    weights (see weight_loads) wrt the nodes.
+
+    The moments of each element depend on both of its nodes. Adjacent elements
+    overlap, so the contributions of the elements are summed onto the unique
+    nonzeros with nodes_map.
+
+    Returns
+    -------
+    rows : numpy array
+        Indices of the nonzeros in the flattened [ny, 6] loads.
+    cols : numpy array
+        Indices of the nonzeros in the flattened [ny, 3] nodes.
+    nodes_map : numpy array
+        Index of the unique nonzero that each element contribution is added to.
+    """
+    loads_indices = np.arange(6 * ny).reshape((ny, 6))
+    nodes_indices = np.arange(3 * ny).reshape((ny, 3))
+
+    rows = np.stack([
+        loads_indices[:-1, 3], loads_indices[1:, 3],
+        loads_indices[:-1, 4], loads_indices[1:, 4],
+    ], axis=1)
+    cols = np.concatenate([nodes_indices[:-1], nodes_indices[1:]], axis=1)
+    keys = (rows[:, :, np.newaxis] * 3 * ny + cols[:, np.newaxis, :]).flatten()
+
+    keys, nodes_map = np.unique(keys, return_inverse=True)
+
+    return keys // (3 * ny), keys % (3 * ny), nodes_map.flatten()
+
+def weight_loads(nodes, weights, nodes_map=None):
+    """
+    Compute the nodal loads from the weight of each element, which is split
+    evenly between its two nodes along with the consistent bending moments.
+    The weight is assumed to act along the elastic axis.
+
+    Parameters
+    ----------
+    nodes[ny, 3] : numpy array
+        Coordinates of the FEM nodes.
+    weights[ny-1] : numpy array
+        Weight of each element.
+    nodes_map : numpy array or None
+        Map from weight_loads_sparsity. If given, the derivatives are returned too.
+
+    Returns
+    -------
+    loads[ny, 6] : numpy array
+        Loads on the nodes.
+    dloads__dweights[ny-1, 6] : numpy array
+        Derivatives of the z-forces, x-moments, and y-moments on the first and
+        second nodes of each element wrt its weight, in that order. Only
+        returned if nodes_map is given.
+    dloads__dnodes : numpy array
+        Derivatives of the loads wrt the nodes, for the nonzeros from
+        weight_loads_sparsity. Only returned if nodes_map is given.
+    """
+    ny = nodes.shape[0]
+
+    deltas = nodes[1:] - nodes[:-1]
+    element_lengths = norm(deltas, axis=1)
+    planform_lengths = (deltas[:, 0]**2 + deltas[:, 1]**2)**0.5
+
+    # Moment arms of each element, per unit weight
+    arm3 = planform_lengths / 12. * deltas[:, 1] / element_lengths
+    arm4 = planform_lengths / 12. * deltas[:, 0] / element_lengths
+
+    loads = np.zeros((ny, 6), dtype=np.result_type(nodes, weights))
+
+    # Loads in z-direction
+    loads[:-1, 2] -= weights / 2.
+    loads[1:, 2] -= weights / 2.
+
+    # Bending moments for consistency
+    loads[:-1, 3] -= weights * arm3
+    loads[1:, 3] += weights * arm3
+
+    loads[:-1, 4] -= weights * arm4
+    loads[1:, 4] += weights * arm4
+
+    if nodes_map is None:
+        return loads
+
+    dloads__dweights = np.stack([
+        -0.5 * np.ones(ny - 1), -0.5 * np.ones(ny - 1),
+        -arm3, arm3, -arm4, arm4,
+    ], axis=1)
+
+    # Derivatives of the moment arms wrt the element deltas
+    dplanform__ddel = np.zeros(deltas.shape, dtype=deltas.dtype)
+    dplanform__ddel[:, :2] = deltas[:, :2] / planform_lengths[:, np.newaxis]
+    dlength__ddel = deltas / element_lengths[:, np.newaxis]
+
+    darms = []
+    for comp in [1, 0]:
+        delta = deltas[:, comp:comp+1]
+        darm = dplanform__ddel * delta / element_lengths[:, np.newaxis] \
+            - (planform_lengths * deltas[:, comp] / element_lengths**2)[:, np.newaxis] * dlength__ddel
+        darm[:, comp] += planform_lengths / element_lengths
+        darms.append(weights[:, np.newaxis] / 12. * darm)
+
+    # Both nodes of an element move its deltas in opposite directions
+    dmoments__ddel = np.stack([-darms[0], darms[0], -darms[1], darms[1]], axis=1)
+    dmoments__dnodes = np.concatenate([-dmoments__ddel, dmoments__ddel], axis=2)
+
+    dloads__dnodes = np.bincount(nodes_map, weights=dmoments__dnodes.flatten())
+
+    return loads, dloads__dweights, dloads__dnodes
+
+
 def radii(mesh, t_c=0.15):
 
     """
@@ -3,7 +3,7 @@ import numpy as np
 
 import openmdao.api as om
 
-from openaerostruct.structures.utils import norm, unit
+from openaerostruct.structures.utils import element_frames
 
 
 class VonMisesWingbox(om.ExplicitComponent):
@@ -15,7 +15,8 @@ class VonMisesWingbox(om.ExplicitComponent):
     nodes[ny, 3] : numpy array
         Flattened array with coordinates for each FEM node.
     disp[ny, 6] : numpy array
-        Displacements of each FEM node.
+        Displacements of each FEM node. With vec_size > 1, there is a leading
+        axis with one entry per load case.
     Qz[ny-1] : numpy array
         First moment of area above the neutral axis parallel to the local 
         z-axis (for each wingbox segment).
@@ -42,20 +43,26 @@ class VonMisesWingbox(om.ExplicitComponent):
     Returns
     -------
     vonmises[ny-1, 4] : numpy array
-        von Mises stresses for 4 stress combinations for each FEM element.
+        von Mises stresses for 4 stress combinations for each FEM element,
+        stacked in the same way as disp.
 
     """
 
     def initialize(self):
         self.options.declare('surface', types=dict)
+        self.options.declare('vec_size', types=int, default=1,
+                             desc='Number of load cases.')
 
     def setup(self):
         self.surface = surface = self.options['surface']
 
         self.ny = surface['mesh'].shape[1]
+        vec_size = self.options['vec_size']
+
+        shape = (vec_size, ) if vec_size > 1 else ()
 
         self.add_input('nodes', val=np.zeros((self.ny, 3)), units='m')
-        self.add_input('disp', val=np.zeros((self.ny, 6)), units='m')
+        self.add_input('disp', val=np.zeros(shape + (self.ny, 6)), units='m')
         self.add_input('Qz', val=np.zeros((self.ny - 1)), units='m**3')
         self.add_input('J', val=np.zeros((self.ny - 1)), units='m**4')
         self.add_input('A_enc', val=np.zeros((self.ny - 1)), units='m**2')
@@ -65,18 +72,66 @@ class VonMisesWingbox(om.ExplicitComponent):
         self.add_input('hfront', val=np.zeros((self.ny - 1)), units='m')
         self.add_input('hrear', val=np.zeros((self.ny - 1)), units='m')
 
-        self.add_output('vonmises', val=np.zeros((self.ny-1, 4)),units='N/m**2')
+        self.add_output('vonmises', val=np.zeros(shape + (self.ny-1, 4)),units='N/m**2')
 
         self.E = surface['E']
         self.G = surface['G']
 
         self.tssf = surface['strength_factor_for_upper_skin']
 
-        self.declare_partials('*', '*', method='cs')
+        num_elems = self.ny - 1
+
+        # Coefficients of the axial, top, bottom, front, and rear stresses in
+        # the normal stress of each of the 4 stress combinations
+        self.normal_coeffs = np.array([
+            [1., 1., 0., 0., 1.],
+            [1., 0., 1., 1., 0.],
+            [1., 0., 0., 1., 0.],
+            [1., 0., 0., 0., 1.],
+        ])
+
+        # Coefficients of the vertical shear in the shear stress of each of
+        # the 4 stress combinations
+        self.shear_coeffs = np.array([0., 0., -1., 1.])
+
+        self.strength_factors = np.array([self.tssf, 1., 1., self.tssf])
+
+        # The partials of each load case are offset by these amounts
+        vec_rows = 4 * num_elems * np.arange(vec_size)
+        vec_cols = 6 * self.ny * np.arange(vec_size)
+
+        rows = np.repeat(np.arange(4 * num_elems), 12)
+        cols = np.tile(np.arange(12), 4 * num_elems) + np.repeat(6 * np.arange(num_elems), 48)
+        rows = np.tile(rows, vec_size) + np.repeat(vec_rows, len(rows))
+        cols = np.tile(cols, vec_size) + np.repeat(vec_cols, len(cols))
+
+        self.declare_partials('vonmises', 'disp', rows=rows, cols=cols)
+
+        rows = np.repeat(np.arange(4 * num_elems), 6)
+        cols = np.tile(np.arange(6), 4 * num_elems) + np.repeat(3 * np.arange(num_elems), 24)
+        rows = np.tile(rows, vec_size) + np.repeat(vec_rows, len(rows))
+        cols = np.tile(cols, vec_size)
+
+        self.declare_partials('vonmises', 'nodes', rows=rows, cols=cols)
+
+        rows = np.arange(4 * num_elems * vec_size)
+        cols = np.tile(np.repeat(np.arange(num_elems), 4), vec_size)
+
+        for name in ['Qz', 'J', 'A_enc', 'spar_thickness', 'htop', 'hbottom', 'hfront', 'hrear']:
+            self.declare_partials('vonmises', name, rows=rows, cols=cols)
+
+    def _local_disps(self, disp, T):
+        """
+        Return the displacements and rotations of both ends of each element in
+        the local element frames, each with shape (vec_size, ny-1, 3).
+        """
+        u0 = np.einsum('eij,vej->vei', T, disp[:, :-1, :3])
+        r0 = np.einsum('eij,vej->vei', T, disp[:, :-1, 3:])
+        u1 = np.einsum('eij,vej->vei', T, disp[:, 1:, :3])
+        r1 = np.einsum('eij,vej->vei', T, disp[:, 1:, 3:])
+        return u0, r0, u1, r1
 
     def compute(self, inputs, outputs):
-        disp = inputs['disp']
-        nodes = inputs['nodes']
         A_enc = inputs['A_enc']
         Qy = inputs['Qz']
         J = inputs['J']
@@ -85,68 +140,184 @@ class VonMisesWingbox(om.ExplicitComponent):
         hfront = inputs['hfront']
         hrear = inputs['hrear']
         spar_thickness = inputs['spar_thickness']
-        vonmises = outputs['vonmises']
-
-        # Only use complex type for these arrays if we're using cs to check derivs
-        dtype = type(disp[0, 0])
-        T = np.zeros((3, 3), dtype=dtype)
-        x_gl = np.array([1, 0, 0], dtype=dtype)
 
         E = self.E
         G = self.G
 
         num_elems = self.ny - 1
-        for ielem in range(num_elems):
-
-            P0 = nodes[ielem, :]
-            P1 = nodes[ielem+1, :]
-            L = norm(P1 - P0)
+        vec_size = self.options['vec_size']
+        disp = inputs['disp'].reshape(vec_size, self.ny, 6)
 
-            x_loc = unit(P1 - P0)
-            y_loc = unit(np.cross(x_loc, x_gl))
-            z_loc = unit(np.cross(x_loc, y_loc))
+        L, T = element_frames(inputs['nodes'])
+        u0, r0, u1, r1 = self._local_disps(disp, T)
 
-            T[0, :] = x_loc
-            T[1, :] = y_loc
-            T[2, :] = z_loc
+        # Bending moments about the local z- and y-axes and the shear force,
+        # up to the stiffness factors
+        mz = 6 * u0[..., 1] + 2 * r0[..., 2] * L - 6 * u1[..., 1] + 4 * r1[..., 2] * L
+        my = -6 * u0[..., 2] + 2 * r0[..., 1] * L + 6 * u1[..., 2] + 4 * r1[..., 1] * L
+        vz = -12 * u0[..., 1] - 6 * r0[..., 2] * L + 12 * u1[..., 1] - 6 * r1[..., 2] * L
 
-            u0x, u0y, u0z = T.dot(disp[ielem, :3])
-            r0x, r0y, r0z = T.dot(disp[ielem, 3:])
-            u1x, u1y, u1z = T.dot(disp[ielem+1, :3])
-            r1x, r1y, r1z = T.dot(disp[ielem+1, 3:])
+        # this is stress = modulus * strain; positive is tensile
+        axial_stress = E * (u1[..., 0] - u0[..., 0]) / L
 
-            # this is stress = modulus * strain; positive is tensile
-            axial_stress = E * (u1x - u0x) / L
+        # this is Torque / (2 * thickness_min * Area_enclosed)
+        torsion_stress = G * J / L * (r1[..., 0] - r0[..., 0]) / 2 / spar_thickness / A_enc
 
-            # this is Torque / (2 * thickness_min * Area_enclosed)
-            torsion_stress = G * J[ielem] / L * (r1x - r0x) / 2 / spar_thickness[ielem] / A_enc[ielem]
+        # this is moment * h / I
+        top_bending_stress = E / (L**2) * mz * htop
+        bottom_bending_stress = - E / (L**2) * mz * hbottom
+        front_bending_stress = - E / (L**2) * my * hfront
+        rear_bending_stress = E / (L**2) * my * hrear
 
-            # this is moment * h / I
-            top_bending_stress = E / (L**2) * (6 * u0y + 2 * r0z * L - 6 * u1y + 4 * r1z * L ) * htop[ielem]
+        # shear due to bending (VQ/It) note: the I used to get V cancels the other I
+        vertical_shear = E / (L**3) * vz * Qy / (2 * spar_thickness)
 
-            # this is moment * h / I
-            bottom_bending_stress = - E / (L**2) * (6 * u0y + 2 * r0z * L - 6 * u1y + 4 * r1z * L ) * hbottom[ielem]
+        normal_stresses = np.stack([axial_stress, top_bending_stress, bottom_bending_stress,
+            front_bending_stress, rear_bending_stress], axis=-1)
 
-            # this is moment * h / I
-            front_bending_stress = - E / (L**2) * (-6 * u0z + 2 * r0y * L + 6 * u1z + 4 * r1y * L ) * hfront[ielem]
+        # The 4 stress combinations:
+        sxx = normal_stresses.dot(self.normal_coeffs.T)
+        sxt = torsion_stress[..., np.newaxis] + vertical_shear[..., np.newaxis] * self.shear_coeffs
 
-            # this is moment * h / I
-            rear_bending_stress = E / (L**2) * (-6 * u0z + 2 * r0y * L + 6 * u1z + 4 * r1y * L ) * hrear[ielem] 
+        vonmises = outputs['vonmises'].reshape(vec_size, num_elems, 4)
+        vonmises[:] = np.sqrt(sxx**2 + 3 * sxt**2) / self.strength_factors
 
-            # shear due to bending (VQ/It) note: the I used to get V cancels the other I
-            vertical_shear =  E / (L**3) *(-12 * u0y - 6 * r0z * L + 12 * u1y - 6 * r1z * L ) * Qy[ielem] / (2 * spar_thickness[ielem])
+    def compute_partials(self, inputs, partials):
+        A_enc = inputs['A_enc']
+        Qy = inputs['Qz']
+        J = inputs['J']
+        htop = inputs['htop']
+        hbottom = inputs['hbottom']
+        hfront = inputs['hfront']
+        hrear = inputs['hrear']
+        spar_thickness = inputs['spar_thickness']
 
-            # print("==========",ielem,"================")
-            # print("vertical_shear", vertical_shear)
-            # print("top",top_bending_stress)
-            # print("bottom",bottom_bending_stress)
-            # print("front",front_bending_stress)
-            # print("rear",rear_bending_stress)
-            # print("axial", axial_stress)
-            # print("torsion", torsion_stress)
+        E = self.E
+        G = self.G
 
-            # The 4 stress combinations:
-            vonmises[ielem, 0] = np.sqrt((top_bending_stress + rear_bending_stress + axial_stress)**2 + 3*torsion_stress**2) / self.tssf
-            vonmises[ielem, 1] = np.sqrt((bottom_bending_stress + front_bending_stress + axial_stress)**2 + 3*torsion_stress**2)
-            vonmises[ielem, 2] = np.sqrt((front_bending_stress + axial_stress)**2 + 3*(torsion_stress-vertical_shear)**2)
-            vonmises[ielem, 3] = np.sqrt((rear_bending_stress + axial_stress)**2 + 3*(torsion_stress+vertical_shear)**2) / self.tssf
+        num_elems = self.ny - 1
+        vec_size = self.options['vec_size']
+        disp = inputs['disp'].reshape(vec_size, self.ny, 6)
+
+        L, T, dL, dT = element_frames(inputs['nodes'], derivs=True)
+        u0, r0, u1, r1 = self._local_disps(disp, T)
+
+        mz = 6 * u0[..., 1] + 2 * r0[..., 2] * L - 6 * u1[..., 1] + 4 * r1[..., 2] * L
+        my = -6 * u0[..., 2] + 2 * r0[..., 1] * L + 6 * u1[..., 2] + 4 * r1[..., 1] * L
+        vz = -12 * u0[..., 1] - 6 * r0[..., 2] * L + 12 * u1[..., 1] - 6 * r1[..., 2] * L
+
+        # Stress factors that only depend on the element and section properties
+        axial_fac = E / L
+        torsion_fac = G * J / L / 2 / spar_thickness / A_enc
+        bending_fac = E / (L**2)
+        shear_fac = E / (L**3) * Qy / (2 * spar_thickness)
+
+        axial_stress = axial_fac * (u1[..., 0] - u0[..., 0])
+        torsion_stress = torsion_fac * (r1[..., 0] - r0[..., 0])
+        top_bending_stress = bending_fac * mz * htop
+        bottom_bending_stress = - bending_fac * mz * hbottom
+        front_bending_stress = - bending_fac * my * hfront
+        rear_bending_stress = bending_fac * my * hrear
+        vertical_shear = shear_fac * vz
+
+        normal_stresses = np.stack([axial_stress, top_bending_stress, bottom_bending_stress,
+            front_bending_stress, rear_bending_stress], axis=-1)
+
+        sxx = normal_stresses.dot(self.normal_coeffs.T)
+        sxt = torsion_stress[..., np.newaxis] + vertical_shear[..., np.newaxis] * self.shear_coeffs
+
+        # added eps to avoid the singularity at zero stress
+        vm = np.sqrt(sxx**2 + 3 * sxt**2) + 1e-50
+        dvm_dsxx = sxx / vm / self.strength_factors
+        dvm_dsxt = 3 * sxt / vm / self.strength_factors
+
+        # Derivatives of the 4 von Mises stresses wrt the 7 individual stresses:
+        # axial, top, bottom, front, rear, torsion, and vertical shear
+        dvm_dstress = np.concatenate([
+            dvm_dsxx[..., np.newaxis] * self.normal_coeffs,
+            dvm_dsxt[..., np.newaxis],
+            (dvm_dsxt * self.shear_coeffs)[..., np.newaxis],
+        ], axis=-1)
+
+        # Section property derivatives, which only affect a single stress each
+        dvm_dtorsion = dvm_dstress[..., 5]
+        dvm_dshear = dvm_dstress[..., 6]
+
+        partials['vonmises', 'Qz'] = (dvm_dshear * (vertical_shear / Qy)[..., np.newaxis]).flatten()
+        partials['vonmises', 'J'] = (dvm_dtorsion * (torsion_stress / J)[..., np.newaxis]).flatten()
+        partials['vonmises', 'A_enc'] = (-dvm_dtorsion * (torsion_stress / A_enc)[..., np.newaxis]).flatten()
+        partials['vonmises', 'spar_thickness'] = \
+            (-(dvm_dtorsion * torsion_stress[..., np.newaxis] + dvm_dshear * vertical_shear[..., np.newaxis])
+            / spar_thickness[:, np.newaxis]).flatten()
+        partials['vonmises', 'htop'] = (dvm_dstress[..., 1] * (bending_fac * mz)[..., np.newaxis]).flatten()
+        partials['vonmises', 'hbottom'] = (-dvm_dstress[..., 2] * (bending_fac * mz)[..., np.newaxis]).flatten()
+        partials['vonmises', 'hfront'] = (-dvm_dstress[..., 3] * (bending_fac * my)[..., np.newaxis]).flatten()
+        partials['vonmises', 'hrear'] = (dvm_dstress[..., 4] * (bending_fac * my)[..., np.newaxis]).flatten()
+
+        # Derivatives of the 7 stresses wrt the local displacements and rotations,
+        # ordered as [u0, r0, u1, r1] with 3 local components each
+        dstress_dloc = np.zeros((num_elems, 7, 12))
+        dstress_dloc[:, 0, 0] = -axial_fac
+        dstress_dloc[:, 0, 6] = axial_fac
+
+        dmz_dloc = np.zeros((num_elems, 12))
+        dmz_dloc[:, 1] = 6.
+        dmz_dloc[:, 5] = 2 * L
+        dmz_dloc[:, 7] = -6.
+        dmz_dloc[:, 11] = 4 * L
+
+        dmy_dloc = np.zeros((num_elems, 12))
+        dmy_dloc[:, 2] = -6.
+        dmy_dloc[:, 4] = 2 * L
+        dmy_dloc[:, 8] = 6.
+        dmy_dloc[:, 10] = 4 * L
+
+        dvz_dloc = np.zeros((num_elems, 12))
+        dvz_dloc[:, 1] = -12.
+        dvz_dloc[:, 5] = -6 * L
+        dvz_dloc[:, 7] = 12.
+        dvz_dloc[:, 11] = -6 * L
+
+        dstress_dloc[:, 1] = (bending_fac * htop)[:, np.newaxis] * dmz_dloc
+        dstress_dloc[:, 2] = -(bending_fac * hbottom)[:, np.newaxis] * dmz_dloc
+        dstress_dloc[:, 3] = -(bending_fac * hfront)[:, np.newaxis] * dmy_dloc
+        dstress_dloc[:, 4] = (bending_fac * hrear)[:, np.newaxis] * dmy_dloc
+        dstress_dloc[:, 5, 3] = -torsion_fac
+        dstress_dloc[:, 5, 9] = torsion_fac
+        dstress_dloc[:, 6] = shear_fac[:, np.newaxis] * dvz_dloc
+
+        # The local components are the global ones rotated by T
+        dstress_ddisp = np.einsum('eskj,eji->eski', dstress_dloc.reshape(num_elems, 7, 4, 3),
+            T).reshape(num_elems, 7, 12)
+
+        partials['vonmises', 'disp'] = np.einsum('veks,esj->vekj', dvm_dstress, dstress_ddisp).flatten()
+
+        # Derivatives wrt the element vector, through the element length and
+        # the local frame
+        dloc_dP = np.concatenate([
+            np.einsum('eijk,vej->veik', dT, disp[:, :-1, :3]),
+            np.einsum('eijk,vej->veik', dT, disp[:, :-1, 3:]),
+            np.einsum('eijk,vej->veik', dT, disp[:, 1:, :3]),
+            np.einsum('eijk,vej->veik', dT, disp[:, 1:, 3:]),
+        ], axis=2)
+
+        # Only the moment arms of the rotations depend on L directly
+        dmz_dL = 2 * r0[..., 2] + 4 * r1[..., 2]
+        dmy_dL = 2 * r0[..., 1] + 4 * r1[..., 1]
+        dvz_dL = -6 * r0[..., 2] - 6 * r1[..., 2]
+
+        dstress_dL = np.stack([
+            -axial_stress / L,
+            -2 * top_bending_stress / L + bending_fac * htop * dmz_dL,
+            -2 * bottom_bending_stress / L - bending_fac * hbottom * dmz_dL,
+            -2 * front_bending_stress / L - bending_fac * hfront * dmy_dL,
+            -2 * rear_bending_stress / L + bending_fac * hrear * dmy_dL,
+            -torsion_stress / L,
+            -3 * vertical_shear / L + shear_fac * dvz_dL,
+        ], axis=-1)
+
+        dstress_dP = np.einsum('esi,veik->vesk', dstress_dloc, dloc_dP) + \
+            dstress_dL[..., np.newaxis] * dL[:, np.newaxis, :]
+
+        dvm_dP = np.einsum('veks,vesj->vekj', dvm_dstress, dstress_dP)
+        partials['vonmises', 'nodes'] = np.concatenate([-dvm_dP, dvm_dP], axis=-1).flatten()
@@ -27,7 +27,7 @@ class WingboxGeometry(om.ExplicitComponent):
         self.options.declare('surface', types=dict)
 
     def setup(self):
-        self.surface = self.options['surface']
+        self.surface = surface = self.options['surface']
         mesh = self.surface['mesh']
         nx, ny = mesh.shape[0], mesh.shape[1]
 
@@ -37,77 +37,119 @@ class WingboxGeometry(om.ExplicitComponent):
         self.add_output('fem_chords', val=np.ones((ny - 1)),units='m')
         self.add_output('fem_twists', val=np.ones((ny - 1)),units='deg')
 
-        self.declare_partials('*', '*', method='fd')
-
-    def compute(self, inputs, outputs):
-        mesh = inputs['mesh']
-        vectors = mesh[-1, :, :] - mesh[0, :, :]
-        streamwise_chords = np.sqrt(np.sum(vectors**2, axis=1))
-        streamwise_chords = 0.5 * streamwise_chords[:-1] + 0.5 * streamwise_chords[1:]
-
-        # Chord lengths for the panel strips at the panel midpoint
-        outputs['streamwise_chords'] = streamwise_chords.copy()
-
-        fem_twists = np.zeros(streamwise_chords.shape, dtype=type(mesh[0, 0, 0]))
-        fem_chords = streamwise_chords.copy()
-
-        surface = self.surface
-
         # Gets the shear center by looking at the four corners.
         # Assumes same spar thickness for front and rear spar.
-        w = (surface['data_x_upper'][0] *(surface['data_y_upper'][0]-surface['data_y_lower'][0]) + \
-        surface['data_x_upper'][-1]*(surface['data_y_upper'][-1]-surface['data_y_lower'][-1])) / \
-        ( (surface['data_y_upper'][0]-surface['data_y_lower'][0]) + (surface['data_y_upper'][-1]-surface['data_y_lower'][-1]))
+        data_x_upper = np.real(surface['data_x_upper'])
+        data_y_upper = np.real(surface['data_y_upper'])
+        data_y_lower = np.real(surface['data_y_lower'])
+
+        self.w = (data_x_upper[0] * (data_y_upper[0] - data_y_lower[0]) + \
+        data_x_upper[-1] * (data_y_upper[-1] - data_y_lower[-1])) / \
+        ( (data_y_upper[0] - data_y_lower[0]) + (data_y_upper[-1] - data_y_lower[-1]))
+
+        # Each output for an element depends on the leading and trailing edge
+        # points of both of its sides
+        mesh_indices = np.arange(nx * ny * 3).reshape((nx, ny, 3))
+        cols = np.stack([mesh_indices[[0, -1], :-1], mesh_indices[[0, -1], 1:]], axis=2)
+        cols = cols.transpose((1, 0, 2, 3)).flatten()
+        rows = np.repeat(np.arange(ny - 1), 12)
+
+        self.declare_partials('*', 'mesh', rows=rows, cols=cols)
+
+    def _geometry(self, mesh):
+        """
+        Return the chord vectors, the element vectors between the shear
+        centers, and their norms.
+        """
+        w = self.w
+
+        mesh_vectors = mesh[-1, :, :] - mesh[0, :, :]
 
         # TODO: perhaps replace this or link with existing nodes computation
         nodes = (1-w) * mesh[0, :, :] + w * mesh[-1, :, :]
+        elem_vec = nodes[1:] - nodes[:-1] # vector along element
 
-        mesh_vectors = mesh[-1, :, :] - mesh[0, :, :]
+        return mesh_vectors, elem_vec
 
-        # Loop over spanwise elements
-        for ielem in range(mesh.shape[1] - 1):
+    def compute(self, inputs, outputs):
+        mesh = inputs['mesh']
+        mesh_vectors, elem_vec = self._geometry(mesh)
 
-            # Obtain the element nodes
-            P0 = nodes[ielem, :]
-            P1 = nodes[ielem+1, :]
+        chords = norm(mesh_vectors, axis=1)
+        streamwise_chords = 0.5 * chords[:-1] + 0.5 * chords[1:]
 
-            elem_vec = (P1 - P0) # vector along element
-            temp_vec = elem_vec.copy()
-            temp_vec[0] = 0. # vector along element without x component
+        # Chord lengths for the panel strips at the panel midpoint
+        outputs['streamwise_chords'] = streamwise_chords
 
-            # This is used to get chord length normal to FEM element.
-            # To be clear, this 3D angle sweep measure.
-            # This is the projection to the wing orthogonal to the FEM direction.
-            cos_theta_fe_sweep = norm(temp_vec) / norm(elem_vec)
-            fem_chords[ielem] = fem_chords[ielem] * cos_theta_fe_sweep
+        # This is used to get chord length normal to FEM element.
+        # To be clear, this 3D angle sweep measure.
+        # This is the projection to the wing orthogonal to the FEM direction.
+        cos_theta_fe_sweep = norm(elem_vec[:, 1:], axis=1) / norm(elem_vec, axis=1)
+        fem_chords = streamwise_chords * cos_theta_fe_sweep
 
         outputs['fem_chords'] = fem_chords
 
-        # Loop over spanwise elements
-        for ielem in range(mesh.shape[1] - 1):
-
-            # The following is used to approximate the twist angle for the section normal to the FEM element
-            mesh_vec_0 = mesh_vectors[ielem]
-            temp_mesh_vectors_0 = mesh_vec_0.copy()
-            temp_mesh_vectors_0[2] = 0.
+        # The following is used to approximate the twist angle for the section normal to the FEM element
+        cos_twist = norm(mesh_vectors[:, :2], axis=1) / chords
 
-            cos_twist_0 = norm(temp_mesh_vectors_0) / norm(mesh_vec_0)
+        # to prevent nan in case value for arccos is greater than 1 due to machine precision
+        theta = np.arccos(np.where(cos_twist.real > 1., 1., cos_twist))
 
-            if cos_twist_0 > 1.:
-                theta_0 = 0. # to prevent nan in case value for arccos is greater than 1 due to machine precision
-            else:
-                theta_0 = np.arccos(cos_twist_0)
+        outputs['fem_twists'] = (theta[:-1] + theta[1:]) / 2 * streamwise_chords / fem_chords
 
-            mesh_vec_1 = mesh_vectors[ielem + 1]
-            temp_mesh_vectors_1 = mesh_vec_1.copy()
-            temp_mesh_vectors_1[2] = 0.
-
-            cos_twist_1 = norm(temp_mesh_vectors_1) / norm(mesh_vec_1)
-
-            if cos_twist_1 > 1.:
-                theta_1 = 0. # to prevent nan in case value for arccos is greater than 1 due to machine precision
-            else:
-                theta_1 = np.arccos(cos_twist_1)
-
-            fem_twists[ielem] = (theta_0 + theta_1) / 2 * streamwise_chords[ielem] / fem_chords[ielem]
-        outputs['fem_twists'] = fem_twists
+    def compute_partials(self, inputs, partials):
+        mesh = inputs['mesh']
+        w = self.w
+        mesh_vectors, elem_vec = self._geometry(mesh)
+
+        chords = norm(mesh_vectors, axis=1)
+        streamwise_chords = 0.5 * chords[:-1] + 0.5 * chords[1:]
+
+        elem_len = norm(elem_vec, axis=1)
+        elem_len_yz = norm(elem_vec[:, 1:], axis=1)
+        cos_theta_fe_sweep = elem_len_yz / elem_len
+
+        # Derivatives of the sweep cosine wrt the element vector
+        elem_vec_yz = elem_vec.copy()
+        elem_vec_yz[:, 0] = 0.
+        dcos_delem = elem_vec_yz / (elem_len_yz * elem_len)[:, np.newaxis] - \
+            (elem_len_yz / elem_len**3)[:, np.newaxis] * elem_vec
+
+        # The twist angle is the angle of the chord vector out of the x-y
+        # plane, written with arctan2 so its derivatives stay finite for
+        # untwisted sections, where they vanish
+        len_xy = norm(mesh_vectors[:, :2], axis=1)
+        cos_twist = len_xy / chords
+        theta = np.arccos(np.where(cos_twist.real > 1., 1., cos_twist))
+
+        dtheta_dvec = np.zeros(mesh_vectors.shape)
+        dtheta_dvec[:, :2] = -(np.abs(mesh_vectors[:, 2]) / np.where(len_xy == 0., 1., len_xy) / chords**2)[:, np.newaxis] * mesh_vectors[:, :2]
+        dtheta_dvec[:, 2] = np.sign(mesh_vectors[:, 2]) * len_xy / chords**2
+
+        theta_avg = (theta[:-1] + theta[1:]) / 2
+
+        # Derivatives wrt the chord vectors at both sides of each element,
+        # with shape (ny-1, 2, 3)
+        dchord_dvec = mesh_vectors / chords[:, np.newaxis]
+        dsc_dvec = 0.5 * np.stack([dchord_dvec[:-1], dchord_dvec[1:]], axis=1)
+        dtheta_avg_dvec = 0.5 * np.stack([dtheta_dvec[:-1], dtheta_dvec[1:]], axis=1)
+
+        # Derivatives wrt the element vector
+        dfc_delem = streamwise_chords[:, np.newaxis] * dcos_delem
+        dft_delem = -(theta_avg / cos_theta_fe_sweep**2)[:, np.newaxis] * dcos_delem
+
+        # The chord vectors are trailing edge minus leading edge, and the
+        # element vector moves with the shear center at both sides
+        side = np.array([-1., 1.])[:, np.newaxis]
+        weights = np.array([1 - w, w])
+
+        def chain(dout_dvec, dout_delem):
+            derivs = np.einsum('i,ejk->eijk', [-1., 1.], dout_dvec) + \
+                np.einsum('i,jk,ek->eijk', weights, side, dout_delem)
+            return derivs.flatten()
+
+        partials['streamwise_chords', 'mesh'] = chain(dsc_dvec, np.zeros(elem_vec.shape))
+        partials['fem_chords', 'mesh'] = chain(
+            cos_theta_fe_sweep[:, np.newaxis, np.newaxis] * dsc_dvec, dfc_delem)
+        partials['fem_twists', 'mesh'] = chain(
+            dtheta_avg_dvec / cos_theta_fe_sweep[:, np.newaxis, np.newaxis], dft_delem)
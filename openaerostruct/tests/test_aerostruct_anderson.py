@@ -0,0 +1,102 @@
+from __future__ import division, print_function
+from openmdao.utils.assert_utils import assert_rel_error
+import unittest
+import numpy as np
+
+from openaerostruct.integration.anderson_block_gs import AndersonBlockGS
+from openaerostruct.utils.testing import get_aerostruct_prob
+
+
+class Test(unittest.TestCase):
+
+    def test(self):
+        results = []
+        for coupled_nonlinear_solver in ['aitken', 'anderson']:
+            prob = get_aerostruct_prob(coupled_nonlinear_solver=coupled_nonlinear_solver)
+            prob.run_model()
+
+            iter_count = prob.model.AS_point_0.coupled.nonlinear_solver._iter_count
+            results.append((prob['AS_point_0.fuelburn'][0], prob['AS_point_0.CM'][1], iter_count))
+
+        (fuelburn, CM, iter_count), (fuelburn_anderson, CM_anderson, iter_count_anderson) = results
+
+        assert_rel_error(self, fuelburn_anderson, fuelburn, 1e-8)
+        assert_rel_error(self, CM_anderson, CM, 1e-8)
+
+        self.assertLessEqual(iter_count_anderson, iter_count)
+
+    def test_use_aitken(self):
+        prob = get_aerostruct_prob(coupled_nonlinear_solver='anderson')
+        prob.model.AS_point_0.coupled.nonlinear_solver.options['use_aitken'] = True
+
+        with self.assertRaises(ValueError):
+            prob.run_model()
+
+    def test_no_accelerated_outputs(self):
+        prob = get_aerostruct_prob(coupled_nonlinear_solver='anderson')
+        prob.model.AS_point_0.coupled.nonlinear_solver.options['accelerated_outputs'] = ['foo.*']
+
+        with self.assertRaises(ValueError):
+            prob.run_model()
+
+
+class TestAndersonUpdate(unittest.TestCase):
+
+    def setUp(self):
+        # Linear fixed-point map g(x) = A x + b, contractive but slow to
+        # converge with plain fixed-point iterations
+        np.random.seed(314)
+        n = 6
+        Q = np.linalg.qr(np.random.random((n, n)))[0]
+        self.A = Q.dot(np.diag(np.linspace(0.1, 0.95, n))).dot(Q.T)
+        self.b = np.random.random(n)
+        self.x_star = np.linalg.solve(np.eye(n) - self.A, self.b)
+
+    def iterate(self, solver, num_iter):
+        x = np.zeros(len(self.b))
+        for i in range(num_iter):
+            x = solver._anderson_update(x, self.A.dot(x) + self.b)
+        return x
+
+    def test_convergence(self):
+        solver = AndersonBlockGS(anderson_depth=6)
+
+        # With a history as long as the number of unknowns, the iterations
+        # of a linear map converge in a finite number of steps
+        x = self.iterate(solver, 8)
+
+        assert_rel_error(self, x, self.x_star, 1e-10)
+
+    def test_depth_0(self):
+        solver = AndersonBlockGS(anderson_depth=0, anderson_beta=0.5)
+
+        x = np.random.random(len(self.b))
+        for i in range(3):
+            g = self.A.dot(x) + self.b
+            x_new = solver._anderson_update(x, g)
+
+            assert_rel_error(self, x_new, x + 0.5 * (g - x), 1e-15)
+            self.assertEqual(len(solver._delta_x), 0)
+            self.assertEqual(len(solver._delta_f), 0)
+
+            x = x_new
+
+    def test_history_truncation(self):
+        solver = AndersonBlockGS(anderson_depth=2)
+
+        x = np.zeros(len(self.b))
+        delta_x = []
+        for i in range(5):
+            x_new = solver._anderson_update(x, self.A.dot(x) + self.b)
+            delta_x.append(x_new - x)
+            x = x_new
+
+            self.assertEqual(len(solver._delta_x), min(i, 2))
+            self.assertEqual(len(solver._delta_f), min(i, 2))
+
+        # Only the differences between the last three iterates are kept
+        assert_rel_error(self, np.array(solver._delta_x), np.array(delta_x[-3:-1]), 1e-15)
+
+
+if __name__ == '__main__':
+    unittest.main()
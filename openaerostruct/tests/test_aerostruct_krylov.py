@@ -0,0 +1,28 @@
+from __future__ import division, print_function
+from openmdao.utils.assert_utils import assert_rel_error
+import unittest
+
+from openaerostruct.utils.testing import get_aerostruct_prob
+
+
+class Test(unittest.TestCase):
+
+    def test(self):
+        results = []
+        for coupled_linear_solver in ['direct', 'krylov']:
+            prob = get_aerostruct_prob(coupled_linear_solver=coupled_linear_solver)
+            prob.run_model()
+
+            totals = prob.compute_totals(['AS_point_0.fuelburn', 'AS_point_0.CM', 'AS_point_0.wing_perf.failure'],
+                ['alpha', 'wing.twist_cp', 'wing.thickness_cp', 'point_masses'])
+
+            results.append(totals)
+
+        totals, totals_krylov = results
+
+        for key in totals:
+            assert_rel_error(self, totals_krylov[key], totals[key], 1e-8)
+
+
+if __name__ == '__main__':
+    unittest.main()
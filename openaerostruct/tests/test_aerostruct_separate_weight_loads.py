@@ -0,0 +1,31 @@
+from __future__ import division, print_function
+from openmdao.utils.assert_utils import assert_rel_error
+import unittest
+
+from openaerostruct.utils.testing import get_aerostruct_prob
+
+
+class Test(unittest.TestCase):
+
+    def test(self):
+        results = []
+        for separate_weight_loads in [False, True]:
+            prob = get_aerostruct_prob(separate_weight_loads=separate_weight_loads)
+            prob.run_model()
+
+            totals = prob.compute_totals(['AS_point_0.fuelburn', 'AS_point_0.CM'],
+                ['alpha', 'load_factor', 'point_masses', 'point_mass_locations', 'engine_thrusts'])
+
+            results.append((prob['AS_point_0.fuelburn'][0], prob['AS_point_0.CM'][1], totals))
+
+        (fuelburn, CM, totals), (fuelburn_sep, CM_sep, totals_sep) = results
+
+        assert_rel_error(self, fuelburn_sep, fuelburn, 1e-10)
+        assert_rel_error(self, CM_sep, CM, 1e-10)
+
+        for key in totals:
+            assert_rel_error(self, totals_sep[key], totals[key], 1e-8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+from __future__ import division, print_function
+import unittest
+import numpy as np
+
+from openaerostruct.geometry.utils import generate_mesh
+from openaerostruct.structures.struct_groups import SpatialBeamAlone
+
+import openmdao.api as om
+
+
+class Test(unittest.TestCase):
+
+    def get_prob(self, fem_model_type, loads, load_factor, num_load_cases=1):
+        # Create a dictionary to store options about the surface
+        mesh_dict = {'num_y' : 7,
+                     'wing_type' : 'CRM',
+                     'symmetry' : True,
+                     'num_twist_cp' : 5}
+
+        mesh, twist_cp = generate_mesh(mesh_dict)
+
+        surf_dict = {
+                    # Wing definition
+                    'name' : 'wing',        # name of the surface
+                    'symmetry' : True,     # if true, model one half of wing
+                                            # reflected across the plane y = 0
+                    'fem_model_type' : fem_model_type,
+
+                    'mesh' : mesh,
+
+                    # Structural values are based on aluminum 7075
+                    'E' : 70.e9,            # [Pa] Young's modulus of the spar
+                    'G' : 30.e9,            # [Pa] shear modulus of the spar
+                    'yield' : 500.e6 / 2.5, # [Pa] yield stress divided by 2.5 for limiting case
+                    'mrho' : 3.e3,          # [kg/m^3] material density
+                    'fem_origin' : 0.35,    # normalized chordwise location of the spar
+                    't_over_c_cp' : np.array([0.15]),      # maximum airfoil thickness
+                    'thickness_cp' : np.ones((3)) * .1,
+                    'wing_weight_ratio' : 2.,
+                    'struct_weight_relief' : True,    # True to add the weight of the structure to the loads on the structure
+                    'distributed_fuel_weight' : False,
+                    'exact_failure_constraint' : False,
+                    }
+
+        # Create the problem and assign the model group
+        prob = om.Problem()
+
+        indep_var_comp = om.IndepVarComp()
+        indep_var_comp.add_output('loads', val=loads, units='N')
+        indep_var_comp.add_output('load_factor', val=load_factor)
+
+        struct_group = SpatialBeamAlone(surface=surf_dict, num_load_cases=num_load_cases)
+
+        # Add indep_vars to the structural group
+        struct_group.add_subsystem('indep_vars',
+             indep_var_comp,
+             promotes=['*'])
+
+        prob.model.add_subsystem(surf_dict['name'], struct_group)
+
+        prob.model.add_design_var('wing.thickness_cp')
+        prob.model.add_design_var('wing.loads')
+        prob.model.add_constraint('wing.failure')
+
+        prob.setup()
+        prob.run_model()
+
+        return prob
+
+    def test(self):
+        ny = 4
+        load_factors = np.array([1., 2.5, -1.])
+
+        # Spanwise varying loads, such as different gusts
+        loads = np.zeros((3, ny, 6))
+        loads[:, :, 2] = np.outer(load_factors, np.linspace(1., 2., ny)) * 1e5
+        loads[1, :, 1] = 3e4
+        loads[2, :, 4] = -2e4
+
+        prob = self.get_prob('tube', loads, load_factors, num_load_cases=3)
+        totals = prob.compute_totals()
+
+        # Compare against a separate analysis of each load case
+        for ind, load_factor in enumerate(load_factors):
+            single = self.get_prob('tube', loads[ind], load_factor)
+
+            for name in ['wing.disp', 'wing.vonmises', 'wing.failure']:
+                np.testing.assert_allclose(prob[name][ind], single[name], rtol=1e-10, atol=1e-12)
+
+            single_totals = single.compute_totals()
+            np.testing.assert_allclose(totals['wing.failure', 'wing.thickness_cp'][ind],
+                single_totals['wing.failure', 'wing.thickness_cp'][0], rtol=1e-8)
+
+            # The failure of each load case only depends on its own loads
+            dfailure_dloads = totals['wing.failure', 'wing.loads'][ind].reshape(3, -1)
+            np.testing.assert_allclose(dfailure_dloads[ind],
+                single_totals['wing.failure', 'wing.loads'][0], rtol=1e-8, atol=1e-20)
+            np.testing.assert_equal(np.delete(dfailure_dloads, ind, axis=0), 0.)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -113,7 +113,7 @@ class Test(unittest.TestCase):
         #warnings.filterwarnings('error')
 
         # Set up the problem
-        prob.setup()
+        prob.setup(force_alloc_complex=True)
 
         prob.run_model()
         data = prob.check_partials(compact_print=True, out_stream=None, method='cs')
@@ -238,7 +238,7 @@ class Test(unittest.TestCase):
         #=======================================================================================
 
         # Set up the problem
-        prob.setup()
+        prob.setup(force_alloc_complex=True)
 
         # om.view_model(prob)
 
@@ -5,6 +5,8 @@ from numpy.testing import assert_almost_equal
 from openmdao.utils.assert_utils import assert_rel_error, assert_check_partials
 import numpy as np
 from openaerostruct.geometry.utils import generate_mesh
+from openaerostruct.integration.aerostruct_groups import AerostructGeometry, AerostructPoint
+from openaerostruct.utils.constants import grav_constant
 
 
 def view_mat(mat1, mat2=None, key='Title', tol=1e-10):  # pragma: no cover
@@ -154,3 +156,143 @@ def get_default_surfaces():
     surfaces = [wing_dict, tail_dict]
 
     return surfaces
+
+def get_aerostruct_prob(**point_options):
+    """
+    Return a set up single-point aerostructural problem of a small CRM wing
+    with point masses and engine thrusts, used to compare the options of
+    AerostructPoint.
+
+    Parameters
+    ----------
+    **point_options : dict
+        Options passed to AerostructPoint.
+
+    Returns
+    -------
+    prob : Problem
+        The problem, with the point named 'AS_point_0'.
+    """
+    # Create a dictionary to store options about the surface
+    mesh_dict = {'num_y' : 5,
+                 'num_x' : 2,
+                 'wing_type' : 'CRM',
+                 'symmetry' : True,
+                 'num_twist_cp' : 5}
+
+    mesh, twist_cp = generate_mesh(mesh_dict)
+
+    surf_dict = {
+                # Wing definition
+                'name' : 'wing',        # name of the surface
+                'symmetry' : True,     # if true, model one half of wing
+                                        # reflected across the plane y = 0
+                'S_ref_type' : 'wetted', # how we compute the wing area,
+                                         # can be 'wetted' or 'projected'
+                'fem_model_type' : 'tube',
+
+                'thickness_cp' : np.array([.1, .2, .3]),
+
+                'twist_cp' : twist_cp,
+                'mesh' : mesh,
+                'n_point_masses' : 2,
+
+                'CL0' : 0.0,            # CL of the surface at alpha=0
+                'CD0' : 0.015,            # CD of the surface at alpha=0
+
+                # Airfoil properties for viscous drag calculation
+                'k_lam' : 0.05,         # percentage of chord with laminar
+                                        # flow, used for viscous drag
+                't_over_c_cp' : np.array([0.15]),      # thickness over chord ratio (NACA0015)
+                'c_max_t' : .303,       # chordwise location of maximum (NACA0015)
+                                        # thickness
+                'with_viscous' : True,
+                'with_wave' : False,     # if true, compute wave drag
+
+                # Structural values are based on aluminum 7075
+                'E' : 70.e9,            # [Pa] Young's modulus of the spar
+                'G' : 30.e9,            # [Pa] shear modulus of the spar
+                'yield' : 500.e6 / 2.5, # [Pa] yield stress divided by 2.5 for limiting case
+                'mrho' : 3.e3,          # [kg/m^3] material density
+                'fem_origin' : 0.35,    # normalized chordwise location of the spar
+                'wing_weight_ratio' : 2.,
+                'struct_weight_relief' : True,    # True to add the weight of the structure to the loads on the structure
+                'distributed_fuel_weight' : False,
+                # Constraints
+                'exact_failure_constraint' : False, # if false, use KS function
+                }
+
+    surfaces = [surf_dict]
+
+    # Create the problem and assign the model group
+    prob = om.Problem()
+
+    # Add problem information as an independent variables component
+    indep_var_comp = om.IndepVarComp()
+    indep_var_comp.add_output('v', val=248.136, units='m/s')
+    indep_var_comp.add_output('alpha', val=5., units='deg')
+    indep_var_comp.add_output('Mach_number', val=0.84)
+    indep_var_comp.add_output('re', val=1.e6, units='1/m')
+    indep_var_comp.add_output('rho', val=0.38, units='kg/m**3')
+    indep_var_comp.add_output('CT', val=grav_constant * 17.e-6, units='1/s')
+    indep_var_comp.add_output('R', val=11.165e6, units='m')
+    indep_var_comp.add_output('W0', val=0.4 * 3e5,  units='kg')
+    indep_var_comp.add_output('speed_of_sound', val=295.4, units='m/s')
+    indep_var_comp.add_output('load_factor', val=1.)
+    indep_var_comp.add_output('empty_cg', val=np.zeros((3)), units='m')
+
+    indep_var_comp.add_output('point_masses', val=np.array([8000., 3000.]), units='kg')
+    indep_var_comp.add_output('point_mass_locations', val=np.array([[25, -10., 0.], [20., -5., 0.5]]), units='m')
+    indep_var_comp.add_output('engine_thrusts', val=np.array([1.e4, 5.e3]), units='N')
+
+    prob.model.add_subsystem('prob_vars',
+         indep_var_comp,
+         promotes=['*'])
+
+    name = surf_dict['name']
+
+    prob.model.add_subsystem(name, AerostructGeometry(surface=surf_dict))
+
+    point_name = 'AS_point_0'
+
+    AS_point = AerostructPoint(surfaces=surfaces, **point_options)
+
+    prob.model.add_subsystem(point_name, AS_point)
+
+    # Connect flow properties to the analysis point
+    for var in ['v', 'alpha', 'Mach_number', 're', 'rho', 'CT', 'R', 'W0', 'speed_of_sound',
+                'empty_cg', 'load_factor']:
+        prob.model.connect(var, point_name + '.' + var)
+
+    com_name = point_name + '.' + name + '_perf'
+    prob.model.connect(name + '.local_stiff_transformed', point_name + '.coupled.' + name + '.local_stiff_transformed')
+    prob.model.connect(name + '.nodes', point_name + '.coupled.' + name + '.nodes')
+
+    # Connect aerodyamic mesh to coupled group mesh
+    prob.model.connect(name + '.mesh', point_name + '.coupled.' + name + '.mesh')
+
+    # Connect performance calculation variables
+    prob.model.connect(name + '.radius', com_name + '.radius')
+    prob.model.connect(name + '.thickness', com_name + '.thickness')
+    prob.model.connect(name + '.nodes', com_name + '.nodes')
+    prob.model.connect(name + '.cg_location', point_name + '.' + 'total_perf.' + name + '_cg_location')
+    prob.model.connect(name + '.structural_mass', point_name + '.' + 'total_perf.' + name + '_structural_mass')
+    prob.model.connect(name + '.t_over_c', com_name + '.t_over_c')
+
+    # The loads that only depend on the design are either computed within
+    # the coupled group or once before it
+    if point_options.get('separate_weight_loads', False):
+        loads_name = point_name + '.' + name + '_weight_loads'
+        prob.model.connect(name + '.nodes', loads_name + '.nodes')
+    else:
+        loads_name = point_name + '.coupled.' + name
+        prob.model.connect('load_factor', point_name + '.coupled.load_factor')
+
+    prob.model.connect(name + '.element_mass', loads_name + '.element_mass')
+    prob.model.connect('point_masses', loads_name + '.point_masses')
+    prob.model.connect('point_mass_locations', loads_name + '.point_mass_locations')
+    prob.model.connect('engine_thrusts', loads_name + '.engine_thrusts')
+
+    prob.setup()
+
+    return prob